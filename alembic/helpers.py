@@ -6,6 +6,11 @@ from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Any
 
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.domain.value_objects.engagement import parse_count
+
 
 def parse_date(date_str: str) -> datetime:
     """
@@ -30,26 +35,6 @@ def parse_date(date_str: str) -> datetime:
         return datetime.now()
 
 
-def parse_number(value: Any) -> int:
-    """Converte string numérica (ex: "42.6K", "3864") para inteiro."""
-    if isinstance(value, int):
-        return value
-    if isinstance(value, str):
-        value = value.strip()
-        if value.lower() in ['n/a', 'na', '', 'compartilhar', '0']:
-            return 0
-        # Remove "K", "M" e converte
-        if 'k' in value.lower():
-            return int(float(value.lower().replace('k', '')) * 1000)
-        if 'm' in value.lower():
-            return int(float(value.lower().replace('m', '')) * 1000000)
-        try:
-            return int(value)
-        except ValueError:
-            return 0
-    return 0
-
-
 def process_json_file(file_path: Path) -> List[Dict[str, Any]]:
     """Processa um arquivo JSON e retorna lista de publicações."""
     with open(file_path, 'r', encoding='utf-8') as f:
@@ -85,7 +70,7 @@ def process_json_file(file_path: Path) -> List[Dict[str, Any]]:
             comment = {
                 'username': comment_data.get('username', ''),
                 'text': comment_data.get('text', ''),
-                'likes': parse_number(comment_data.get('likes', 0)),
+                'likes': parse_count(comment_data.get('likes', 0)),
                 'replies': []
             }
             
@@ -95,7 +80,7 @@ def process_json_file(file_path: Path) -> List[Dict[str, Any]]:
                 reply = {
                     'username': reply_data.get('username', ''),
                     'text': reply_data.get('text', ''),
-                    'likes': parse_number(reply_data.get('likes', 0))
+                    'likes': parse_count(reply_data.get('likes', 0))
                 }
                 comment['replies'].append(reply)
             
@@ -148,3 +133,141 @@ def load_all_publications() -> List[Dict[str, Any]]:
     
     return unique_publications
 
+
+# Tabelas de destino da carga (apenas as colunas gravadas; independentes dos
+# models da aplicação, que evoluem com as migrations seguintes)
+_metadata = sa.MetaData()
+
+publications_table = sa.Table(
+    'publications', _metadata,
+    sa.Column('id', sa.Integer, primary_key=True),
+    sa.Column('publicacao_n', sa.Integer, unique=True),
+    sa.Column('url', sa.String),
+    sa.Column('description', sa.Text),
+    sa.Column('date', sa.DateTime),
+    sa.Column('views', sa.String),
+    sa.Column('likes', sa.String),
+    sa.Column('comments_count', sa.Integer),
+    sa.Column('shares', sa.String),
+    sa.Column('bookmarks', sa.String),
+    sa.Column('music_title', sa.String),
+    sa.Column('tags', sa.JSON),
+    sa.Column('created_at', sa.DateTime),
+    sa.Column('updated_at', sa.DateTime),
+)
+
+comments_table = sa.Table(
+    'comments', _metadata,
+    sa.Column('id', sa.Integer, primary_key=True),
+    sa.Column('publication_id', sa.Integer),
+    sa.Column('username', sa.String),
+    sa.Column('text', sa.Text),
+    sa.Column('likes', sa.Integer),
+    sa.Column('created_at', sa.DateTime),
+)
+
+replies_table = sa.Table(
+    'replies', _metadata,
+    sa.Column('id', sa.Integer, primary_key=True),
+    sa.Column('comment_id', sa.Integer),
+    sa.Column('username', sa.String),
+    sa.Column('text', sa.Text),
+    sa.Column('likes', sa.Integer),
+    sa.Column('created_at', sa.DateTime),
+)
+
+
+def _insert_publications(connection: sa.engine.Connection):
+    """INSERT de publicações ignorando as já existentes (publicacao_n), no dialeto da conexão."""
+    dialect_insert = postgresql.insert if connection.dialect.name == 'postgresql' else sqlite.insert
+    return dialect_insert(publications_table).on_conflict_do_nothing(index_elements=['publicacao_n'])
+
+
+def load_publications(
+    connection: sa.engine.Connection,
+    publications: List[Dict[str, Any]],
+    batch_size: int = 1000,
+) -> Dict[str, int]:
+    """
+    Grava publicações (no formato de `process_json_file`), comentários e
+    respostas, em lotes de `batch_size` publicações.
+
+    Os IDs vêm do próprio INSERT: as publicações retornam (id, publicacao_n) e
+    os comentários retornam os IDs na ordem dos parâmetros
+    (`sort_by_parameter_order`), usados para ligar as respostas. São poucas
+    instruções por lote, independente do número de publicações. Publicações já
+    existentes (inclusive gravadas por outra conexão) são ignoradas, com seus
+    comentários. Retorna {"publications", "comments", "replies"} inseridos.
+    """
+    totals = {'publications': 0, 'comments': 0, 'replies': 0}
+    
+    for start in range(0, len(publications), batch_size):
+        batch = publications[start:start + batch_size]
+        now = datetime.now()
+        
+        rows = connection.execute(
+            _insert_publications(connection).returning(
+                publications_table.c.id, publications_table.c.publicacao_n
+            ),
+            [
+                {
+                    'publicacao_n': pub['publicacao_n'],
+                    'url': pub['url'],
+                    'description': pub['description'],
+                    'date': pub['date'],
+                    'views': str(pub.get('views', '')),
+                    'likes': str(pub.get('likes', '')),
+                    'comments_count': pub.get('comments_count', 0),
+                    'shares': str(pub.get('shares', '')),
+                    'bookmarks': str(pub.get('bookmarks', '')),
+                    'music_title': pub.get('music_title', ''),
+                    'tags': pub.get('tags', []),
+                    'created_at': now,
+                    'updated_at': now,
+                }
+                for pub in batch
+            ],
+        ).all()
+        publication_ids = {publicacao_n: id for id, publicacao_n in rows}
+        totals['publications'] += len(publication_ids)
+        
+        # Comentários das publicações inseridas (repetições no lote contam uma vez)
+        comments = []
+        for pub in batch:
+            publication_id = publication_ids.pop(pub['publicacao_n'], None)
+            if publication_id is not None:
+                comments.extend((publication_id, comment) for comment in pub['comments'])
+        if not comments:
+            continue
+        
+        comment_ids = connection.execute(
+            sa.insert(comments_table).returning(comments_table.c.id, sort_by_parameter_order=True),
+            [
+                {
+                    'publication_id': publication_id,
+                    'username': comment['username'],
+                    'text': comment['text'],
+                    'likes': comment['likes'],
+                    'created_at': now,
+                }
+                for publication_id, comment in comments
+            ],
+        ).scalars().all()
+        totals['comments'] += len(comment_ids)
+        
+        replies = [
+            {
+                'comment_id': comment_id,
+                'username': reply['username'],
+                'text': reply['text'],
+                'likes': reply['likes'],
+                'created_at': now,
+            }
+            for comment_id, (_, comment) in zip(comment_ids, comments)
+            for reply in comment['replies']
+        ]
+        if replies:
+            connection.execute(sa.insert(replies_table), replies)
+            totals['replies'] += len(replies)
+    
+    return totals
@@ -0,0 +1,49 @@
+"""add comment pagination indexes
+
+Revision ID: add_comment_pagination_indexes
+Revises: add_tags_jsonb
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_comment_pagination_indexes'
+down_revision: Union[str, None] = 'add_tags_jsonb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Paginação por cursor de GET /publications/{id}/comments
+    # (ORDER BY id, ou likes DESC, id DESC, dentro de uma publicação)
+    op.create_index(
+        'ix_comments_publication_id_id', 'comments', ['publication_id', 'id'],
+        unique=False, if_not_exists=True
+    )
+    op.create_index(
+        'ix_comments_publication_id_likes_id', 'comments', ['publication_id', 'likes', 'id'],
+        unique=False, if_not_exists=True
+    )
+
+    # Labels de cada comentário/resposta lidos e filtrados apenas pelo índice (index-only)
+    op.create_index(
+        'ix_comment_analyses_comment_id_labels', 'comment_analyses',
+        ['comment_id', 'sentiment', 'emotion', 'topic'],
+        unique=False, if_not_exists=True
+    )
+    op.create_index(
+        'ix_reply_analyses_reply_id_labels', 'reply_analyses',
+        ['reply_id', 'sentiment', 'emotion', 'topic'],
+        unique=False, if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reply_analyses_reply_id_labels', table_name='reply_analyses')
+    op.drop_index('ix_comment_analyses_comment_id_labels', table_name='comment_analyses')
+    op.drop_index('ix_comments_publication_id_likes_id', table_name='comments')
+    op.drop_index('ix_comments_publication_id_id', table_name='comments')
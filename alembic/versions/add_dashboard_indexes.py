@@ -0,0 +1,35 @@
+"""add dashboard indexes
+
+Revision ID: add_dashboard_indexes
+Revises: add_reply_analyses
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_dashboard_indexes'
+down_revision: Union[str, None] = 'add_reply_analyses'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Índices das FKs usadas nos JOINs das agregações do dashboard
+    # (já existem em bancos criados via scripts/create_all_tables.sql)
+    op.create_index(
+        op.f('ix_comments_publication_id'), 'comments', ['publication_id'],
+        unique=False, if_not_exists=True
+    )
+    op.create_index(
+        op.f('ix_replies_comment_id'), 'replies', ['comment_id'],
+        unique=False, if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_replies_comment_id'), table_name='replies')
+    op.drop_index(op.f('ix_comments_publication_id'), table_name='comments')
@@ -0,0 +1,50 @@
+"""add dashboard rollups table
+
+Revision ID: add_dashboard_rollups
+Revises: add_dashboard_indexes
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_dashboard_rollups'
+down_revision: Union[str, None] = 'add_dashboard_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def table_exists(table_name: str) -> bool:
+    """Verifica se uma tabela já existe no banco de dados."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return table_name in inspector.get_table_names()
+
+
+def upgrade() -> None:
+    # Create dashboard_rollups table
+    # Após aplicar, popule com: uv run python scripts/rebuild_rollups.py
+    if not table_exists('dashboard_rollups'):
+        op.create_table(
+            'dashboard_rollups',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('day', sa.Date(), nullable=False),
+            sa.Column('tag', sa.String(), nullable=False, server_default=''),
+            sa.Column('dimension', sa.String(), nullable=False),
+            sa.Column('label', sa.String(), nullable=False),
+            sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('day', 'tag', 'dimension', 'label', name='uq_dashboard_rollups_key')
+        )
+        op.create_index(op.f('ix_dashboard_rollups_id'), 'dashboard_rollups', ['id'], unique=False)
+        op.create_index('ix_dashboard_rollups_tag_day', 'dashboard_rollups', ['tag', 'day'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_dashboard_rollups_tag_day', table_name='dashboard_rollups')
+    op.drop_index(op.f('ix_dashboard_rollups_id'), table_name='dashboard_rollups')
+    op.drop_table('dashboard_rollups')
@@ -0,0 +1,55 @@
+"""add detection jobs table
+
+Revision ID: add_detection_jobs_table
+Revises: add_comment_pagination_indexes
+Create Date: 2026-10-18 01:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_detection_jobs_table'
+down_revision: Union[str, None] = 'add_comment_pagination_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def table_exists(table_name: str) -> bool:
+    """Verifica se uma tabela já existe no banco de dados."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return table_name in inspector.get_table_names()
+
+
+def upgrade() -> None:
+    # Create detection_jobs table (detecções de objetos assíncronas)
+    if not table_exists('detection_jobs'):
+        op.create_table(
+            'detection_jobs',
+            sa.Column('id', sa.String(length=32), nullable=False),
+            sa.Column('status', sa.String(), nullable=False),
+            sa.Column('progress', sa.Float(), nullable=True),
+            sa.Column('message', sa.Text(), nullable=True),
+            sa.Column('confidence', sa.Float(), nullable=False),
+            sa.Column('original_filename', sa.String(), nullable=True),
+            sa.Column('image_path', sa.String(), nullable=False),
+            sa.Column('annotated_path', sa.String(), nullable=True),
+            sa.Column('result', sa.JSON(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('started_at', sa.DateTime(), nullable=True),
+            sa.Column('finished_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(
+            'ix_detection_jobs_status_created_at', 'detection_jobs', ['status', 'created_at'],
+            unique=False
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_detection_jobs_status_created_at', table_name='detection_jobs')
+    op.drop_table('detection_jobs')
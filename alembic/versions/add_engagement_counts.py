@@ -0,0 +1,54 @@
+"""add engagement counts
+
+Revision ID: add_engagement_counts
+Revises: add_text_search
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_engagement_counts'
+down_revision: Union[str, None] = 'add_text_search'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Métricas com contagem numérica (<métrica>_count) e as indexadas para ordenação
+COUNT_METRICS = ('views', 'likes', 'shares', 'bookmarks')
+SORT_METRICS = ('views', 'likes', 'shares')
+
+
+def column_exists(table_name: str, column_name: str) -> bool:
+    """Verifica se uma coluna já existe na tabela."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return column_name in [column['name'] for column in inspector.get_columns(table_name)]
+
+
+def upgrade() -> None:
+    # Preenchidas na escrita; linhas existentes são preenchidas por
+    # scripts/backfill_engagement.py (mesmo parser da aplicação)
+    for metric in COUNT_METRICS:
+        if not column_exists('publications', f'{metric}_count'):
+            op.add_column(
+                'publications',
+                sa.Column(f'{metric}_count', sa.BigInteger(), nullable=False, server_default='0')
+            )
+
+    # Top-N e paginação por cursor: ORDER BY <métrica>_count DESC, id DESC
+    for metric in SORT_METRICS:
+        op.create_index(
+            f'ix_publications_{metric}_count_id', 'publications', [f'{metric}_count', 'id'],
+            unique=False, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    for metric in SORT_METRICS:
+        op.drop_index(f'ix_publications_{metric}_count_id', table_name='publications')
+    for metric in COUNT_METRICS:
+        op.drop_column('publications', f'{metric}_count')
@@ -0,0 +1,29 @@
+"""add publications keyset index
+
+Revision ID: add_publications_keyset_index
+Revises: add_dashboard_rollups
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_publications_keyset_index'
+down_revision: Union[str, None] = 'add_dashboard_rollups'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Índice da paginação por cursor de GET /publications (ORDER BY date DESC, id DESC)
+    op.create_index(
+        'ix_publications_date_id', 'publications', ['date', 'id'],
+        unique=False, if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_publications_date_id', table_name='publications')
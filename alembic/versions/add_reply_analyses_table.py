@@ -0,0 +1,48 @@
+"""add reply analyses table
+
+Revision ID: add_reply_analyses
+Revises: populate_json_data
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_reply_analyses'
+down_revision: Union[str, None] = 'populate_json_data'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def table_exists(table_name: str) -> bool:
+    """Verifica se uma tabela já existe no banco de dados."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return table_name in inspector.get_table_names()
+
+
+def upgrade() -> None:
+    # Create reply_analyses table
+    if not table_exists('reply_analyses'):
+        op.create_table(
+            'reply_analyses',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('reply_id', sa.Integer(), nullable=False),
+            sa.Column('sentiment', sa.String(), nullable=False),
+            sa.Column('emotion', sa.String(), nullable=False),
+            sa.Column('topic', sa.String(), nullable=False),
+            sa.Column('analyzed_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['reply_id'], ['replies.id'], ),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('reply_id')
+        )
+        op.create_index(op.f('ix_reply_analyses_id'), 'reply_analyses', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_reply_analyses_id'), table_name='reply_analyses')
+    op.drop_table('reply_analyses')
@@ -0,0 +1,55 @@
+"""add tags jsonb
+
+Revision ID: add_tags_jsonb
+Revises: add_engagement_counts
+Create Date: 2026-10-17 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_tags_jsonb'
+down_revision: Union[str, None] = 'add_engagement_counts'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def column_type(table_name: str, column_name: str):
+    """Tipo atual de uma coluna da tabela."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    for column in inspector.get_columns(table_name):
+        if column['name'] == column_name:
+            return column['type']
+    return None
+
+
+def upgrade() -> None:
+    # json -> jsonb: habilita o operador @> (filtro por tags) e o índice GIN
+    if not isinstance(column_type('publications', 'tags'), postgresql.JSONB):
+        op.alter_column(
+            'publications', 'tags',
+            type_=postgresql.JSONB(astext_type=sa.Text()),
+            postgresql_using='tags::jsonb',
+        )
+
+    # jsonb_path_ops: índice menor, suficiente para consultas de contenção (@>)
+    op.create_index(
+        'ix_publications_tags', 'publications', ['tags'],
+        unique=False, postgresql_using='gin',
+        postgresql_ops={'tags': 'jsonb_path_ops'}, if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_publications_tags', table_name='publications')
+    op.alter_column(
+        'publications', 'tags',
+        type_=postgresql.JSON(astext_type=sa.Text()),
+        postgresql_using='tags::json',
+    )
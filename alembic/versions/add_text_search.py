@@ -0,0 +1,77 @@
+"""add text search
+
+Revision ID: add_text_search
+Revises: add_publications_keyset_index
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_text_search'
+down_revision: Union[str, None] = 'add_publications_keyset_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Colunas indexadas: tabela -> coluna de texto
+SEARCH_COLUMNS = {
+    'publications': 'description',
+    'comments': 'text',
+    'replies': 'text',
+}
+
+
+def column_exists(table_name: str, column_name: str) -> bool:
+    """Verifica se uma coluna já existe na tabela."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return column_name in [column['name'] for column in inspector.get_columns(table_name)]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Configuração em português que também remove acentos ("seguranca" encontra "segurança")
+    op.execute("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'portuguese_unaccent') THEN
+                CREATE TEXT SEARCH CONFIGURATION portuguese_unaccent (COPY = portuguese);
+                ALTER TEXT SEARCH CONFIGURATION portuguese_unaccent
+                    ALTER MAPPING FOR hword, hword_part, word WITH unaccent, portuguese_stem;
+            END IF;
+        END
+        $$
+    """)
+
+    for table_name, text_column in SEARCH_COLUMNS.items():
+        # tsvector gerado pelo banco: sempre consistente com o texto, sem triggers
+        if not column_exists(table_name, 'search_vector'):
+            op.execute(
+                f"ALTER TABLE {table_name} ADD COLUMN search_vector tsvector "
+                f"GENERATED ALWAYS AS (to_tsvector('portuguese_unaccent', coalesce({text_column}, ''))) STORED"
+            )
+        op.create_index(
+            f'ix_{table_name}_search_vector', table_name, ['search_vector'],
+            unique=False, postgresql_using='gin', if_not_exists=True
+        )
+        # Fallback de busca por substring (ILIKE '%q%')
+        op.create_index(
+            f'ix_{table_name}_{text_column}_trgm', table_name, [text_column],
+            unique=False, postgresql_using='gin',
+            postgresql_ops={text_column: 'gin_trgm_ops'}, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    for table_name, text_column in SEARCH_COLUMNS.items():
+        op.drop_index(f'ix_{table_name}_{text_column}_trgm', table_name=table_name)
+        op.drop_index(f'ix_{table_name}_search_vector', table_name=table_name)
+        op.drop_column(table_name, 'search_vector')
+
+    op.execute("DROP TEXT SEARCH CONFIGURATION IF EXISTS portuguese_unaccent")
@@ -0,0 +1,38 @@
+"""make comment likes not null
+
+Revision ID: make_comment_likes_not_null
+Revises: add_detection_jobs_table
+Create Date: 2026-10-18 02:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'make_comment_likes_not_null'
+down_revision: Union[str, None] = 'add_detection_jobs_table'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # comments.likes é chave do keyset (likes, id) de GET /publications/{id}/comments?sort=likes;
+    # com NULLs a comparação de tuplas pularia ou repetiria linhas
+    op.execute("UPDATE comments SET likes = 0 WHERE likes IS NULL")
+    op.alter_column(
+        'comments', 'likes',
+        existing_type=sa.Integer(),
+        nullable=False,
+        server_default='0',
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'comments', 'likes',
+        existing_type=sa.Integer(),
+        nullable=True,
+        server_default=None,
+    )
@@ -1,5 +1,7 @@
 from fastapi import APIRouter
 
+from app.infrastructure.cache.classification_cache import classification_cache
+
 router = APIRouter()
 
 
@@ -8,3 +10,8 @@ async def analysis_health():
     """Health check do serviço de análise."""
     return {"status": "healthy", "service": "analysis"}
 
+
+@router.get("/analysis/cache/stats")
+async def classification_cache_stats():
+    """Estatísticas do cache de classificação de textos (hits, misses, hit rate)."""
+    return classification_cache.get_stats()
@@ -1,11 +1,19 @@
 from typing import Optional
 from datetime import datetime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.infrastructure.database.session import get_db
 from app.application.services.analysis_service import AnalysisService
-from app.api.v1.schemas.dashboard_schemas import DashboardStatsResponseSchema
+from app.api.v1.schemas.dashboard_schemas import (
+    DashboardStatsResponseSchema,
+    CacheStatsResponseSchema,
+    TimeSeriesPointSchema,
+    TimeSeriesResponseSchema,
+)
+from app.infrastructure.cache.dashboard_cache import dashboard_cache
+from app.core.exceptions import ValidationError
 
 router = APIRouter()
 
@@ -42,3 +50,48 @@ async def get_dashboard_stats(
         date_range=date_range_list,
     )
 
+
+@router.get("/dashboard/timeseries", response_model=TimeSeriesResponseSchema)
+async def get_dashboard_timeseries(
+    bucket: str = Query("day", pattern="^(hour|day|week)$"),
+    tz: str = Query("UTC"),
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    tags: Optional[list[str]] = Query(None),
+    db: AsyncSession = Depends(get_db),
+):
+    """Obtém a série temporal das distribuições de sentimento, emoção e tópico."""
+    try:
+        ZoneInfo(tz)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValidationError(f"Fuso horário inválido: {tz}")
+    
+    service = AnalysisService(db)
+    points = await service.get_timeseries(
+        bucket=bucket,
+        tz=tz,
+        start_date=start_date,
+        end_date=end_date,
+        tags=tags,
+    )
+    
+    return TimeSeriesResponseSchema(
+        bucket=bucket,
+        tz=tz,
+        points=[
+            TimeSeriesPointSchema(
+                bucket=point.bucket,
+                threat_count=point.threat_count,
+                sentiment_distribution={k.value: v for k, v in point.sentiment_distribution.items()},
+                emotion_distribution={k.value: v for k, v in point.emotion_distribution.items()},
+                topic_distribution={k.value: v for k, v in point.topic_distribution.items()},
+            )
+            for point in points
+        ],
+    )
+
+
+@router.get("/dashboard/cache/stats", response_model=CacheStatsResponseSchema)
+async def get_dashboard_cache_stats():
+    """Obtém os contadores de hit/miss do cache do dashboard."""
+    return CacheStatsResponseSchema(**await dashboard_cache.get_stats())
@@ -0,0 +1,69 @@
+from typing import Optional, List
+from datetime import datetime
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import ValidationError
+from app.infrastructure.database.session import get_db
+from app.application.services.export_service import ExportService
+from app.infrastructure.database.repositories.export_repository import (
+    DATASET_PUBLICATIONS,
+    EXPORT_DATASETS,
+)
+from app.infrastructure.export.writers import FORMAT_NDJSON, EXPORT_FORMATS, MEDIA_TYPES
+from app.api.v1.routes.publications import engagement_filters
+
+router = APIRouter()
+
+DATASET_PATTERN = f"^({'|'.join(EXPORT_DATASETS)})$"
+DATASET_DESCRIPTION = "publications, comments ou replies (cada linha com seus labels de NLP)"
+FORMAT_PATTERN = f"^({'|'.join(EXPORT_FORMATS)})$"
+FORMAT_DESCRIPTION = "ndjson, csv ou parquet (requer pyarrow)"
+
+
+@router.get("/export")
+async def export(
+    dataset: str = Query(DATASET_PUBLICATIONS, pattern=DATASET_PATTERN, description=DATASET_DESCRIPTION),
+    format: str = Query(FORMAT_NDJSON, pattern=FORMAT_PATTERN, description=FORMAT_DESCRIPTION),
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    tags: Optional[List[str]] = Query(None),
+    min_views: Optional[int] = Query(None, ge=0),
+    max_views: Optional[int] = Query(None, ge=0),
+    min_likes: Optional[int] = Query(None, ge=0),
+    max_likes: Optional[int] = Query(None, ge=0),
+    min_shares: Optional[int] = Query(None, ge=0),
+    max_shares: Optional[int] = Query(None, ge=0),
+    chunk_size: int = Query(1000, ge=1, le=10000),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Exporta publicações, comentários ou respostas das publicações filtradas
+    (mesmos filtros de GET /publications) em streaming: as linhas são lidas do
+    banco com um cursor no servidor e enviadas em lotes de `chunk_size`.
+    """
+    service = ExportService(db)
+    engagement = engagement_filters(
+        views=(min_views, max_views),
+        likes=(min_likes, max_likes),
+        shares=(min_shares, max_shares),
+    )
+    try:
+        writer = service.writer(dataset, format)
+    except RuntimeError as e:
+        raise ValidationError(str(e))
+
+    return StreamingResponse(
+        service.export(
+            dataset,
+            writer,
+            start_date=start_date,
+            end_date=end_date,
+            tags=tags,
+            engagement=engagement,
+            chunk_size=chunk_size,
+        ),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{dataset}.{format}"'},
+    )
@@ -1,22 +1,107 @@
 """
 Rotas para o módulo de Object Detector
 """
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
-from fastapi.responses import FileResponse
-from typing import Optional
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, Request
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional
+import asyncio
 import os
 from pathlib import Path
 
+from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableError
+from app.infrastructure.detection.executor import detection_executor, ExecutorOverloaded
+from app.infrastructure.detection.batcher import detection_batcher, batch_size
+from app.infrastructure.database.session import get_db
+from app.infrastructure.database.models import DetectionJobModel
+from app.domain.value_objects.detection_status import DetectionStatus
 from app.application.services.object_detector_service import get_detector_service, ObjectDetectorService
+from app.application.services.detection_job_service import DetectionJobService
 from app.api.v1.schemas.object_detector_schemas import (
     DetectionResponse,
     DetectionPrediction,
+    DetectionStatusResponse,
+    BatchDetectionResponse,
     ErrorResponse
 )
 
 router = APIRouter()
 
 
+def _validate_image(image: UploadFile) -> None:
+    """Valida o tipo (e o tamanho, se informado) do arquivo enviado."""
+    if not image.content_type or not image.content_type.startswith('image/'):
+        raise HTTPException(
+            status_code=400,
+            detail="Arquivo deve ser uma imagem válida"
+        )
+    
+    max_bytes = settings.OBJECT_DETECTOR_MAX_UPLOAD_MB * 1024 * 1024
+    if image.size is not None and image.size > max_bytes:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Imagem maior que o limite de {settings.OBJECT_DETECTOR_MAX_UPLOAD_MB} MB"
+        )
+
+
+def _remove_uploads(paths: List[str]) -> None:
+    """Remove uploads que não serão processados."""
+    for path in paths:
+        Path(path).unlink(missing_ok=True)
+
+
+def _response_fields(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Campos de DetectionResponse a partir do resultado do service."""
+    # Converte para o formato de resposta
+    predictions = [
+        DetectionPrediction(
+            model=pred.get("model"),
+            class_name=pred.get("class_name", "Unknown"),
+            conf=pred.get("conf", 0.0),
+            xyxy=pred.get("xyxy", []),
+            class_id=pred.get("class_id")
+        )
+        for pred in result.get("predictions", [])
+    ]
+    
+    # Prepara a URL da imagem anotada (se disponível)
+    annotated_image_url = None
+    if result.get("annotated_path"):
+        annotated_path = result["annotated_path"]
+        # Gera URL relativa para download
+        annotated_image_url = f"/api/v1/object-detector/image/{Path(annotated_path).name}"
+    
+    return dict(
+        image_path=result.get("image_path"),
+        annotated_path=result.get("annotated_path"),
+        annotated_image_url=annotated_image_url,
+        predictions=predictions,
+        processing_time=result.get("processing_time"),
+        timestamp=result.get("timestamp"),
+        model_info=result.get("model_info")
+    )
+
+
+def _status_response(job: DetectionJobModel) -> DetectionStatusResponse:
+    return DetectionStatusResponse(
+        task_id=job.id,
+        status=job.status,
+        progress=job.progress,
+        message=job.message,
+    )
+
+
+async def _get_job(task_id: str, db: AsyncSession) -> DetectionJobModel:
+    job = await DetectionJobService(db).get(task_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Detecção não encontrada: {task_id}"
+        )
+    return job
+
+
 @router.post("/object-detector/predict", response_model=DetectionResponse)
 async def predict_objects(
     image: UploadFile = File(..., description="Imagem para detecção de objetos"),
@@ -29,47 +114,28 @@ async def predict_objects(
     - **image**: Arquivo de imagem (JPG, PNG, BMP, etc.)
     - **confidence**: Threshold de confiança mínimo (padrão: 0.25)
     
-    Retorna as detecções encontradas com bounding boxes e confiança.
+    Retorna as detecções encontradas com bounding boxes e confiança. A
+    inferência roda no executor de detecção, fora do event loop; requisições
+    simultâneas são agrupadas em micro-lotes (janela de
+    OBJECT_DETECTOR_BATCH_WINDOW_MS). Com a fila cheia, responde 503 com Retry-After.
     """
     # Valida o tipo de arquivo
-    if not image.content_type or not image.content_type.startswith('image/'):
-        raise HTTPException(
-            status_code=400,
-            detail="Arquivo deve ser uma imagem válida"
-        )
+    _validate_image(image)
     
+    image_path = None
     try:
-        # Processa a imagem
-        result = detector_service.predict_from_upload(image, confidence=confidence)
-        
-        # Converte para o formato de resposta
-        predictions = [
-            DetectionPrediction(
-                model=pred.get("model"),
-                class_name=pred.get("class_name", "Unknown"),
-                conf=pred.get("conf", 0.0),
-                xyxy=pred.get("xyxy", []),
-                class_id=pred.get("class_id")
-            )
-            for pred in result.get("predictions", [])
-        ]
-        
-        # Prepara a URL da imagem anotada (se disponível)
-        annotated_image_url = None
-        if result.get("annotated_path"):
-            annotated_path = result["annotated_path"]
-            # Gera URL relativa para download
-            annotated_image_url = f"/api/v1/object-detector/image/{Path(annotated_path).name}"
-        
-        return DetectionResponse(
-            image_path=result.get("image_path"),
-            annotated_path=result.get("annotated_path"),
-            annotated_image_url=annotated_image_url,
-            predictions=predictions,
-            timestamp=result.get("timestamp"),
-            model_info=result.get("model_info")
+        # Processa a imagem (gravação do upload e inferência fora do event loop)
+        image_path = await asyncio.to_thread(detector_service.save_upload, image)
+        result = await detection_batcher.submit(
+            detector_service.predict_many, (str(image_path), confidence)
         )
+        return DetectionResponse(**_response_fields(result))
     
+    except ExecutorOverloaded as e:
+        # Recusada antes da inferência: o upload não será processado
+        if image_path is not None:
+            _remove_uploads([str(image_path)])
+        raise ServiceUnavailableError(str(e), retry_after=e.retry_after)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -77,6 +143,113 @@ async def predict_objects(
         )
 
 
+@router.post("/object-detector/predict/batch")
+async def predict_objects_batch(
+    request: Request,
+    images: List[UploadFile] = File(..., description="Imagens para detecção de objetos"),
+    confidence: float = Form(0.25, ge=0.1, le=1.0, description="Threshold de confiança (0.1 a 1.0)"),
+    detector_service: ObjectDetectorService = Depends(get_detector_service)
+):
+    """
+    Processa várias imagens em uma única requisição
+    
+    - **images**: Arquivos de imagem (até OBJECT_DETECTOR_MAX_BATCH_IMAGES)
+    - **confidence**: Threshold de confiança mínimo (padrão: 0.25)
+    
+    As imagens são processadas em lotes de OBJECT_DETECTOR_BATCH_SIZE (padrão:
+    número de CPUs), cada lote uma tarefa do executor de detecção. A resposta
+    é NDJSON, uma linha por imagem no formato de /predict (com `index`,
+    `filename` e `error`), enviada assim que o lote da imagem termina.
+    Responde 503 com Retry-After se o primeiro lote não puder ser enfileirado.
+    Com a resposta já iniciada, um lote recusado é tentado de novo até
+    OBJECT_DETECTOR_BATCH_RETRIES vezes; depois disso (ou se o cliente
+    desconectar) as imagens restantes recebem uma linha com `error`.
+    """
+    if len(images) > settings.OBJECT_DETECTOR_MAX_BATCH_IMAGES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Máximo de {settings.OBJECT_DETECTOR_MAX_BATCH_IMAGES} imagens por requisição"
+        )
+    for image in images:
+        _validate_image(image)
+    
+    # Uploads gravados antes da resposta: os arquivos da requisição não são
+    # usados depois que o streaming começa
+    filenames = [image.filename for image in images]
+    image_paths: List[str] = []
+    try:
+        for image in images:
+            image_paths.append(str(await asyncio.to_thread(detector_service.save_upload, image)))
+        size = batch_size()
+        batches = [
+            [(path, confidence) for path in image_paths[start:start + size]]
+            for start in range(0, len(image_paths), size)
+        ]
+        
+        # O primeiro lote decide a admissão (503 antes de iniciar a resposta)
+        first_results = await detection_executor.run(detector_service.predict_many, batches[0])
+    except BaseException as e:
+        # Requisição recusada antes do streaming: nenhum upload será processado
+        _remove_uploads(image_paths)
+        if isinstance(e, ExecutorOverloaded):
+            raise ServiceUnavailableError(str(e), retry_after=e.retry_after)
+        raise
+    
+    async def run_batch(batch):
+        # Resposta já iniciada: com a fila cheia, aguarda o Retry-After estimado,
+        # um número limitado de vezes e só enquanto o cliente estiver conectado
+        for attempt in range(settings.OBJECT_DETECTOR_BATCH_RETRIES + 1):
+            try:
+                return await detection_executor.run(detector_service.predict_many, batch)
+            except ExecutorOverloaded as e:
+                if attempt == settings.OBJECT_DETECTOR_BATCH_RETRIES or await request.is_disconnected():
+                    raise
+                await asyncio.sleep(e.retry_after)
+    
+    def line(index: int, result: Any) -> str:
+        if isinstance(result, Exception):
+            item = BatchDetectionResponse(
+                index=index,
+                filename=filenames[index],
+                error=f"Erro ao processar imagem: {str(result)}",
+                predictions=[],
+            )
+        else:
+            item = BatchDetectionResponse(
+                index=index, filename=filenames[index], **_response_fields(result)
+            )
+        return item.model_dump_json() + "\n"
+    
+    async def stream():
+        index = 0
+        try:
+            for position, batch in enumerate(batches):
+                try:
+                    results = first_results if position == 0 else await run_batch(batch)
+                except ExecutorOverloaded as e:
+                    # Desiste das imagens restantes: uma linha de erro para cada
+                    yield "".join(line(i, e) for i in range(index, len(image_paths)))
+                    return
+                lines = "".join(line(index + offset, result) for offset, result in enumerate(results))
+                index += len(results)
+                yield lines
+        finally:
+            # Imagens não processadas (desistência ou cliente desconectado). Síncrono:
+            # com o streaming cancelado, o finally não pode mais aguardar
+            _remove_uploads(image_paths[index:])
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@router.get("/object-detector/metrics")
+async def detection_metrics():
+    """
+    Métricas do executor de detecção: ocupação, requisições recusadas e tempos
+    (segundos) de espera na fila e de inferência
+    """
+    return detection_executor.get_stats()
+
+
 @router.get("/object-detector/image/{image_name}")
 async def get_annotated_image(
     image_name: str,
@@ -112,31 +285,96 @@ async def get_annotated_image(
         )
 
 
-@router.get("/object-detector/status/{task_id}")
-async def get_detection_status(task_id: str):
+@router.post("/object-detector/jobs", response_model=DetectionStatusResponse, status_code=202)
+async def submit_detection(
+    image: UploadFile = File(..., description="Imagem para detecção de objetos"),
+    confidence: float = Form(0.25, ge=0.1, le=1.0, description="Threshold de confiança (0.1 a 1.0)"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Enfileira a detecção de objetos de uma imagem e retorna imediatamente
+    
+    - **image**: Arquivo de imagem (JPG, PNG, BMP, etc.)
+    - **confidence**: Threshold de confiança mínimo (padrão: 0.25)
+    
+    A imagem é gravada e processada por um worker (fila `object_detector`).
+    Acompanhe pelo `task_id` em /object-detector/status/{task_id} e obtenha as
+    detecções em /object-detector/results/{task_id}.
+    """
+    _validate_image(image)
+    
+    job = await DetectionJobService(db).submit(
+        image.file, image.filename, confidence=confidence
+    )
+    if job.status == DetectionStatus.FAILED.value:
+        raise HTTPException(
+            status_code=503,
+            detail=f"{job.message} (task_id: {job.id})"
+        )
+    return _status_response(job)
+
+
+@router.get("/object-detector/status/{task_id}", response_model=DetectionStatusResponse)
+async def get_detection_status(task_id: str, db: AsyncSession = Depends(get_db)):
     """
-    Obtém o status de uma detecção assíncrona (para implementação futura)
+    Obtém o status de uma detecção assíncrona
     
     - **task_id**: ID da tarefa de detecção
+    
+    Status: pending, processing, completed ou failed (com a mensagem de erro).
     """
-    # TODO: Implementar processamento assíncrono com Celery ou similar
-    return {
-        "task_id": task_id,
-        "status": "not_implemented",
-        "message": "Processamento assíncrono ainda não implementado"
-    }
+    return _status_response(await _get_job(task_id, db))
 
 
-@router.get("/object-detector/results/{task_id}")
-async def get_detection_results(task_id: str):
+@router.get("/object-detector/results/{task_id}", response_model=DetectionResponse)
+async def get_detection_results(task_id: str, db: AsyncSession = Depends(get_db)):
     """
-    Obtém os resultados de uma detecção assíncrona (para implementação futura)
+    Obtém os resultados de uma detecção assíncrona
     
     - **task_id**: ID da tarefa de detecção
+    
+    Retorna 409 enquanto a detecção não estiver concluída (ou se tiver falhado).
     """
-    # TODO: Implementar processamento assíncrono com Celery ou similar
-    raise HTTPException(
-        status_code=501,
-        detail="Processamento assíncrono ainda não implementado"
+    job = await _get_job(task_id, db)
+    if job.status != DetectionStatus.COMPLETED.value:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Detecção não concluída (status: {job.status}): {job.message}"
+        )
+    
+    result = job.result or {}
+    annotated_image_url = None
+    if job.annotated_path:
+        annotated_image_url = f"{settings.API_V1_PREFIX}/object-detector/results/{job.id}/image"
+    
+    return DetectionResponse(
+        image_path=job.image_path,
+        annotated_path=job.annotated_path,
+        annotated_image_url=annotated_image_url,
+        predictions=[DetectionPrediction(**pred) for pred in result.get("predictions", [])],
+        processing_time=result.get("processing_time"),
+        timestamp=result.get("timestamp"),
+        model_info=result.get("model_info")
+    )
+
+
+@router.get("/object-detector/results/{task_id}/image")
+async def get_detection_result_image(task_id: str, db: AsyncSession = Depends(get_db)):
+    """
+    Retorna a imagem anotada de uma detecção assíncrona concluída
+    
+    - **task_id**: ID da tarefa de detecção
+    """
+    job = await _get_job(task_id, db)
+    if not job.annotated_path or not Path(job.annotated_path).exists():
+        raise HTTPException(
+            status_code=404,
+            detail=f"Imagem anotada não encontrada: {task_id}"
+        )
+    
+    return FileResponse(
+        path=job.annotated_path,
+        media_type="image/jpeg",
+        filename=Path(job.annotated_path).name
     )
 
@@ -1,31 +1,90 @@
-from typing import Optional, List
+import time
+from typing import AsyncIterator, Optional, List, Tuple
 from datetime import datetime
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
+from pydantic import ValidationError as PydanticValidationError
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.exceptions import ValidationError
 from app.infrastructure.database.session import get_db
 from app.application.services.publication_service import PublicationService
+from app.domain.entities.publication import Publication
+from app.domain.entities.comment import Comment, Reply
+from app.domain.value_objects.sentiment import Sentiment
+from app.domain.value_objects.emotion import Emotion
+from app.domain.value_objects.topic import Topic
+from app.infrastructure.database.repositories.publication_repository import (
+    LOAD_NONE,
+    SORT_DATE,
+    SORT_OPTIONS,
+    COMMENT_SORT_ID,
+    COMMENT_SORT_OPTIONS,
+)
+from app.infrastructure.database.repositories.text_search import MODE_AUTO, SEARCH_MODES
 from app.api.v1.schemas.publication_schemas import (
     PublicationCreateSchema,
     PublicationResponseSchema,
+    PublicationPartialResponseSchema,
     PublicationListResponseSchema,
+    PublicationSearchResultSchema,
+    PublicationSearchResponseSchema,
+    CommentSearchResponseSchema,
+    PublicationCommentsResponseSchema,
+    TagFacetSchema,
+    TagFacetsResponseSchema,
+    BulkLineErrorSchema,
+    BulkBatchSummarySchema,
+    BulkIngestResponseSchema,
 )
 
 router = APIRouter()
 
+FIELDS_DESCRIPTION = "Campos a retornar, separados por vírgula (ex: id,date,tags)"
+SEARCH_MODE_PATTERN = f"^({'|'.join(SEARCH_MODES)})$"
+SEARCH_MODE_DESCRIPTION = "auto (full-text, com fallback para substring), fulltext ou substring"
+MERGE_DESCRIPTION = "Mescla comentários novos e contadores em publicações já existentes"
+SORT_PATTERN = f"^({'|'.join(SORT_OPTIONS)})$"
+SORT_DESCRIPTION = "Ordenação decrescente: date, views, likes ou shares"
+COMMENT_SORT_PATTERN = f"^({'|'.join(COMMENT_SORT_OPTIONS)})$"
+COMMENT_SORT_DESCRIPTION = "id (ordem de coleta) ou likes (mais curtidos primeiro)"
 
-@router.post("/publications", response_model=PublicationResponseSchema, status_code=201)
-async def create_publication(
-    publication: PublicationCreateSchema,
-    db: AsyncSession = Depends(get_db),
-):
-    """Cria uma nova publicação."""
-    service = PublicationService(db)
-    
-    from app.domain.entities.publication import Publication
-    from app.domain.entities.comment import Comment, Reply
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Valida o parâmetro `fields=` contra os campos de PublicationResponseSchema."""
+    if not fields:
+        return None
     
-    # Converte schema para entidade
+    names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    invalid = [name for name in names if name not in PublicationResponseSchema.model_fields]
+    if invalid:
+        raise ValidationError(f"Campos inválidos: {', '.join(invalid)}")
+    return names
+
+
+def engagement_filters(**ranges: Tuple[Optional[int], Optional[int]]) -> dict:
+    """Faixas {métrica: (mínimo, máximo)} informadas nos filtros min_/max_ de engajamento."""
+    filters = {}
+    for metric, (minimum, maximum) in ranges.items():
+        if minimum is not None and maximum is not None and minimum > maximum:
+            raise ValidationError(f"min_{metric} deve ser menor ou igual a max_{metric}")
+        if minimum is not None or maximum is not None:
+            filters[metric] = (minimum, maximum)
+    return filters
+
+
+def _to_items(items: list, fields: Optional[List[str]]) -> list:
+    """Projeta os models nos campos pedidos (somente eles são serializados)."""
+    if not fields:
+        return items
+    return [
+        PublicationPartialResponseSchema(id=item.id, **{name: getattr(item, name) for name in fields})
+        for item in items
+    ]
+
+
+def _to_entity(publication: PublicationCreateSchema) -> Publication:
+    """Converte o schema de criação para a entidade de domínio."""
     comments = [
         Comment(
             username=c.username,
@@ -36,7 +95,7 @@ async def create_publication(
         for c in publication.comments
     ]
     
-    pub_entity = Publication(
+    return Publication(
         publicacao_n=publication.publicacao_n,
         url=str(publication.url),
         description=publication.description,
@@ -50,42 +109,293 @@ async def create_publication(
         tags=publication.tags,
         comments=comments,
     )
+
+
+async def _iter_ndjson(stream: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, bytes]]:
+    """Lê um corpo NDJSON em streaming, retornando (número da linha, linha) das linhas não vazias."""
+    buffer = b""
+    line_number = 0
+    async for chunk in stream:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, line
+    if buffer.strip():
+        yield line_number + 1, buffer
+
+
+def _validation_message(error: PydanticValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" if err["loc"] else err["msg"]
+        for err in error.errors()
+    )
+
+
+async def _ingest_batch(
+    service: PublicationService,
+    number: int,
+    lines: List[Tuple[int, bytes]],
+    merge: bool = False,
+) -> BulkBatchSummarySchema:
+    """Valida e grava um lote de linhas NDJSON."""
+    started = time.perf_counter()
+    publications, errors = [], []
+    for line_number, line in lines:
+        try:
+            publications.append(_to_entity(PublicationCreateSchema.model_validate_json(line)))
+        except PydanticValidationError as e:
+            errors.append(BulkLineErrorSchema(line=line_number, error=_validation_message(e)))
+    
+    result = {"received": len(publications), "inserted": 0, "duplicates": 0}
+    if publications:
+        try:
+            result = await service.create_publications(publications, merge=merge)
+        except SQLAlchemyError as e:
+            await service.session.rollback()
+            errors.append(BulkLineErrorSchema(
+                line=lines[0][0], error=f"Falha ao gravar o lote: {e.__class__.__name__}"
+            ))
     
-    result = await service.create_publication(pub_entity)
+    return BulkBatchSummarySchema(
+        batch=number,
+        first_line=lines[0][0],
+        last_line=lines[-1][0],
+        errors=errors,
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+        **result,
+    )
+
+
+@router.post("/publications", response_model=PublicationResponseSchema, status_code=201)
+async def create_publication(
+    publication: PublicationCreateSchema,
+    merge: bool = Query(False, description=MERGE_DESCRIPTION),
+    db: AsyncSession = Depends(get_db),
+):
+    """Cria uma nova publicação (ou, com `merge=true`, mescla uma nova coleta de uma existente)."""
+    service = PublicationService(db)
+    result = await service.create_publication(_to_entity(publication), merge=merge)
     return result
 
 
-@router.get("/publications", response_model=PublicationListResponseSchema)
+@router.post("/publications/bulk", response_model=BulkIngestResponseSchema)
+async def bulk_create_publications(
+    request: Request,
+    batch_size: int = Query(500, ge=1, le=5000),
+    merge: bool = Query(False, description=MERGE_DESCRIPTION),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Cria publicações em lote a partir de um corpo NDJSON (uma publicação por
+    linha, no formato de POST /publications). O corpo é lido em streaming e
+    gravado a cada `batch_size` linhas, cada lote em sua própria transação.
+    Publicações já existentes são ignoradas ou, com `merge=true`, mescladas.
+    """
+    service = PublicationService(db)
+    started = time.perf_counter()
+    batches: List[BulkBatchSummarySchema] = []
+    
+    lines: List[Tuple[int, bytes]] = []
+    async for line in _iter_ndjson(request.stream()):
+        lines.append(line)
+        if len(lines) >= batch_size:
+            batches.append(await _ingest_batch(service, len(batches) + 1, lines, merge=merge))
+            lines = []
+    if lines:
+        batches.append(await _ingest_batch(service, len(batches) + 1, lines, merge=merge))
+    
+    elapsed = time.perf_counter() - started
+    inserted = sum(batch.inserted for batch in batches)
+    return BulkIngestResponseSchema(
+        batches=batches,
+        received=sum(batch.received for batch in batches),
+        inserted=inserted,
+        merged=sum(batch.merged for batch in batches),
+        duplicates=sum(batch.duplicates for batch in batches),
+        errors=sum(len(batch.errors) for batch in batches),
+        elapsed_ms=round(elapsed * 1000, 1),
+        publications_per_second=round(inserted / elapsed, 1) if elapsed else 0.0,
+    )
+
+
+@router.get(
+    "/publications",
+    response_model=PublicationListResponseSchema,
+    response_model_exclude_unset=True,
+)
 async def list_publications(
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
     tags: Optional[List[str]] = Query(None),
     limit: int = Query(100, ge=1, le=10000),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Cursor opaco retornado em next_cursor"),
+    include_total: bool = Query(False, description="Inclui o total (estimado em volumes grandes)"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    sort: str = Query(SORT_DATE, pattern=SORT_PATTERN, description=SORT_DESCRIPTION),
+    min_views: Optional[int] = Query(None, ge=0),
+    max_views: Optional[int] = Query(None, ge=0),
+    min_likes: Optional[int] = Query(None, ge=0),
+    max_likes: Optional[int] = Query(None, ge=0),
+    min_shares: Optional[int] = Query(None, ge=0),
+    max_shares: Optional[int] = Query(None, ge=0),
     db: AsyncSession = Depends(get_db),
 ):
-    """Lista publicações com filtros."""
+    """
+    Lista publicações com filtros (paginação por cursor sobre a ordenação
+    `sort` e id). Os filtros min_/max_ de engajamento usam as contagens
+    numéricas (`views_count`, `likes_count`, `shares_count`).
+    """
     service = PublicationService(db)
     
-    items = await service.list_publications(
-        start_date=start_date,
-        end_date=end_date,
-        tags=tags,
+    if cursor and offset:
+        raise ValidationError("Use cursor ou offset, não ambos")
+    field_names = _parse_fields(fields)
+    engagement = engagement_filters(
+        views=(min_views, max_views),
+        likes=(min_likes, max_likes),
+        shares=(min_shares, max_shares),
+    )
+    
+    try:
+        items, next_cursor = await service.list_publications(
+            start_date=start_date,
+            end_date=end_date,
+            tags=tags,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            load=LOAD_NONE,
+            fields=field_names,
+            sort=sort,
+            engagement=engagement,
+        )
+    except ValueError as e:
+        raise ValidationError(str(e))
+    
+    total, total_estimated = None, False
+    if include_total:
+        total, total_estimated = await service.estimate_publications(
+            start_date=start_date,
+            end_date=end_date,
+            tags=tags,
+            engagement=engagement,
+        )
+    
+    return PublicationListResponseSchema(
+        items=_to_items(items, field_names),
+        total=total,
+        total_estimated=total_estimated,
         limit=limit,
         offset=offset,
+        next_cursor=next_cursor,
+    )
+
+
+# Rotas fixas (/publications/search...) precisam vir antes de /publications/{publication_id}
+@router.get(
+    "/publications/search",
+    response_model=PublicationSearchResponseSchema,
+    response_model_exclude_unset=True,
+)
+async def search_publications(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(100, ge=1, le=1000),
+    mode: str = Query(MODE_AUTO, pattern=SEARCH_MODE_PATTERN, description=SEARCH_MODE_DESCRIPTION),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_db),
+):
+    """Busca publicações por texto, ordenadas por relevância e com os termos destacados."""
+    service = PublicationService(db)
+    field_names = _parse_fields(fields)
+    results, used_mode = await service.search_publications(
+        q, limit=limit, mode=mode, load=LOAD_NONE, fields=field_names
     )
     
-    total = await service.count_publications(
+    if field_names:
+        items = [
+            PublicationPartialResponseSchema(
+                id=item.id,
+                rank=rank,
+                highlight=highlight,
+                **{name: getattr(item, name) for name in field_names},
+            )
+            for item, rank, highlight in results
+        ]
+    else:
+        items = [
+            PublicationSearchResultSchema(
+                **PublicationResponseSchema.model_validate(item).model_dump(),
+                rank=rank,
+                highlight=highlight,
+            )
+            for item, rank, highlight in results
+        ]
+    
+    return PublicationSearchResponseSchema(
+        items=items,
+        total=len(items),
+        limit=limit,
+        mode=used_mode,
+    )
+
+
+@router.get("/publications/search/comments", response_model=CommentSearchResponseSchema)
+async def search_comments(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(100, ge=1, le=1000),
+    mode: str = Query(MODE_AUTO, pattern=SEARCH_MODE_PATTERN, description=SEARCH_MODE_DESCRIPTION),
+    db: AsyncSession = Depends(get_db),
+):
+    """Busca comentários e respostas por texto, ordenados por relevância."""
+    service = PublicationService(db)
+    results, used_mode = await service.search_comments(q, limit=limit, mode=mode)
+    
+    return CommentSearchResponseSchema(
+        items=results,
+        total=len(results),
+        limit=limit,
+        mode=used_mode,
+    )
+
+
+@router.get("/publications/tags/facets", response_model=TagFacetsResponseSchema)
+async def tag_facets(
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    tags: Optional[List[str]] = Query(None),
+    limit: int = Query(100, ge=1, le=1000),
+    min_views: Optional[int] = Query(None, ge=0),
+    max_views: Optional[int] = Query(None, ge=0),
+    min_likes: Optional[int] = Query(None, ge=0),
+    max_likes: Optional[int] = Query(None, ge=0),
+    min_shares: Optional[int] = Query(None, ge=0),
+    max_shares: Optional[int] = Query(None, ge=0),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Número de publicações por tag entre as publicações filtradas (mesmos
+    filtros de GET /publications), das tags mais frequentes para as menos.
+    """
+    service = PublicationService(db)
+    engagement = engagement_filters(
+        views=(min_views, max_views),
+        likes=(min_likes, max_likes),
+        shares=(min_shares, max_shares),
+    )
+    facets = await service.tag_facets(
         start_date=start_date,
         end_date=end_date,
         tags=tags,
+        engagement=engagement,
+        limit=limit,
     )
     
-    return PublicationListResponseSchema(
-        items=items,
-        total=total,
+    return TagFacetsResponseSchema(
+        items=[TagFacetSchema(tag=tag, count=count) for tag, count in facets],
         limit=limit,
-        offset=offset,
     )
 
 
@@ -96,7 +406,7 @@ async def get_publication(
 ):
     """Obtém uma publicação por ID."""
     service = PublicationService(db)
-    publication = await service.get_publication(publication_id)
+    publication = await service.get_publication(publication_id, load=LOAD_NONE)
     
     if not publication:
         from app.core.exceptions import NotFoundError
@@ -105,20 +415,50 @@ async def get_publication(
     return publication
 
 
-@router.get("/publications/search", response_model=PublicationListResponseSchema)
-async def search_publications(
-    q: str = Query(..., min_length=1),
+@router.get(
+    "/publications/{publication_id}/comments",
+    response_model=PublicationCommentsResponseSchema,
+    response_model_exclude_unset=True,
+)
+async def list_publication_comments(
+    publication_id: int,
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Cursor opaco retornado em next_cursor"),
+    sort: str = Query(COMMENT_SORT_ID, pattern=COMMENT_SORT_PATTERN, description=COMMENT_SORT_DESCRIPTION),
+    include_replies: bool = Query(False, description="Inclui as respostas de cada comentário"),
+    include_labels: bool = Query(False, description="Inclui os labels de NLP armazenados"),
+    sentiment: Optional[Sentiment] = Query(None),
+    emotion: Optional[Emotion] = Query(None),
+    topic: Optional[Topic] = Query(None),
     db: AsyncSession = Depends(get_db),
 ):
-    """Busca publicações por texto."""
+    """
+    Lista os comentários de uma publicação (paginação por cursor), com filtros
+    pelos labels armazenados dos comentários.
+    """
     service = PublicationService(db)
-    items = await service.search_publications(q, limit=limit)
+    labels = {
+        name: value.value
+        for name, value in (("sentiment", sentiment), ("emotion", emotion), ("topic", topic))
+        if value is not None
+    }
     
-    return PublicationListResponseSchema(
-        items=items,
-        total=len(items),
-        limit=limit,
-        offset=0,
-    )
-
+    try:
+        result = await service.list_comments(
+            publication_id,
+            limit=limit,
+            cursor=cursor,
+            sort=sort,
+            labels=labels,
+            include_labels=include_labels,
+            include_replies=include_replies,
+        )
+    except ValueError as e:
+        raise ValidationError(str(e))
+    
+    if result is None:
+        from app.core.exceptions import NotFoundError
+        raise NotFoundError(f"Publicação {publication_id} não encontrada")
+    
+    items, next_cursor = result
+    return PublicationCommentsResponseSchema(items=items, limit=limit, next_cursor=next_cursor)
@@ -14,6 +14,26 @@ class DashboardStatsResponseSchema(BaseModel):
     date_range: Optional[List[datetime]] = None
 
 
+class TimeSeriesPointSchema(BaseModel):
+    bucket: datetime
+    threat_count: int
+    sentiment_distribution: Dict[str, int]
+    emotion_distribution: Dict[str, int]
+    topic_distribution: Dict[str, int]
+
+
+class TimeSeriesResponseSchema(BaseModel):
+    bucket: str
+    tz: str
+    points: List[TimeSeriesPointSchema]
+
+
+class CacheStatsResponseSchema(BaseModel):
+    hits: int
+    misses: int
+    hit_rate: float
+
+
 class FilterParamsSchema(BaseModel):
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
@@ -23,6 +23,13 @@ class DetectionResponse(BaseModel):
     model_info: Optional[dict] = None
 
 
+class BatchDetectionResponse(DetectionResponse):
+    """Resultado de uma imagem de /predict/batch (uma linha NDJSON por imagem)"""
+    index: int  # posição da imagem na requisição
+    filename: Optional[str] = None
+    error: Optional[str] = None
+
+
 class DetectionStatusResponse(BaseModel):
     """Status de uma detecção assíncrona"""
     task_id: str
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, HttpUrl
-from typing import Optional, List
+from typing import Optional, List, Union
 from datetime import datetime
 
 
@@ -42,6 +42,10 @@ class PublicationResponseSchema(BaseModel):
     comments_count: int = 0
     shares: Optional[str] = None
     bookmarks: Optional[str] = None
+    views_count: int = 0
+    likes_count: int = 0
+    shares_count: int = 0
+    bookmarks_count: int = 0
     music_title: Optional[str] = None
     tags: List[str] = []
     created_at: datetime
@@ -51,9 +55,127 @@ class PublicationResponseSchema(BaseModel):
         from_attributes = True
 
 
+class PublicationPartialResponseSchema(BaseModel):
+    """Publicação com apenas os campos pedidos em `fields=`."""
+    id: int
+    publicacao_n: Optional[int] = None
+    url: Optional[str] = None
+    description: Optional[str] = None
+    date: Optional[datetime] = None
+    views: Optional[str] = None
+    likes: Optional[str] = None
+    comments_count: Optional[int] = None
+    shares: Optional[str] = None
+    bookmarks: Optional[str] = None
+    views_count: Optional[int] = None
+    likes_count: Optional[int] = None
+    shares_count: Optional[int] = None
+    bookmarks_count: Optional[int] = None
+    music_title: Optional[str] = None
+    tags: Optional[List[str]] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    # Somente na busca
+    rank: Optional[float] = None
+    highlight: Optional[str] = None
+
+
 class PublicationListResponseSchema(BaseModel):
-    items: List[PublicationResponseSchema]
-    total: int
+    items: List[Union[PublicationResponseSchema, PublicationPartialResponseSchema]]
+    total: Optional[int] = None
+    total_estimated: bool = False
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
+
+
+class PublicationSearchResultSchema(PublicationResponseSchema):
+    rank: float
+    highlight: Optional[str] = None
+
+
+class PublicationSearchResponseSchema(BaseModel):
+    items: List[Union[PublicationSearchResultSchema, PublicationPartialResponseSchema]]
+    total: int
+    limit: int
+    mode: str
+
+
+class PublicationReplyResponseSchema(BaseModel):
+    id: int
+    username: str
+    text: str
+    likes: int = 0
+    created_at: Optional[datetime] = None
+    # Somente com include_labels
+    sentiment: Optional[str] = None
+    emotion: Optional[str] = None
+    topic: Optional[str] = None
+
+
+class PublicationCommentResponseSchema(PublicationReplyResponseSchema):
+    # Somente com include_replies
+    replies: Optional[List[PublicationReplyResponseSchema]] = None
+
+
+class PublicationCommentsResponseSchema(BaseModel):
+    items: List[PublicationCommentResponseSchema]
+    limit: int
+    next_cursor: Optional[str] = None
+
+
+class TagFacetSchema(BaseModel):
+    tag: str
+    count: int
+
+
+class TagFacetsResponseSchema(BaseModel):
+    items: List[TagFacetSchema]
+    limit: int
+
+
+class CommentSearchResultSchema(BaseModel):
+    kind: str
+    id: int
+    publication_id: int
+    comment_id: Optional[int] = None
+    username: str
+    text: str
+    likes: int = 0
+    rank: float
+    highlight: Optional[str] = None
+
+
+class CommentSearchResponseSchema(BaseModel):
+    items: List[CommentSearchResultSchema]
+    total: int
+    limit: int
+    mode: str
+
+
+class BulkLineErrorSchema(BaseModel):
+    line: int
+    error: str
+
+
+class BulkBatchSummarySchema(BaseModel):
+    batch: int
+    first_line: int
+    last_line: int
+    received: int
+    inserted: int
+    merged: int = 0
+    duplicates: int
+    errors: List[BulkLineErrorSchema] = []
+    elapsed_ms: float
+
 
+class BulkIngestResponseSchema(BaseModel):
+    batches: List[BulkBatchSummarySchema]
+    received: int
+    inserted: int
+    merged: int = 0
+    duplicates: int
+    errors: int
+    elapsed_ms: float
+    publications_per_second: float
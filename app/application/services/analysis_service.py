@@ -1,22 +1,116 @@
-from typing import List, Dict, Optional
-from datetime import datetime
-from collections import Counter
+from typing import List, Dict, Optional, Sequence, Tuple
+from datetime import datetime, date, time, timedelta
+from collections import Counter, defaultdict
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.domain.entities.analysis import DashboardStats
+from app.domain.entities.analysis import DashboardStats, TimeSeriesPoint
 from app.domain.entities.publication import Publication
+from app.domain.entities.comment import Comment, Reply
 from app.domain.value_objects.sentiment import Sentiment
 from app.domain.value_objects.emotion import Emotion
 from app.domain.value_objects.topic import Topic
-from app.application.services.publication_service import PublicationService
 from app.application.services.nlp_service import NLPService
+from app.infrastructure.cache.dashboard_cache import DashboardCache, dashboard_cache
+from app.infrastructure.database.repositories.analysis_repository import (
+    AnalysisRepository,
+    attach_analysis,
+    attach_labels,
+)
+from app.infrastructure.database.repositories.rollup_repository import (
+    RollupRepository,
+    publication_rollup_deltas,
+    comment_rollup_deltas,
+    ALL_TAGS,
+    SENTIMENT,
+    EMOTION,
+    TOPIC,
+    VOLUME,
+    PUBLICATIONS,
+    COMMENTS,
+    THREATS,
+)
+
+
+# Intervalos suportados pela série temporal
+TIMESERIES_BUCKETS = ("hour", "day", "week")
+
+
+def _normalize_tags(tags: Optional[List[str]]) -> Optional[List[str]]:
+    """Tags do filtro sem vazias e repetidas (None = sem filtro)."""
+    return sorted({tag for tag in (tags or []) if tag}) or None
+
+
+def _distribution_to_cache(distribution: Dict) -> Dict[str, int]:
+    return {k.value: v for k, v in distribution.items()}
+
+
+def _stats_to_cache(stats: DashboardStats) -> dict:
+    """Serializa DashboardStats para o cache (JSON)."""
+    return {
+        "total_publications": stats.total_publications,
+        "total_comments": stats.total_comments,
+        "threat_count": stats.threat_count,
+        "negative_sentiment_percent": stats.negative_sentiment_percent,
+        "sentiment_distribution": _distribution_to_cache(stats.sentiment_distribution),
+        "emotion_distribution": _distribution_to_cache(stats.emotion_distribution),
+        "topic_distribution": _distribution_to_cache(stats.topic_distribution),
+        "date_range": [d.isoformat() for d in stats.date_range] if stats.date_range else None,
+    }
+
+
+def _stats_from_cache(data: dict) -> DashboardStats:
+    """Reconstrói DashboardStats a partir do cache."""
+    return DashboardStats(
+        total_publications=data["total_publications"],
+        total_comments=data["total_comments"],
+        threat_count=data["threat_count"],
+        negative_sentiment_percent=data["negative_sentiment_percent"],
+        sentiment_distribution={Sentiment(k): v for k, v in data["sentiment_distribution"].items()},
+        emotion_distribution={Emotion(k): v for k, v in data["emotion_distribution"].items()},
+        topic_distribution={Topic(k): v for k, v in data["topic_distribution"].items()},
+        date_range=(
+            tuple(datetime.fromisoformat(d) for d in data["date_range"])
+            if data["date_range"] else None
+        ),
+    )
+
+
+def _timeseries_to_cache(points: List[TimeSeriesPoint]) -> list:
+    """Serializa a série temporal para o cache (JSON)."""
+    return [
+        {
+            "bucket": point.bucket.isoformat(),
+            "threat_count": point.threat_count,
+            "sentiment_distribution": _distribution_to_cache(point.sentiment_distribution),
+            "emotion_distribution": _distribution_to_cache(point.emotion_distribution),
+            "topic_distribution": _distribution_to_cache(point.topic_distribution),
+        }
+        for point in points
+    ]
+
+
+def _timeseries_from_cache(data: list) -> List[TimeSeriesPoint]:
+    """Reconstrói a série temporal a partir do cache."""
+    return [
+        TimeSeriesPoint(
+            bucket=datetime.fromisoformat(point["bucket"]),
+            threat_count=point["threat_count"],
+            sentiment_distribution={Sentiment(k): v for k, v in point["sentiment_distribution"].items()},
+            emotion_distribution={Emotion(k): v for k, v in point["emotion_distribution"].items()},
+            topic_distribution={Topic(k): v for k, v in point["topic_distribution"].items()},
+        )
+        for point in data
+    ]
 
 
 class AnalysisService:
     """Serviço de análise e agregação de dados."""
     
-    def __init__(self, session: AsyncSession):
-        self.publication_service = PublicationService(session)
+    def __init__(self, session: AsyncSession, cache: Optional[DashboardCache] = None):
+        self.session = session
+        self.cache = cache or dashboard_cache
+        self.analysis_repository = AnalysisRepository(session)
+        self.rollup_repository = RollupRepository(session)
         self.nlp_service = NLPService()
     
     async def get_dashboard_stats(
@@ -25,15 +119,37 @@ class AnalysisService:
         end_date: Optional[datetime] = None,
         tags: Optional[List[str]] = None,
     ) -> DashboardStats:
-        """Gera estatísticas agregadas para o dashboard."""
-        publications = await self.publication_service.list_publications(
-            start_date=start_date,
-            end_date=end_date,
-            tags=tags,
-            limit=10000,  # Limite alto para análise completa
+        """Gera estatísticas agregadas para o dashboard (com cache Redis)."""
+        tags = _normalize_tags(tags)
+        key = self.cache.build_key("stats", start_date, end_date, tags)
+        generation = await self.cache.generation()
+        cached = await self.cache.get(key)
+        if cached is not None:
+            return _stats_from_cache(cached)
+        
+        stats = await self._compute_dashboard_stats(start_date, end_date, tags)
+        await self.cache.set(
+            key, _stats_to_cache(stats), start_date, end_date, tags, generation=generation
         )
+        return stats
+    
+    async def _compute_dashboard_stats(
+        self,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        tags: Optional[List[str]],
+    ) -> DashboardStats:
+        """
+        Calcula as estatísticas do dashboard.
+        
+        Dias completos do período são lidos dos agregados diários (`dashboard_rollups`);
+        apenas as frações de dia nas bordas do período e filtros com mais de uma tag
+        são agregados a partir dos labels armazenados.
+        """
+        counts = await self._count(start_date, end_date, tags)
+        volume = counts[VOLUME]
         
-        if not publications:
+        if not volume[PUBLICATIONS]:
             return DashboardStats(
                 total_publications=0,
                 total_comments=0,
@@ -45,67 +161,308 @@ class AnalysisService:
                 date_range=(start_date, end_date) if start_date and end_date else None,
             )
         
-        # Processa todas as publicações
-        all_sentiments = []
-        all_emotions = []
-        all_topics = []
-        total_comments = 0
-        threat_count = 0
-        
-        for pub_model in publications:
-            # Converte para entidade de domínio
-            publication = self._model_to_entity(pub_model)
-            
-            # Analisa publicação
-            analyzed = self.nlp_service.analyze_publication(publication)
-            
-            # Coleta dados
-            all_sentiments.append(analyzed.main_sentiment)
-            all_emotions.append(analyzed.main_emotion)
-            all_topics.append(analyzed.main_topic)
-            
-            total_comments += len(publication.comments)
-            for comment in publication.comments:
-                total_comments += len(comment.replies)
-            
-            # Conta ameaças
-            if analyzed.main_topic == Topic.AMEACAS_E_RISCOS:
-                threat_count += 1
-            
-            # Conta sentimento negativo
-            for analyzed_comment in analyzed.analyzed_comments:
-                all_sentiments.append(analyzed_comment.sentiment)
-                all_emotions.append(analyzed_comment.emotion)
-                all_topics.append(analyzed_comment.topic)
-                
-                if analyzed_comment.topic == Topic.AMEACAS_E_RISCOS:
-                    threat_count += 1
-        
         # Calcula distribuições
-        sentiment_counts = Counter(all_sentiments)
-        emotion_counts = Counter(all_emotions)
-        topic_counts = Counter(all_topics)
+        sentiment_counts = {Sentiment(k): v for k, v in counts[SENTIMENT].items() if v}
+        emotion_counts = {Emotion(k): v for k, v in counts[EMOTION].items() if v}
+        topic_counts = {Topic(k): v for k, v in counts[TOPIC].items() if v}
         
         # Calcula percentual de sentimento negativo
-        total_sentiments = len(all_sentiments)
+        total_sentiments = sum(sentiment_counts.values())
         negative_count = sentiment_counts.get(Sentiment.NEGATIVO, 0)
         negative_percent = (negative_count / total_sentiments * 100) if total_sentiments > 0 else 0.0
         
         # Determina range de datas
-        dates = [pub.date for pub in publications if pub.date]
-        date_range = (min(dates), max(dates)) if dates else None
+        min_date, max_date = await self.analysis_repository.get_date_range(
+            start_date=start_date,
+            end_date=end_date,
+            tags=tags,
+        )
+        date_range = (min_date, max_date) if min_date and max_date else None
         
         return DashboardStats(
-            total_publications=len(publications),
-            total_comments=total_comments,
-            threat_count=threat_count,
+            total_publications=volume[PUBLICATIONS],
+            total_comments=volume[COMMENTS],
+            threat_count=volume[THREATS],
             negative_sentiment_percent=negative_percent,
-            sentiment_distribution=dict(sentiment_counts),
-            emotion_distribution=dict(emotion_counts),
-            topic_distribution=dict(topic_counts),
+            sentiment_distribution=sentiment_counts,
+            emotion_distribution=emotion_counts,
+            topic_distribution=topic_counts,
             date_range=date_range,
         )
     
+    async def get_timeseries(
+        self,
+        bucket: str = "day",
+        tz: str = "UTC",
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        tags: Optional[List[str]] = None,
+    ) -> List[TimeSeriesPoint]:
+        """Gera a série temporal das distribuições (com cache Redis)."""
+        tags = _normalize_tags(tags)
+        key = self.cache.build_key("timeseries", start_date, end_date, tags, bucket=bucket, tz=tz)
+        generation = await self.cache.generation()
+        cached = await self.cache.get(key)
+        if cached is not None:
+            return _timeseries_from_cache(cached)
+        
+        points = await self._compute_timeseries(bucket, tz, start_date, end_date, tags)
+        await self.cache.set(
+            key, _timeseries_to_cache(points), start_date, end_date, tags, generation=generation
+        )
+        return points
+    
+    async def _compute_timeseries(
+        self,
+        bucket: str,
+        tz: str,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        tags: Optional[List[str]],
+    ) -> List[TimeSeriesPoint]:
+        """
+        Calcula a série temporal das distribuições de sentimento, emoção e tópico.
+        
+        Intervalos diários/semanais em UTC, com período em dias inteiros e no máximo
+        uma tag, são lidos dos agregados diários; os demais casos agrupam os labels
+        armazenados com date_trunc no fuso `tz`. Em ambos os casos é uma única query.
+        """
+        tag_set = tags or []
+        day_aligned = (
+            (start_date is None or start_date.time() == time.min)
+            and (end_date is None or end_date.time() == time.max)
+        )
+        
+        buckets: Dict[datetime, Dict[str, Counter]] = defaultdict(lambda: defaultdict(Counter))
+        if bucket in ("day", "week") and tz == "UTC" and len(tag_set) <= 1 and day_aligned:
+            first_day, last_day = self._full_days(start_date, end_date)
+            rows = await self.rollup_repository.sum_by_bucket(
+                bucket,
+                tag=tag_set[0] if tag_set else ALL_TAGS,
+                first_day=first_day,
+                last_day=last_day,
+            )
+            for bucket_start, dimension, label, count in rows:
+                buckets[bucket_start][dimension][label] += count
+        else:
+            rows = await self.analysis_repository.count_labels_by_bucket(
+                bucket,
+                tz=tz,
+                start_date=start_date,
+                end_date=end_date,
+                tags=tags,
+            )
+            for bucket_start, sentiment, emotion, topic, count in rows:
+                counts = buckets[bucket_start]
+                counts[SENTIMENT][sentiment] += count
+                counts[EMOTION][emotion] += count
+                counts[TOPIC][topic] += count
+                if topic == Topic.AMEACAS_E_RISCOS.value:
+                    counts[VOLUME][THREATS] += count
+        
+        return [
+            TimeSeriesPoint(
+                bucket=bucket_start,
+                threat_count=buckets[bucket_start][VOLUME][THREATS],
+                sentiment_distribution={
+                    Sentiment(k): v for k, v in buckets[bucket_start][SENTIMENT].items() if v
+                },
+                emotion_distribution={
+                    Emotion(k): v for k, v in buckets[bucket_start][EMOTION].items() if v
+                },
+                topic_distribution={
+                    Topic(k): v for k, v in buckets[bucket_start][TOPIC].items() if v
+                },
+            )
+            for bucket_start in sorted(buckets)
+        ]
+    
+    async def _count(
+        self,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        tags: Optional[List[str]],
+    ) -> Dict[str, Counter]:
+        """
+        Contagens por dimensão, combinando agregados diários e labels armazenados.
+        `tags` já normalizadas (`_normalize_tags`), como nos agregados.
+        """
+        tag_set = tags or []
+        
+        # Os agregados são por tag individual; interseção de tags exige os labels
+        if len(tag_set) > 1:
+            return await self._count_labels(start_date, end_date, tags)
+        
+        first_day, last_day = self._full_days(start_date, end_date)
+        if first_day and last_day and first_day > last_day:
+            return await self._count_labels(start_date, end_date, tags)
+        
+        counts: Dict[str, Counter] = defaultdict(Counter)
+        rows = await self.rollup_repository.sum(
+            tag=tag_set[0] if tag_set else ALL_TAGS,
+            first_day=first_day,
+            last_day=last_day,
+        )
+        for dimension, label, count in rows:
+            counts[dimension][label] += count
+        
+        # Frações de dia nas bordas do período
+        edges = []
+        if start_date and start_date.time() != time.min:
+            edges.append((start_date, datetime.combine(first_day, time.min) - timedelta(microseconds=1)))
+        if end_date and end_date.time() != time.max:
+            edges.append((datetime.combine(last_day + timedelta(days=1), time.min), end_date))
+        for edge_start, edge_end in edges:
+            edge_counts = await self._count_labels(edge_start, edge_end, tags)
+            for dimension, dimension_counts in edge_counts.items():
+                counts[dimension].update(dimension_counts)
+        
+        return counts
+    
+    @staticmethod
+    def _full_days(
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+    ) -> Tuple[Optional[date], Optional[date]]:
+        """Primeiro e último dia inteiramente contidos no período (None = sem limite)."""
+        first_day = None
+        if start_date:
+            first_day = start_date.date()
+            if start_date.time() != time.min:
+                first_day += timedelta(days=1)
+        
+        last_day = None
+        if end_date:
+            last_day = end_date.date()
+            if end_date.time() != time.max:
+                last_day -= timedelta(days=1)
+        
+        return first_day, last_day
+    
+    async def _count_labels(
+        self,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        tags: Optional[List[str]],
+    ) -> Dict[str, Counter]:
+        """Contagens por dimensão agregadas (GROUP BY) a partir dos labels armazenados."""
+        totals = await self.analysis_repository.get_totals(
+            start_date=start_date,
+            end_date=end_date,
+            tags=tags,
+        )
+        label_counts = await self.analysis_repository.count_labels(
+            start_date=start_date,
+            end_date=end_date,
+            tags=tags,
+        )
+        
+        counts: Dict[str, Counter] = defaultdict(Counter)
+        counts[VOLUME][PUBLICATIONS] = totals["total_publications"]
+        counts[VOLUME][COMMENTS] = totals["total_comments"]
+        for sentiment, emotion, topic, count in label_counts:
+            counts[SENTIMENT][sentiment] += count
+            counts[EMOTION][emotion] += count
+            counts[TOPIC][topic] += count
+        counts[VOLUME][THREATS] = counts[TOPIC][Topic.AMEACAS_E_RISCOS.value]
+        
+        return counts
+    
+    async def rebuild_rollups(self, batch_size: int = 1000) -> int:
+        """Recalcula os agregados diários do dashboard a partir dos labels armazenados."""
+        total = await self.rollup_repository.rebuild(batch_size=batch_size)
+        await self.cache.invalidate_all()
+        return total
+    
+    async def backfill_analyses(self, batch_size: int = 100) -> int:
+        """
+        Analisa e armazena os labels de publicações que ainda não os possuem
+        (ex: dados carregados diretamente pela migration populate_json_data).
+        Retorna o número de publicações analisadas.
+        """
+        total = 0
+        while True:
+            publications = await self.analysis_repository.list_unanalyzed_publications(
+                limit=batch_size
+            )
+            if not publications:
+                break
+            
+            analyzed_publications = await self.nlp_service.analyze_publications_async(
+                [self._model_to_entity(pub_model) for pub_model in publications]
+            )
+            for pub_model, analyzed in zip(publications, analyzed_publications):
+                await self.analysis_repository.save(pub_model, analyzed)
+                await self.rollup_repository.apply(
+                    publication_rollup_deltas(pub_model.date, pub_model.tags, analyzed)
+                )
+            
+            await self.session.commit()
+            await self.cache.invalidate(
+                (pub_model.date, pub_model.tags) for pub_model in publications
+            )
+            total += len(publications)
+        
+        return total
+    
+    async def analyze_pending(self, publication_ids: Sequence[int]) -> int:
+        """
+        Armazena os labels que faltam nas publicações informadas (ingestão com
+        análise em background), em uma transação com os agregados: análise
+        completa das publicações sem labels e classificação apenas dos
+        comentários/respostas novos das já analisadas (ex: merge).
+
+        Idempotente: linhas que já possuem labels não são reclassificadas, então
+        repetir a execução (retry, tarefa duplicada) não altera os agregados.
+        Retorna o número de publicações alteradas.
+        """
+        publications = await self.analysis_repository.get_publications(publication_ids)
+        unanalyzed = [pub_model for pub_model in publications if pub_model.analyses is None]
+        pending = []
+        for pub_model in publications:
+            if pub_model.analyses is None:
+                continue
+            rows = []
+            for comment_model in pub_model.comments:
+                if comment_model.analyses is None:
+                    rows.append(comment_model)
+                rows.extend(
+                    reply_model for reply_model in comment_model.replies
+                    if reply_model.analyses is None
+                )
+            if rows:
+                pending.append((pub_model, rows))
+        
+        if not unanalyzed and not pending:
+            return 0
+        
+        deltas: Counter = Counter()
+        analyzed_publications = await self.nlp_service.analyze_publications_async(
+            [self._model_to_entity(pub_model) for pub_model in unanalyzed]
+        )
+        for pub_model, analyzed in zip(unanalyzed, analyzed_publications):
+            attach_analysis(pub_model, analyzed)
+            deltas.update(publication_rollup_deltas(pub_model.date, pub_model.tags, analyzed))
+        
+        # Uma única chamada ao classificador para todas as linhas pendentes
+        labels = await self.nlp_service.classify_texts_async(
+            [row.text for _, rows in pending for row in rows]
+        )
+        analyzed_at = datetime.utcnow()
+        position = 0
+        for pub_model, rows in pending:
+            row_labels = labels[position:position + len(rows)]
+            position += len(rows)
+            attach_labels(rows, row_labels, analyzed_at)
+            deltas.update(comment_rollup_deltas(pub_model.date, pub_model.tags, row_labels))
+        
+        await self.rollup_repository.apply(deltas)
+        await self.session.commit()
+        
+        changed = unanalyzed + [pub_model for pub_model, _ in pending]
+        await self.cache.invalidate((pub_model.date, pub_model.tags) for pub_model in changed)
+        return len(changed)
+    
     def _model_to_entity(self, pub_model) -> Publication:
         """Converte model SQLAlchemy para entidade de domínio."""
         comments = []
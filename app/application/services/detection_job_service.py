@@ -0,0 +1,152 @@
+"""
+Service para as detecções de objetos assíncronas
+"""
+import asyncio
+import shutil
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.domain.value_objects.detection_status import DetectionStatus
+from app.infrastructure.database.models import DetectionJobModel
+from app.infrastructure.database.repositories.detection_job_repository import DetectionJobRepository
+from app.application.services.object_detector_service import get_detector_service
+from app.infrastructure.detection.executor import detection_executor
+from app.worker.detection_tasks import enqueue_detection
+
+
+# Progresso reportado em cada etapa (a inferência do YOLO é uma única chamada)
+PROGRESS_PROCESSING = 0.1
+PROGRESS_COMPLETED = 1.0
+
+
+def _plain_prediction(prediction: Dict[str, Any]) -> Dict[str, Any]:
+    """Predição com tipos nativos (o YOLO retorna escalares numpy), serializável em JSON."""
+    class_id = prediction.get("class_id")
+    return {
+        "model": prediction.get("model"),
+        "class_name": str(prediction.get("class_name", "Unknown")),
+        "conf": float(prediction.get("conf", 0.0)),
+        "xyxy": [float(value) for value in prediction.get("xyxy", [])],
+        "class_id": int(class_id) if class_id is not None else None,
+    }
+
+
+def _save_upload(source: BinaryIO, destination: Path) -> None:
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    with open(destination, "wb") as f:
+        shutil.copyfileobj(source, f, length=1024 * 1024)
+
+
+class DetectionJobService:
+    """
+    Serviço de detecções assíncronas: a requisição apenas grava a imagem e
+    enfileira a tarefa; o worker executa o YOLO e persiste o resultado.
+    
+    Os arquivos de cada detecção ficam em `<storage_dir>/<task_id>/` e não são
+    removidos pela aplicação (retenção a cargo da operação, ver docs/api.md).
+    """
+    
+    def __init__(self, session: AsyncSession, storage_dir: Optional[Path] = None):
+        self.session = session
+        self.repository = DetectionJobRepository(session)
+        self.storage_dir = Path(storage_dir or settings.OBJECT_DETECTOR_STORAGE_DIR)
+    
+    async def submit(
+        self,
+        file: BinaryIO,
+        filename: Optional[str],
+        confidence: float,
+    ) -> DetectionJobModel:
+        """
+        Grava a imagem no diretório da detecção (compartilhado com os workers),
+        registra a detecção como `pending` e enfileira o processamento.
+        Se o enfileiramento falhar, a detecção é marcada como `failed`; se o
+        registro falhar, a imagem gravada é removida.
+        """
+        job_id = uuid.uuid4().hex
+        original_filename = Path(filename).name if filename else None
+        image_path = self.storage_dir / job_id / (original_filename or "image")
+        
+        try:
+            # Cópia em thread: imagens grandes não bloqueiam o event loop
+            await asyncio.to_thread(_save_upload, file, image_path)
+            
+            job = await self.repository.create(
+                job_id,
+                image_path=str(image_path),
+                confidence=confidence,
+                original_filename=original_filename,
+                message="Aguardando processamento",
+            )
+        except BaseException:
+            # Sem registro, nada referencia o diretório da detecção
+            shutil.rmtree(image_path.parent, ignore_errors=True)
+            raise
+        if not await enqueue_detection(job_id):
+            job = await self.repository.update(
+                job_id,
+                status=DetectionStatus.FAILED.value,
+                progress=None,
+                message="Erro ao enfileirar a detecção",
+                finished_at=datetime.utcnow(),
+            )
+        return job
+    
+    async def get(self, job_id: str) -> Optional[DetectionJobModel]:
+        """Obtém uma detecção pelo task_id."""
+        return await self.repository.get(job_id)
+    
+    async def run(self, job_id: str) -> Optional[DetectionJobModel]:
+        """
+        Executa uma detecção pendente (chamado pelo worker) e persiste o
+        resultado ou o erro. Detecções já concluídas não são reprocessadas
+        (reentrega da tarefa).
+        """
+        job = await self.repository.get(job_id)
+        if job is None or job.status in (DetectionStatus.COMPLETED.value, DetectionStatus.FAILED.value):
+            return job
+        
+        await self.repository.update(
+            job_id,
+            status=DetectionStatus.PROCESSING.value,
+            progress=PROGRESS_PROCESSING,
+            message="Processando imagem",
+            started_at=datetime.utcnow(),
+        )
+        try:
+            detector = get_detector_service()
+            # Executor de detecção: as threads (e os modelos compartilhados) são reaproveitados
+            result = await detection_executor.run(
+                detector.predict,
+                job.image_path,
+                confidence=job.confidence,
+                save_annotated_dir=Path(job.image_path).parent,
+            )
+        except Exception as e:
+            return await self.repository.update(
+                job_id,
+                status=DetectionStatus.FAILED.value,
+                progress=None,
+                message=f"Erro ao processar imagem: {str(e)}",
+                finished_at=datetime.utcnow(),
+            )
+        
+        predictions = [_plain_prediction(pred) for pred in result.get("predictions", [])]
+        return await self.repository.update(
+            job_id,
+            status=DetectionStatus.COMPLETED.value,
+            progress=PROGRESS_COMPLETED,
+            message=f"Detecção concluída: {len(predictions)} objeto(s) encontrado(s)",
+            annotated_path=result.get("annotated_path"),
+            result={
+                "predictions": predictions,
+                "processing_time": result.get("processing_time"),
+                "timestamp": result.get("timestamp"),
+                "model_info": result.get("model_info"),
+            },
+            finished_at=datetime.utcnow(),
+        )
@@ -0,0 +1,61 @@
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.database.repositories.export_repository import (
+    ExportRepository,
+    EXPORT_COLUMNS,
+)
+from app.infrastructure.export.writers import create_writer
+
+
+class ExportService:
+    """Serviço de exportação de publicações, comentários e respostas."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repository = ExportRepository(session)
+
+    @staticmethod
+    def writer(dataset: str, format: str):
+        """
+        Writer de `format` para as colunas de `dataset`. Levanta RuntimeError se
+        o formato depender de um pacote não instalado.
+        """
+        return create_writer(format, EXPORT_COLUMNS[dataset])
+
+    async def export(
+        self,
+        dataset: str,
+        writer,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        tags: Optional[List[str]] = None,
+        engagement: Optional[Dict[str, Tuple[Optional[int], Optional[int]]]] = None,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[bytes]:
+        """
+        Gera o arquivo exportado em partes com o `writer` do formato (ver
+        `writer`): o início do arquivo (cabeçalho) sai antes da primeira leitura
+        do banco e cada lote de `chunk_size` linhas é convertido e entregue
+        assim que lido. A memória usada não depende do número de linhas.
+        """
+        header = writer.open()
+        if header:
+            yield header
+
+        async for rows in self.repository.stream(
+            dataset,
+            start_date=start_date,
+            end_date=end_date,
+            tags=tags,
+            engagement=engagement,
+            chunk_size=chunk_size,
+        ):
+            data = writer.write(rows)
+            if data:
+                yield data
+
+        footer = writer.close()
+        if footer:
+            yield footer
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Tuple
 from datetime import datetime
 
 from app.domain.entities.comment import Comment, AnalyzedComment
@@ -6,6 +6,9 @@ from app.domain.entities.publication import Publication, AnalyzedPublication
 from app.infrastructure.nlp.sentiment_analyzer import SentimentAnalyzer
 from app.infrastructure.nlp.emotion_classifier import EmotionClassifier
 from app.infrastructure.nlp.topic_classifier import TopicClassifier
+from app.infrastructure.nlp.keyword_matcher import get_keyword_matcher
+from app.infrastructure.nlp.executor import nlp_executor
+from app.infrastructure.cache.classification_cache import classification_cache
 from app.domain.value_objects.sentiment import Sentiment
 from app.domain.value_objects.emotion import Emotion
 from app.domain.value_objects.topic import Topic
@@ -19,11 +22,40 @@ class NLPService:
         self.emotion_classifier = EmotionClassifier()
         self.topic_classifier = TopicClassifier()
     
+    def classify_text(self, text: str) -> Tuple[Sentiment, Emotion, Topic]:
+        """Classifica sentimento, emoção e tópico em uma única varredura do texto (memoizado)."""
+        # O matcher é lido a cada classificação para acompanhar `reload_keyword_matcher`
+        matcher = get_keyword_matcher()
+        labels = classification_cache.get(text, matcher.fingerprint)
+        if labels is None:
+            labels = matcher.match(text)
+            classification_cache.put(text, labels, matcher.fingerprint)
+        return labels
+    
+    async def classify_texts_async(self, texts: List[str]) -> List[Tuple[Sentiment, Emotion, Topic]]:
+        """
+        Classifica vários textos: consulta o cache de classificação e envia ao
+        executor apenas os textos distintos ainda não classificados.
+        """
+        matcher = get_keyword_matcher()
+        keys = [classification_cache.build_key(text) for text in texts]
+        found = await classification_cache.get_many(keys, matcher.fingerprint)
+        
+        pending = {}
+        for key, text in zip(keys, texts):
+            if key not in found:
+                pending.setdefault(key, text)
+        if pending:
+            labels = await nlp_executor.classify(list(pending.values()), matcher)
+            computed = dict(zip(pending, labels))
+            await classification_cache.put_many(computed, matcher.fingerprint)
+            found.update(computed)
+        
+        return [found[key] for key in keys]
+    
     def analyze_comment(self, comment: Comment) -> AnalyzedComment:
         """Analisa um comentário."""
-        sentiment = self.sentiment_analyzer.analyze(comment.text)
-        emotion = self.emotion_classifier.classify(comment.text)
-        topic = self.topic_classifier.classify(comment.text)
+        sentiment, emotion, topic = self.classify_text(comment.text)
         
         return AnalyzedComment(
             comment=comment,
@@ -35,27 +67,76 @@ class NLPService:
     
     def analyze_publication(self, publication: Publication) -> AnalyzedPublication:
         """Analisa uma publicação completa."""
+        labels = [self.classify_text(text) for text in publication.get_all_text_content()]
+        return self._build_analyzed_publication(publication, labels)
+    
+    async def analyze_publication_async(self, publication: Publication) -> AnalyzedPublication:
+        """Analisa uma publicação completa fora do event loop (executor limitado)."""
+        labels = await self.classify_texts_async(publication.get_all_text_content())
+        return self._build_analyzed_publication(publication, labels)
+    
+    async def analyze_publications_async(
+        self,
+        publications: List[Publication],
+    ) -> List[AnalyzedPublication]:
+        """Analisa várias publicações com um único lote no executor."""
+        texts = []
+        for publication in publications:
+            texts.extend(publication.get_all_text_content())
+        labels = await self.classify_texts_async(texts)
+        
+        analyzed = []
+        offset = 0
+        for publication in publications:
+            size = 1 + sum(1 + len(comment.replies) for comment in publication.comments)
+            analyzed.append(
+                self._build_analyzed_publication(publication, labels[offset:offset + size])
+            )
+            offset += size
+        return analyzed
+    
+    def _build_analyzed_publication(
+        self,
+        publication: Publication,
+        labels: List[Tuple[Sentiment, Emotion, Topic]],
+    ) -> AnalyzedPublication:
+        """
+        Monta a publicação analisada a partir dos labels de
+        `publication.get_all_text_content()` (descrição, cada comentário e suas respostas).
+        """
+        analyzed_at = datetime.utcnow()
         analyzed_comments = []
+        labels_iter = iter(labels)
         
-        # Analisa descrição
-        desc_sentiment = self.sentiment_analyzer.analyze(publication.description)
-        desc_emotion = self.emotion_classifier.classify(publication.description)
-        desc_topic = self.topic_classifier.classify(publication.description)
+        # Descrição
+        desc_sentiment, desc_emotion, desc_topic = next(labels_iter)
         
-        # Analisa comentários
+        # Comentários
         for comment in publication.comments:
-            analyzed_comment = self.analyze_comment(comment)
-            analyzed_comments.append(analyzed_comment)
+            sentiment, emotion, topic = next(labels_iter)
+            analyzed_comments.append(AnalyzedComment(
+                comment=comment,
+                sentiment=sentiment,
+                emotion=emotion,
+                topic=topic,
+                analyzed_at=analyzed_at
+            ))
             
-            # Analisa respostas
+            # Respostas
             for reply in comment.replies:
                 reply_comment = Comment(
                     username=reply.username,
                     text=reply.text,
                     likes=reply.likes
                 )
-                analyzed_reply = self.analyze_comment(reply_comment)
-                analyzed_comments.append(analyzed_reply)
+                sentiment, emotion, topic = next(labels_iter)
+                analyzed_comments.append(AnalyzedComment(
+                    comment=reply_comment,
+                    sentiment=sentiment,
+                    emotion=emotion,
+                    topic=topic,
+                    analyzed_at=analyzed_at
+                ))
         
         # Determina sentimento/emoção/tópico principal
         sentiments = [desc_sentiment] + [ac.sentiment for ac in analyzed_comments]
@@ -86,6 +167,6 @@ class NLPService:
             main_emotion=main_emotion,
             main_topic=main_topic,
             analyzed_comments=analyzed_comments,
-            analyzed_at=datetime.utcnow()
+            analyzed_at=analyzed_at
         )
 
@@ -4,11 +4,19 @@ Service para integração com o módulo ObjectDetector
 import sys
 import os
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 import tempfile
 import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime
 
+from app.core.config import settings
+from app.infrastructure.detection.executor import waiting
+
 # Adiciona o caminho do ObjectDetector ao sys.path
 # Tenta múltiplos caminhos possíveis
 possible_paths = [
@@ -41,17 +49,177 @@ except ImportError:
     except ImportError:
         YoloDetector = None
 
+try:
+    import cv2  # instalado com o ultralytics; usado para redesenhar a imagem anotada
+except ImportError:
+    cv2 = None
+
+
+class _LoadedModel:
+    """Detector carregado, com o lock da sua inferência e os usos em andamento"""
+    
+    def __init__(self, detector: Any, size: int):
+        self.detector = detector
+        self.size = size
+        self.lock = threading.Lock()
+        self.in_use = 0
+
+
+class ModelRegistry:
+    """
+    Modelos YOLO carregados, compartilhados pelo processo
+    
+    Cada diretório de modelos é carregado uma única vez, com a menor confiança
+    aceita (`min_confidence`); a confiança de cada requisição é aplicada
+    depois, como filtro sobre as predições. Com `max_memory_mb`, os diretórios
+    menos usados recentemente são descarregados quando o tamanho dos pesos
+    carregados passa do limite; diretórios em uso nunca são descarregados.
+    
+    A inferência do YOLO não é thread-safe: as threads do executor de detecção
+    compartilham o detector de cada diretório e se revezam no seu lock. O
+    carregamento acontece fora do lock do registry, então buscas por modelos já
+    carregados não esperam um carregamento a frio.
+    """
+    
+    def __init__(
+        self,
+        min_confidence: float = settings.OBJECT_DETECTOR_MIN_CONFIDENCE,
+        max_memory_mb: int = settings.OBJECT_DETECTOR_MODEL_MEMORY_MB,
+    ):
+        self.min_confidence = min_confidence
+        self.max_memory_bytes = max(0, max_memory_mb) * 1024 * 1024
+        self._models: "OrderedDict[Path, _LoadedModel]" = OrderedDict()
+        self._load_locks: Dict[Path, threading.Lock] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _weights_size(models_dir: Path) -> int:
+        """Memória estimada de um diretório: tamanho dos pesos (.pt) em disco."""
+        return sum(path.stat().st_size for path in models_dir.glob("*.pt"))
+    
+    @contextmanager
+    def use(self, models_dir: Path) -> Iterator[Any]:
+        """
+        Detector do diretório (carregado na primeira chamada), reservado para a
+        thread atual durante o bloco `with`
+        """
+        entry = self._acquire(Path(models_dir).resolve())
+        try:
+            # A espera pelo modelo conta como fila nas métricas do executor
+            with waiting():
+                entry.lock.acquire()
+            try:
+                yield entry.detector
+            finally:
+                entry.lock.release()
+        finally:
+            with self._lock:
+                entry.in_use -= 1
+                self._evict()
+    
+    def _acquire(self, path: Path) -> _LoadedModel:
+        """Entrada do diretório marcada como em uso (carrega se necessário)."""
+        while True:
+            with self._lock:
+                entry = self._models.get(path)
+                if entry is not None:
+                    self._models.move_to_end(path)
+                    entry.in_use += 1
+                    return entry
+                load_lock = self._load_locks.setdefault(path, threading.Lock())
+            
+            # Um carregamento por diretório; quem chega depois espera e reaproveita
+            with load_lock:
+                with self._lock:
+                    if path in self._models:
+                        continue
+                detector = YoloDetector(models_dir=path, conf_threshold=self.min_confidence)
+                entry = _LoadedModel(detector, self._weights_size(path))
+                with self._lock:
+                    self._models[path] = entry
+                    entry.in_use += 1
+                    self._evict()
+                    return entry
+    
+    def _evict(self) -> None:
+        """Descarrega os diretórios ociosos menos usados até caber no limite."""
+        if not self.max_memory_bytes:
+            return
+        usage = self._memory_usage()
+        for path, entry in list(self._models.items()):
+            if usage <= self.max_memory_bytes:
+                break
+            if not entry.in_use:
+                del self._models[path]
+                usage -= entry.size
+    
+    def _memory_usage(self) -> int:
+        return sum(entry.size for entry in self._models.values())
+    
+    def memory_usage(self) -> int:
+        """Tamanho (bytes) dos pesos carregados."""
+        with self._lock:
+            return self._memory_usage()
+    
+    def clear(self) -> None:
+        """Descarrega todos os modelos ociosos."""
+        with self._lock:
+            for path, entry in list(self._models.items()):
+                if not entry.in_use:
+                    del self._models[path]
+
+
+# Instância global
+model_registry = ModelRegistry()
+
+
+def filter_predictions(predictions: List[Dict[str, Any]], confidence: float) -> List[Dict[str, Any]]:
+    """Predições com confiança mínima `confidence`."""
+    return [pred for pred in predictions if pred.get("conf", 0.0) >= confidence]
+
+
+def draw_predictions(image_path: str, predictions: List[Dict[str, Any]], output_path: str) -> bool:
+    """
+    Desenha as predições sobre a imagem original em `output_path`. Retorna
+    False se o OpenCV não estiver disponível ou a imagem não puder ser lida.
+    """
+    if cv2 is None:
+        return False
+    image = cv2.imread(image_path)
+    if image is None:
+        return False
+    
+    for pred in predictions:
+        x1, y1, x2, y2 = (int(value) for value in pred.get("xyxy", [0, 0, 0, 0]))
+        cv2.rectangle(image, (x1, y1), (x2, y2), (0, 255, 0), 2)
+        cv2.putText(
+            image,
+            f"{pred.get('class_name', 'Unknown')} {pred.get('conf', 0.0):.2f}",
+            (x1, max(y1 - 5, 10)),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            0.5,
+            (0, 255, 0),
+            1,
+        )
+    return bool(cv2.imwrite(output_path, image))
+
 
 class ObjectDetectorService:
     """Service para processamento de detecção de objetos"""
     
-    def __init__(self, models_dir: Optional[Path] = None, conf_threshold: float = 0.25):
+    def __init__(
+        self,
+        models_dir: Optional[Path] = None,
+        conf_threshold: float = 0.25,
+        registry: Optional[ModelRegistry] = None,
+    ):
         """
         Inicializa o service de detecção
         
         Args:
             models_dir: Diretório contendo os modelos YOLO (.pt files)
-            conf_threshold: Threshold de confiança mínimo (0.0 a 1.0)
+            conf_threshold: Threshold de confiança padrão (0.0 a 1.0)
+            registry: Modelos carregados (padrão: registry global do processo)
         """
         if YoloDetector is None:
             raise ImportError(
@@ -68,56 +236,109 @@ class ObjectDetectorService:
             raise FileNotFoundError(f"Diretório de modelos não encontrado: {models_dir}")
         
         self.conf_threshold = conf_threshold
-        self.detector: Optional[YoloDetector] = None
+        self.registry = registry or model_registry
         self._temp_dir = None
+        self._temp_dir_lock = threading.Lock()
     
-    def _get_detector(self) -> YoloDetector:
-        """Lazy loading do detector"""
-        if self.detector is None:
-            self.detector = YoloDetector(
-                models_dir=self.models_dir,
-                conf_threshold=self.conf_threshold
-            )
-        return self.detector
+    def _get_temp_dir(self) -> Path:
+        """Diretório temporário de uploads e imagens anotadas (um por service)"""
+        with self._temp_dir_lock:
+            if self._temp_dir is None or not self._temp_dir.exists():
+                self._temp_dir = Path(tempfile.mkdtemp(prefix="object_detector_"))
+            return self._temp_dir
     
-    def predict(self, image_path: str, confidence: Optional[float] = None) -> Dict[str, Any]:
+    def predict(
+        self,
+        image_path: str,
+        confidence: Optional[float] = None,
+        save_annotated_dir: Optional[Path] = None,
+    ) -> Dict[str, Any]:
         """
         Processa uma imagem e retorna as detecções
         
         Args:
             image_path: Caminho para a imagem a ser processada
-            confidence: Threshold de confiança (sobrescreve o padrão se fornecido)
+            confidence: Threshold de confiança (sobrescreve o padrão se fornecido;
+                aplicado como filtro, sem recarregar os modelos)
+            save_annotated_dir: Diretório da imagem anotada (padrão: diretório temporário)
             
         Returns:
             Dicionário com os resultados da detecção
         """
-        if confidence is not None:
-            # Atualiza o threshold se fornecido
-            if self.detector is None or self.conf_threshold != confidence:
-                self.conf_threshold = confidence
-                self.detector = None  # Força recriação com novo threshold
-        
-        detector = self._get_detector()
+        if confidence is None:
+            confidence = self.conf_threshold
         
         # Cria diretório temporário para imagens anotadas
-        if self._temp_dir is None or not self._temp_dir.exists():
-            self._temp_dir = Path(tempfile.mkdtemp(prefix="object_detector_"))
+        if save_annotated_dir is None:
+            save_annotated_dir = self._get_temp_dir()
         
-        # Processa a imagem (YoloDetector aceita Path para save_annotated_dir)
-        result = detector.infer(
-            image_path=image_path,
-            save_annotated_dir=str(self._temp_dir)
-        )
+        # Processa a imagem (YoloDetector aceita Path para save_annotated_dir);
+        # o detector é carregado uma vez por processo e compartilhado, ver ModelRegistry
+        started = time.perf_counter()
+        with self.registry.use(self.models_dir) as detector:
+            result = detector.infer(
+                image_path=image_path,
+                save_annotated_dir=str(save_annotated_dir)
+            )
+        
+        # Inferência feita com a menor confiança: aplica a da requisição
+        predictions = result.get("predictions", [])
+        filtered = filter_predictions(predictions, confidence)
+        if len(filtered) != len(predictions):
+            result["predictions"] = filtered
+            # A imagem anotada pelo detector inclui as predições descartadas
+            if result.get("annotated_path"):
+                draw_predictions(image_path, filtered, result["annotated_path"])
         
         # Adiciona informações adicionais
+        result["processing_time"] = round(time.perf_counter() - started, 3)
         result["timestamp"] = datetime.now().isoformat()
         result["model_info"] = {
             "models_dir": str(self.models_dir),
-            "confidence_threshold": self.conf_threshold
+            "confidence_threshold": confidence
         }
         
         return result
     
+    def predict_many(self, items: List[Tuple[str, Optional[float]]]) -> List[Any]:
+        """
+        Processa um lote de imagens em sequência com o mesmo detector (uma única
+        tarefa do executor de detecção)
+        
+        Args:
+            items: Lista de (caminho da imagem, threshold de confiança); como a
+                confiança é aplicada como filtro, itens com thresholds
+                diferentes podem compartilhar o lote
+            
+        Returns:
+            Na mesma ordem, o resultado de cada imagem ou a exceção levantada por ela
+        """
+        results: List[Any] = []
+        for image_path, confidence in items:
+            try:
+                results.append(self.predict(image_path, confidence=confidence))
+            except Exception as e:
+                results.append(e)
+        return results
+    
+    def save_upload(self, uploaded_file) -> Path:
+        """
+        Grava um arquivo enviado via upload no diretório temporário
+        
+        Args:
+            uploaded_file: Arquivo FastAPI UploadFile
+            
+        Returns:
+            Caminho do arquivo gravado (nome único: requisições simultâneas podem
+            enviar arquivos com o mesmo nome)
+        """
+        filename = Path(uploaded_file.filename or "image").name
+        temp_image_path = self._get_temp_dir() / f"{uuid.uuid4().hex}_{filename}"
+        
+        with open(temp_image_path, "wb") as f:
+            shutil.copyfileobj(uploaded_file.file, f)
+        return temp_image_path
+    
     def predict_from_upload(self, uploaded_file, confidence: Optional[float] = None) -> Dict[str, Any]:
         """
         Processa um arquivo enviado via upload
@@ -130,13 +351,7 @@ class ObjectDetectorService:
             Dicionário com os resultados da detecção
         """
         # Salva o arquivo temporariamente
-        if self._temp_dir is None or not self._temp_dir.exists():
-            self._temp_dir = Path(tempfile.mkdtemp(prefix="object_detector_"))
-        
-        temp_image_path = self._temp_dir / uploaded_file.filename
-        
-        with open(temp_image_path, "wb") as f:
-            shutil.copyfileobj(uploaded_file.file, f)
+        temp_image_path = self.save_upload(uploaded_file)
         
         try:
             # Processa a imagem
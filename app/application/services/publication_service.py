@@ -1,31 +1,240 @@
-from typing import List, Optional
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.entities.publication import Publication
-from app.infrastructure.database.repositories.publication_repository import PublicationRepository
+from app.infrastructure.database.repositories.publication_repository import (
+    PublicationRepository,
+    LOAD_NONE,
+    LOAD_FULL,
+    SORT_DATE,
+    COMMENT_SORT_ID,
+    merge_comments,
+    sort_column,
+)
+from app.infrastructure.database.repositories.analysis_repository import attach_labels
+from app.infrastructure.database.repositories.text_search import (
+    MODE_AUTO,
+    MODE_FULLTEXT,
+    MODE_SUBSTRING,
+)
+from app.infrastructure.database.repositories.pagination import encode_cursor, decode_cursor
+from app.infrastructure.database.repositories.rollup_repository import (
+    RollupRepository,
+    publication_rollup_deltas,
+    comment_rollup_deltas,
+)
 from app.infrastructure.database.models import PublicationModel
 from app.domain.entities.comment import Comment, Reply
+from app.application.services.nlp_service import NLPService
+from app.infrastructure.cache.dashboard_cache import dashboard_cache
+from app.core.config import settings
+from app.worker.tasks import enqueue_analysis
 
 
 class PublicationService:
-    """Serviço de gerenciamento de publicações."""
+    """
+    Serviço de gerenciamento de publicações.
+
+    Com `background` (padrão: ANALYSIS_IN_BACKGROUND), a ingestão apenas grava
+    as linhas e enfileira a análise de NLP no worker Celery; caso contrário os
+    labels são gravados na própria transação de escrita.
+    """
     
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, background: Optional[bool] = None):
+        self.session = session
+        self.background = settings.ANALYSIS_IN_BACKGROUND if background is None else background
         self.repository = PublicationRepository(session)
+        self.rollup_repository = RollupRepository(session)
+        self.nlp_service = NLPService()
     
-    async def create_publication(self, publication: Publication) -> PublicationModel:
-        """Cria uma nova publicação."""
+    async def create_publication(self, publication: Publication, merge: bool = False) -> PublicationModel:
+        """
+        Cria uma nova publicação e armazena os labels de NLP (ou enfileira a
+        análise, em background). Se a publicação já existir, é retornada sem
+        alterações ou, com `merge=True`, recebe os comentários novos e os
+        contadores atualizados (ver `merge_publications`).
+        """
         # Verifica se já existe
-        existing = await self.repository.get_by_publicacao_n(publication.publicacao_n)
+        existing = await self.repository.get_by_publicacao_n(
+            publication.publicacao_n, load=LOAD_FULL if merge else LOAD_NONE
+        )
         if existing:
+            if merge and await self.merge_publications([(existing, publication)]):
+                await self.session.commit()
+                await dashboard_cache.invalidate([(existing.date, existing.tags)])
+                if self.background:
+                    await enqueue_analysis([existing.id])
             return existing
         
-        return await self.repository.create(publication)
+        if self.background:
+            db_publication = await self.repository.create(publication)
+            await dashboard_cache.invalidate([(publication.date, publication.tags)])
+            await enqueue_analysis([db_publication.id])
+            return db_publication
+        
+        # Classifica uma única vez na escrita; leitores usam os labels armazenados
+        analyzed = await self.nlp_service.analyze_publication_async(publication)
+        
+        # Agregados diários entram na mesma transação (commit feito pelo repository)
+        await self.rollup_repository.apply(
+            publication_rollup_deltas(publication.date, publication.tags, analyzed)
+        )
+        db_publication = await self.repository.create(publication, analyzed=analyzed)
+        
+        # Invalida apenas as respostas do dashboard que incluem esta publicação
+        await dashboard_cache.invalidate([(publication.date, publication.tags)])
+        return db_publication
+    
+    async def create_publications(
+        self,
+        publications: List[Publication],
+        merge: bool = False,
+    ) -> Dict[str, int]:
+        """
+        Insere um lote de publicações em uma transação: análise em lote, INSERTs
+        multi-row e agregados. Em background, as linhas são inseridas sem labels
+        e a análise é enfileirada após o commit. Publicações já existentes (ou
+        repetidas no lote) são ignoradas ou, com `merge=True`, mescladas, como
+        em `create_publication`.
+        Retorna {"received", "inserted", "merged", "duplicates"}.
+        """
+        # Remove repetições no lote e publicações já existentes antes da análise
+        unique: Dict[int, Publication] = {}
+        for publication in publications:
+            unique.setdefault(publication.publicacao_n, publication)
+        existing = await self.repository.existing_publicacao_ns(list(unique))
+        new_publications = [
+            publication for publicacao_n, publication in unique.items()
+            if publicacao_n not in existing
+        ]
+        
+        merged: List[PublicationModel] = []
+        if merge and existing:
+            db_publications = await self.repository.get_many_by_publicacao_n(list(existing))
+            merged = await self.merge_publications(
+                [(db_publication, unique[db_publication.publicacao_n]) for db_publication in db_publications]
+            )
+            # IDs de create_many são alocados após as linhas mescladas
+            await self.session.flush()
+        
+        if self.background:
+            inserted = await self.repository.create_many(new_publications)
+        else:
+            analyzed = await self.nlp_service.analyze_publications_async(new_publications)
+            inserted = await self.repository.create_many(new_publications, analyzed)
+            
+            deltas: Counter = Counter()
+            for index in inserted:
+                publication = new_publications[index]
+                deltas.update(publication_rollup_deltas(publication.date, publication.tags, analyzed[index]))
+            await self.rollup_repository.apply(deltas)
+        await self.session.commit()
+        
+        await dashboard_cache.invalidate(
+            [(new_publications[index].date, new_publications[index].tags) for index in inserted]
+            + [(db_publication.date, db_publication.tags) for db_publication in merged]
+        )
+        if self.background:
+            await enqueue_analysis(
+                list(inserted.values()) + [db_publication.id for db_publication in merged]
+            )
+        return {
+            "received": len(publications),
+            "inserted": len(inserted),
+            "merged": len(merged),
+            "duplicates": len(publications) - len(inserted) - len(merged),
+        }
     
-    async def get_publication(self, publication_id: int) -> Optional[PublicationModel]:
+    async def merge_publications(
+        self,
+        pairs: List[Tuple[PublicationModel, Publication]],
+    ) -> List[PublicationModel]:
+        """
+        Mescla novas coletas em publicações existentes (carregadas com comentários
+        e respostas), sem commit: insere apenas comentários/respostas novos,
+        atualiza curtidas e contadores, e classifica somente as linhas novas
+        (em background, ficam sem labels até a análise enfileirada).
+
+        Linhas novas de publicações ainda não analisadas ficam para o backfill;
+        os labels da publicação (principais) não são recalculados.
+        Retorna as publicações alteradas.
+        """
+        analyzed_ids = set()
+        if not self.background:
+            analyzed_ids = await self.repository.analyzed_ids(
+                [db_publication.id for db_publication, _ in pairs]
+            )
+        
+        changed: List[PublicationModel] = []
+        to_classify = []
+        for db_publication, publication in pairs:
+            new_rows, updated = merge_comments(db_publication, publication)
+            if new_rows or updated:
+                changed.append(db_publication)
+            if new_rows and db_publication.id in analyzed_ids:
+                to_classify.append((db_publication, new_rows))
+        
+        # Uma única chamada ao classificador para todas as linhas novas do lote
+        labels = await self.nlp_service.classify_texts_async(
+            [row.text for _, rows in to_classify for row in rows]
+        )
+        analyzed_at = datetime.utcnow()
+        deltas: Counter = Counter()
+        position = 0
+        for db_publication, rows in to_classify:
+            row_labels = labels[position:position + len(rows)]
+            position += len(rows)
+            attach_labels(rows, row_labels, analyzed_at)
+            deltas.update(comment_rollup_deltas(db_publication.date, db_publication.tags, row_labels))
+        await self.rollup_repository.apply(deltas)
+        return changed
+    
+    async def get_publication(
+        self,
+        publication_id: int,
+        load: str = LOAD_FULL,
+    ) -> Optional[PublicationModel]:
         """Obtém uma publicação por ID."""
-        return await self.repository.get_by_id(publication_id)
+        return await self.repository.get_by_id(publication_id, load=load)
+    
+    async def list_comments(
+        self,
+        publication_id: int,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        sort: str = COMMENT_SORT_ID,
+        labels: Optional[Dict[str, str]] = None,
+        include_labels: bool = False,
+        include_replies: bool = False,
+    ) -> Optional[Tuple[List[Dict[str, Any]], Optional[str]]]:
+        """
+        Lista os comentários de uma publicação. Retorna a página e o cursor da
+        próxima (None na última página), ou None se a publicação não existir.
+        Levanta ValueError se o cursor for inválido ou de outra ordenação.
+        """
+        decoded = decode_cursor(cursor, int, sort) if cursor else None
+        if not await self.repository.exists(publication_id):
+            return None
+        
+        # Busca um item a mais para saber se existe próxima página
+        items = await self.repository.list_comments(
+            publication_id,
+            limit=limit + 1,
+            cursor=decoded,
+            sort=sort,
+            labels=labels,
+            include_labels=include_labels,
+            include_replies=include_replies,
+        )
+        
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            last = items[-1]
+            next_cursor = encode_cursor(last[sort], last["id"], sort)
+        return items, next_cursor
     
     async def list_publications(
         self,
@@ -34,30 +243,144 @@ class PublicationService:
         tags: Optional[List[str]] = None,
         limit: int = 100,
         offset: int = 0,
-    ) -> List[PublicationModel]:
-        """Lista publicações com filtros."""
-        return await self.repository.list(
+        cursor: Optional[str] = None,
+        load: str = LOAD_FULL,
+        fields: Optional[Sequence[str]] = None,
+        sort: str = SORT_DATE,
+        engagement: Optional[Dict[str, Tuple[Optional[int], Optional[int]]]] = None,
+    ) -> Tuple[List[PublicationModel], Optional[str]]:
+        """
+        Lista publicações com filtros, na ordenação `sort`. Retorna a página e o
+        cursor da próxima (None na última página). Levanta ValueError se o
+        cursor for inválido ou de outra ordenação.
+        """
+        key = sort_column(sort).key
+        key_type = datetime if sort == SORT_DATE else int
+        
+        # Busca um item a mais para saber se existe próxima página
+        items = await self.repository.list(
             start_date=start_date,
             end_date=end_date,
             tags=tags,
-            limit=limit,
+            limit=limit + 1,
             offset=offset,
+            cursor=decode_cursor(cursor, key_type, sort) if cursor else None,
+            load=load,
+            fields=fields,
+            sort=sort,
+            engagement=engagement,
         )
+        
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor(getattr(items[-1], key), items[-1].id, sort)
+        return items, next_cursor
     
-    async def search_publications(self, query: str, limit: int = 100) -> List[PublicationModel]:
-        """Busca publicações por texto."""
-        return await self.repository.search(query, limit=limit)
+    async def search_publications(
+        self,
+        query: str,
+        limit: int = 100,
+        mode: str = MODE_AUTO,
+        load: str = LOAD_FULL,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Tuple[PublicationModel, float, Optional[str]]], str]:
+        """
+        Busca publicações por texto. No modo `auto` usa a busca full-text e, sem
+        resultados, recorre à busca por substring. Retorna (resultados, modo usado).
+        """
+        if mode != MODE_SUBSTRING:
+            results = await self.repository.search(
+                query, limit=limit, mode=MODE_FULLTEXT, load=load, fields=fields
+            )
+            if results or mode == MODE_FULLTEXT:
+                return results, MODE_FULLTEXT
+        
+        results = await self.repository.search(
+            query, limit=limit, mode=MODE_SUBSTRING, load=load, fields=fields
+        )
+        return results, MODE_SUBSTRING
+    
+    async def search_comments(
+        self,
+        query: str,
+        limit: int = 100,
+        mode: str = MODE_AUTO,
+    ) -> Tuple[List[Dict[str, Any]], str]:
+        """Busca comentários e respostas por texto (mesma lógica de modos de `search_publications`)."""
+        if mode != MODE_SUBSTRING:
+            results = await self.repository.search_comments(query, limit=limit, mode=MODE_FULLTEXT)
+            if results or mode == MODE_FULLTEXT:
+                return results, MODE_FULLTEXT
+        
+        results = await self.repository.search_comments(query, limit=limit, mode=MODE_SUBSTRING)
+        return results, MODE_SUBSTRING
     
     async def count_publications(
         self,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         tags: Optional[List[str]] = None,
+        engagement: Optional[Dict[str, Tuple[Optional[int], Optional[int]]]] = None,
     ) -> int:
         """Conta publicações com filtros."""
         return await self.repository.count(
             start_date=start_date,
             end_date=end_date,
             tags=tags,
+            engagement=engagement,
         )
-
+    
+    async def estimate_publications(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        tags: Optional[List[str]] = None,
+        engagement: Optional[Dict[str, Tuple[Optional[int], Optional[int]]]] = None,
+    ) -> Tuple[int, bool]:
+        """Conta publicações com filtros (estimado em volumes grandes)."""
+        return await self.repository.estimate_count(
+            start_date=start_date,
+            end_date=end_date,
+            tags=tags,
+            engagement=engagement,
+        )
+    
+    async def tag_facets(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        tags: Optional[List[str]] = None,
+        engagement: Optional[Dict[str, Tuple[Optional[int], Optional[int]]]] = None,
+        limit: int = 100,
+    ) -> List[Tuple[str, int]]:
+        """Contagem de publicações por tag para os filtros informados."""
+        return await self.repository.tag_facets(
+            start_date=start_date,
+            end_date=end_date,
+            tags=tags,
+            engagement=engagement,
+            limit=limit,
+        )
+    
+    async def backfill_engagement(self, batch_size: int = 1000) -> int:
+        """
+        Preenche as contagens de engajamento (`<métrica>_count`) de todas as
+        publicações a partir dos valores exibidos, um lote por transação
+        (ex: dados carregados pela migration populate_json_data ou anteriores à
+        migration add_engagement_counts). Retorna o número de publicações
+        processadas.
+        """
+        total, last_id = 0, 0
+        while True:
+            ids = await self.repository.backfill_engagement_counts(
+                after_id=last_id, limit=batch_size
+            )
+            if not ids:
+                break
+            
+            await self.session.commit()
+            total += len(ids)
+            last_id = ids[-1]
+        
+        return total
@@ -29,10 +29,52 @@ class Settings(BaseSettings):
     # NLP Models
     SPACY_MODEL: str = "pt_core_news_sm"
     SENTIMENT_MODEL: str = "neuralmind/bert-base-portuguese-cased"
+    # Executor de NLP: lotes até o threshold rodam em threads, maiores em processos
+    NLP_MAX_CONCURRENCY: int = 4
+    NLP_THREAD_WORKERS: int = 4
+    NLP_PROCESS_WORKERS: int = 2
+    NLP_PROCESS_BATCH_THRESHOLD: int = 2000
+    # Cache de classificação por hash do texto (0 desativa); Redis como 2º nível opcional
+    NLP_CACHE_SIZE: int = 100000
+    NLP_CACHE_REDIS: bool = False
+    NLP_CACHE_REDIS_EXPIRE: int = 7 * 24 * 3600
     
     # Celery
     CELERY_BROKER_URL: str = "redis://localhost:6379/1"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/2"
+    # Executa as tarefas no próprio processo, sem broker (desenvolvimento/testes)
+    CELERY_TASK_ALWAYS_EAGER: bool = False
+    
+    # Análise de NLP da ingestão: em background (worker Celery) ou na requisição
+    ANALYSIS_IN_BACKGROUND: bool = True
+    # Publicações por tarefa de análise
+    ANALYSIS_TASK_CHUNK_SIZE: int = 100
+    
+    # Object Detector: uploads e imagens anotadas das detecções assíncronas
+    # (diretório compartilhado entre a API e os workers; não são removidos pela
+    # aplicação, ver "Enviar Detecção Assíncrona" em docs/api.md)
+    OBJECT_DETECTOR_STORAGE_DIR: str = "storage/object_detector"
+    OBJECT_DETECTOR_MAX_UPLOAD_MB: int = 20
+    # Modelos são carregados uma vez com a menor confiança aceita; a confiança de
+    # cada requisição é aplicada como filtro sobre as predições
+    OBJECT_DETECTOR_MIN_CONFIDENCE: float = 0.1
+    # Memória máxima (MB, pelo tamanho dos pesos) dos modelos carregados; 0 = sem limite.
+    # Acima do limite, os conjuntos de modelos menos usados são descarregados (LRU)
+    OBJECT_DETECTOR_MODEL_MEMORY_MB: int = 0
+    # Executor de inferência das rotas síncronas: inferências simultâneas e fila
+    # máxima; acima disso a API responde 503 com Retry-After
+    # (cada diretório de modelos atende uma inferência por vez: com um único
+    # diretório, mais concorrência só paraleliza leitura e anotação das imagens)
+    OBJECT_DETECTOR_MAX_CONCURRENCY: int = 1
+    OBJECT_DETECTOR_MAX_QUEUE: int = 8
+    # Micro-batching: imagens por lote de inferência (0 = número de CPUs), janela
+    # para agrupar requisições simultâneas de /predict (0 desativa) e máximo de
+    # imagens por requisição de /predict/batch
+    OBJECT_DETECTOR_BATCH_SIZE: int = 0
+    OBJECT_DETECTOR_BATCH_WINDOW_MS: int = 10
+    OBJECT_DETECTOR_MAX_BATCH_IMAGES: int = 100
+    # /predict/batch: novas tentativas de um lote recusado depois que a resposta já começou
+    OBJECT_DETECTOR_BATCH_RETRIES: int = 3
     
     # Environment
     ENVIRONMENT: str = "development"
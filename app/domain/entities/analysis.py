@@ -19,3 +19,12 @@ class DashboardStats:
     topic_distribution: Dict[Topic, int]
     date_range: Optional[tuple[datetime, datetime]] = None
 
+
+@dataclass
+class TimeSeriesPoint:
+    """Distribuições de labels em um intervalo de tempo."""
+    bucket: datetime
+    threat_count: int
+    sentiment_distribution: Dict[Sentiment, int]
+    emotion_distribution: Dict[Emotion, int]
+    topic_distribution: Dict[Topic, int]
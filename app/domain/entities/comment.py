@@ -1,18 +1,27 @@
+import hashlib
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 from app.domain.value_objects.sentiment import Sentiment
 from app.domain.value_objects.emotion import Emotion
 from app.domain.value_objects.topic import Topic
 
 
+def content_key(username: str, text: str) -> Tuple[str, str]:
+    """Chave estável de um comentário/resposta: usuário + hash do texto."""
+    return username, hashlib.sha1((text or "").strip().encode("utf-8")).hexdigest()
+
+
 @dataclass
 class Reply:
     """Entidade de resposta a comentário."""
     username: str
     text: str
     likes: int = 0
+    
+    def content_key(self) -> Tuple[str, str]:
+        return content_key(self.username, self.text)
 
 
 @dataclass
@@ -26,6 +35,9 @@ class Comment:
     def __post_init__(self):
         if self.replies is None:
             self.replies = []
+    
+    def content_key(self) -> Tuple[str, str]:
+        return content_key(self.username, self.text)
 
 
 @dataclass
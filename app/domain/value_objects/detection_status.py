@@ -0,0 +1,9 @@
+from enum import Enum
+
+
+class DetectionStatus(str, Enum):
+    """Value Object para o status de uma detecção assíncrona."""
+    PENDING = "pending"
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    FAILED = "failed"
@@ -0,0 +1,47 @@
+import re
+from typing import Any
+
+
+# Métricas de engajamento de uma publicação com contagem inteira (coluna `<métrica>_count`)
+ENGAGEMENT_METRICS = ("views", "likes", "shares", "bookmarks")
+
+# Número com separadores e sufixo opcional: "3864", "3.864", "113.4K", "1,2 mil", "2M"
+_COUNT_PATTERN = re.compile(r"^\s*(\d[\d.,]*)\s*(k|mil|m|mi|b|bi)?\s*$", re.IGNORECASE)
+
+_MULTIPLIERS = {
+    "k": 1_000,
+    "mil": 1_000,
+    "m": 1_000_000,
+    "mi": 1_000_000,
+    "b": 1_000_000_000,
+    "bi": 1_000_000_000,
+}
+
+
+def parse_count(value: Any) -> int:
+    """
+    Converte uma contagem exibida pela plataforma para inteiro.
+
+    Com sufixo (K, mil, M, mi, B, bi), ponto ou vírgula são o separador
+    decimal ("113.4K" e "113,4K" -> 113400); sem sufixo, são separadores de
+    milhar ("3,864" e "3.864" -> 3864). Valores não numéricos ("N/A",
+    "Compartilhar", vazio) resultam em 0.
+    """
+    if isinstance(value, bool) or value is None:
+        return 0
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value)
+
+    match = _COUNT_PATTERN.match(str(value))
+    if not match:
+        return 0
+
+    number, suffix = match.groups()
+    if suffix:
+        number = number.replace(",", ".")
+        if number.count(".") > 1:
+            return 0
+        return int(round(float(number) * _MULTIPLIERS[suffix.lower()]))
+    return int(number.replace(",", "").replace(".", ""))
@@ -0,0 +1,203 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.domain.value_objects.sentiment import Sentiment
+from app.domain.value_objects.emotion import Emotion
+from app.domain.value_objects.topic import Topic
+from app.infrastructure.cache.redis_client import RedisCache, cache
+from app.infrastructure.nlp.keyword_matcher import Labels, get_keyword_matcher
+
+
+logger = logging.getLogger(__name__)
+
+
+class ClassificationCache:
+    """
+    Memoização da classificação de textos (sentimento, emoção, tópico).
+
+    As chaves são o hash do texto normalizado (minúsculas, a mesma normalização
+    aplicada pelo matcher), de modo que cópias de um comentário ("kkkkk", emojis,
+    textos repetidos) são classificadas uma única vez. O primeiro nível é um LRU
+    em memória limitado a `max_size` entradas; opcionalmente o Redis é usado como
+    segundo nível compartilhado entre processos/workers.
+
+    Entradas são vinculadas ao fingerprint do matcher que as calculou (passado
+    por quem classifica): quando o matcher muda, o LRU é limpo e as chaves do
+    Redis passam a usar outro prefixo. Leituras e gravações com o fingerprint de
+    um matcher substituído são ignoradas, de modo que resultados antigos nunca
+    são associados ao novo fingerprint. Falhas do Redis nunca propagam
+    (tratadas como miss).
+    """
+
+    PREFIX = "nlp:labels"
+
+    def __init__(
+        self,
+        max_size: int = settings.NLP_CACHE_SIZE,
+        redis_cache: Optional[RedisCache] = cache if settings.NLP_CACHE_REDIS else None,
+        redis_expire: int = settings.NLP_CACHE_REDIS_EXPIRE,
+    ):
+        self.max_size = max(0, max_size)
+        self.redis_cache = redis_cache
+        self.redis_expire = redis_expire
+        self._entries: "OrderedDict[str, Labels]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+        self._stats = {"lookups": 0, "local_hits": 0, "redis_hits": 0, "misses": 0}
+
+    @staticmethod
+    def build_key(text: str) -> str:
+        """Hash do texto normalizado."""
+        return hashlib.blake2b((text or "").lower().encode("utf-8"), digest_size=16).hexdigest()
+
+    def _redis_key(self, key: str, fingerprint: str) -> str:
+        return f"{self.PREFIX}:{fingerprint[:12]}:{key}"
+
+    def _check_version(self, fingerprint: Optional[str]) -> Optional[str]:
+        """
+        Alinha o cache ao matcher atual, limpando o LRU se as listas de keywords
+        mudaram. Retorna o fingerprint a usar, ou None se `fingerprint` é de um
+        matcher já substituído.
+        """
+        current = get_keyword_matcher().fingerprint
+        fingerprint = fingerprint or current
+        if fingerprint != current:
+            return None
+        with self._lock:
+            if fingerprint != self._version:
+                self._entries.clear()
+                self._version = fingerprint
+        return fingerprint
+
+    def _count(self, **counts: int) -> None:
+        with self._lock:
+            for name, count in counts.items():
+                self._stats[name] += count
+
+    def _get_local(self, key: str) -> Optional[Labels]:
+        with self._lock:
+            labels = self._entries.get(key)
+            if labels is not None:
+                self._entries.move_to_end(key)
+            return labels
+
+    def _put_local(self, key: str, labels: Labels) -> None:
+        if not self.max_size:
+            return
+        with self._lock:
+            self._entries[key] = labels
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get(self, text: str, fingerprint: Optional[str] = None) -> Optional[Labels]:
+        """Obtém a classificação de um texto do LRU local."""
+        labels = None
+        if self._check_version(fingerprint) is not None:
+            labels = self._get_local(self.build_key(text))
+        if labels is not None:
+            self._count(lookups=1, local_hits=1)
+        else:
+            self._count(lookups=1, misses=1)
+        return labels
+
+    def put(self, text: str, labels: Labels, fingerprint: Optional[str] = None) -> None:
+        """Armazena no LRU local a classificação de um texto feita com o matcher `fingerprint`."""
+        if self._check_version(fingerprint) is not None:
+            self._put_local(self.build_key(text), labels)
+
+    async def get_many(self, keys: List[str], fingerprint: Optional[str] = None) -> Dict[str, Labels]:
+        """
+        Obtém as classificações de várias chaves (`build_key`) no LRU e, se
+        configurado, no Redis. Retorna um dict apenas com as encontradas; chaves
+        repetidas no lote contam como hits após a primeira ocorrência.
+        """
+        fingerprint = self._check_version(fingerprint)
+        if fingerprint is None:
+            self._count(lookups=len(keys), misses=len(keys))
+            return {}
+
+        found: Dict[str, Labels] = {}
+        missing: List[str] = []
+        for key in dict.fromkeys(keys):
+            labels = self._get_local(key)
+            if labels is not None:
+                found[key] = labels
+            else:
+                missing.append(key)
+
+        redis_found = 0
+        if missing and self.redis_cache is not None:
+            try:
+                values = await self.redis_cache.mget(
+                    *(self._redis_key(key, fingerprint) for key in missing)
+                )
+                for key, value in zip(missing, values):
+                    if value:
+                        labels = (Sentiment(value[0]), Emotion(value[1]), Topic(value[2]))
+                        found[key] = labels
+                        self._put_local(key, labels)
+                        redis_found += 1
+            except (RedisError, OSError, ValueError) as e:
+                logger.warning("Erro ao ler cache de classificação: %s", e)
+
+        misses = len(missing) - redis_found
+        self._count(
+            lookups=len(keys),
+            redis_hits=redis_found,
+            misses=misses,
+            local_hits=len(keys) - redis_found - misses,
+        )
+        return found
+
+    async def put_many(self, entries: Dict[str, Labels], fingerprint: Optional[str] = None) -> None:
+        """
+        Armazena classificações (chave -> labels) feitas com o matcher
+        `fingerprint` no LRU e, se configurado, no Redis.
+        """
+        fingerprint = self._check_version(fingerprint)
+        if fingerprint is None:
+            return
+
+        for key, labels in entries.items():
+            self._put_local(key, labels)
+
+        if entries and self.redis_cache is not None:
+            try:
+                await self.redis_cache.set_many(
+                    {
+                        self._redis_key(key, fingerprint): [label.value for label in labels]
+                        for key, labels in entries.items()
+                    },
+                    expire=self.redis_expire,
+                )
+            except (RedisError, OSError) as e:
+                logger.warning("Erro ao gravar cache de classificação: %s", e)
+
+    def clear(self) -> None:
+        """Limpa o LRU local (as entradas do Redis expiram ou mudam de prefixo)."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna os contadores de hit/miss do cache."""
+        with self._lock:
+            stats = dict(self._stats)
+            size = len(self._entries)
+        lookups = stats["lookups"]
+        hits = stats["local_hits"] + stats["redis_hits"]
+        return {
+            **stats,
+            "size": size,
+            "max_size": self.max_size,
+            "hit_rate": (hits / lookups) if lookups else 0.0,
+        }
+
+
+# Instância global
+classification_cache = ClassificationCache()
@@ -0,0 +1,222 @@
+import json
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from datetime import datetime, timezone
+from redis.exceptions import RedisError, WatchError
+
+from app.infrastructure.cache.redis_client import RedisCache, cache
+
+
+logger = logging.getLogger(__name__)
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Converte datas com fuso para UTC sem fuso (formato armazenado no banco)."""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class DashboardCache:
+    """
+    Cache Redis das respostas do dashboard.
+
+    As chaves são montadas a partir do conjunto normalizado de filtros
+    (período e tags ordenadas). Um índice (`dashboard:index`) guarda os filtros
+    de cada chave para que escritas invalidem apenas as entradas cujo período e
+    tags incluem as publicações gravadas; `dashboard:index:expiry` guarda quando
+    cada entrada expira, para que o índice acompanhe apenas as chaves vivas.
+
+    Toda invalidação incrementa um contador de geração (`dashboard:generation`).
+    Quem calcula uma resposta lê a geração antes de consultar o banco e a passa
+    para `set`, que só grava se nenhuma escrita ocorreu nesse intervalo; assim
+    uma leitura iniciada antes de uma escrita não repõe o resultado antigo.
+
+    Falhas do Redis nunca propagam: a leitura é tratada como miss e a escrita
+    é ignorada.
+    """
+
+    PREFIX = "dashboard"
+    INDEX_KEY = "dashboard:index"
+    EXPIRY_KEY = "dashboard:index:expiry"
+    GENERATION_KEY = "dashboard:generation"
+    STATS_KEY = "dashboard:cache:stats"
+
+    def __init__(self, redis_cache: RedisCache = cache, expire: int = 3600):
+        self.redis_cache = redis_cache
+        self.expire = expire
+
+    @staticmethod
+    def _normalize_tags(tags: Optional[Iterable[str]]) -> List[str]:
+        return sorted({tag for tag in (tags or []) if tag})
+
+    def build_key(
+        self,
+        name: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        tags: Optional[List[str]] = None,
+        **params: Any,
+    ) -> str:
+        """Monta a chave, ex: dashboard:stats:2024-01-01T00:00:00:2024-01-31T00:00:00:tag1,tag2."""
+        parts = [
+            self.PREFIX,
+            name,
+            start_date.isoformat() if start_date else "",
+            end_date.isoformat() if end_date else "",
+            ",".join(self._normalize_tags(tags)),
+        ]
+        parts += [f"{key}={params[key]}" for key in sorted(params)]
+        return ":".join(parts)
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Obtém uma resposta do cache, contabilizando hit/miss."""
+        try:
+            value = await self.redis_cache.get(key)
+            await self.redis_cache.hincrby(self.STATS_KEY, "hits" if value is not None else "misses")
+            return value
+        except (RedisError, OSError) as e:
+            logger.warning("Erro ao ler cache do dashboard: %s", e)
+            return None
+
+    async def generation(self) -> Optional[int]:
+        """Geração atual do cache (None se o Redis estiver indisponível)."""
+        try:
+            client = await self.redis_cache.get_client()
+            return int(await client.get(self.GENERATION_KEY) or 0)
+        except (RedisError, OSError) as e:
+            logger.warning("Erro ao ler geração do cache do dashboard: %s", e)
+            return None
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        tags: Optional[List[str]] = None,
+        *,
+        generation: Optional[int],
+    ) -> bool:
+        """
+        Armazena uma resposta e registra seus filtros no índice de invalidação,
+        desde que a geração ainda seja `generation` (lida antes do cálculo).
+        Retorna se a resposta foi gravada.
+        """
+        if generation is None:
+            return False
+
+        start_date, end_date = _naive_utc(start_date), _naive_utc(end_date)
+        filters = json.dumps({
+            "start_date": start_date.isoformat() if start_date else None,
+            "end_date": end_date.isoformat() if end_date else None,
+            "tags": self._normalize_tags(tags),
+        })
+        if isinstance(value, (dict, list)):
+            value = json.dumps(value)
+
+        try:
+            client = await self.redis_cache.get_client()
+            async with client.pipeline(transaction=True) as pipe:
+                await pipe.watch(self.GENERATION_KEY)
+                if int(await pipe.get(self.GENERATION_KEY) or 0) != generation:
+                    return False
+                pipe.multi()
+                pipe.setex(key, self.expire, value)
+                pipe.hset(self.INDEX_KEY, key, filters)
+                pipe.zadd(self.EXPIRY_KEY, {key: time.time() + self.expire})
+                # O índice sempre sobrevive às entradas que referencia
+                pipe.expire(self.INDEX_KEY, self.expire)
+                pipe.expire(self.EXPIRY_KEY, self.expire)
+                await pipe.execute()
+            await self._prune(client)
+            return True
+        except WatchError:
+            # Uma escrita invalidou o cache durante o cálculo
+            return False
+        except (RedisError, OSError) as e:
+            logger.warning("Erro ao gravar cache do dashboard: %s", e)
+            return False
+
+    async def _prune(self, client) -> None:
+        """Remove do índice as entradas cujas chaves já expiraram."""
+        expired = await client.zrangebyscore(self.EXPIRY_KEY, "-inf", time.time())
+        if expired:
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.hdel(self.INDEX_KEY, *expired)
+                pipe.zrem(self.EXPIRY_KEY, *expired)
+                await pipe.execute()
+
+    async def invalidate(self, publications: Iterable[Tuple[datetime, Iterable[str]]]) -> int:
+        """
+        Remove as entradas afetadas pela escrita de publicações, dadas como pares
+        (data, tags). Uma entrada é afetada quando alguma publicação está no seu
+        período e possui todas as suas tags. Retorna o número de entradas removidas.
+        """
+        written = [(_naive_utc(date), set(tags or [])) for date, tags in publications]
+        if not written:
+            return 0
+
+        try:
+            client = await self.redis_cache.get_client()
+            await client.incr(self.GENERATION_KEY)
+            await self._prune(client)
+            index = await client.hgetall(self.INDEX_KEY)
+            stale = []
+            for key, raw_filters in index.items():
+                filters = json.loads(raw_filters)
+                start = datetime.fromisoformat(filters["start_date"]) if filters["start_date"] else None
+                end = datetime.fromisoformat(filters["end_date"]) if filters["end_date"] else None
+                required_tags = set(filters["tags"])
+                if any(
+                    (start is None or start <= date)
+                    and (end is None or date <= end)
+                    and required_tags <= tags
+                    for date, tags in written
+                ):
+                    stale.append(key)
+
+            if stale:
+                async with client.pipeline(transaction=False) as pipe:
+                    pipe.delete(*stale)
+                    pipe.hdel(self.INDEX_KEY, *stale)
+                    pipe.zrem(self.EXPIRY_KEY, *stale)
+                    await pipe.execute()
+            return len(stale)
+        except (RedisError, OSError) as e:
+            logger.warning("Erro ao invalidar cache do dashboard: %s", e)
+            return 0
+
+    async def invalidate_all(self) -> int:
+        """Remove todas as entradas do cache do dashboard."""
+        try:
+            client = await self.redis_cache.get_client()
+            await client.incr(self.GENERATION_KEY)
+            keys = list(await client.hgetall(self.INDEX_KEY))
+            await client.delete(*keys, self.INDEX_KEY, self.EXPIRY_KEY)
+            return len(keys)
+        except (RedisError, OSError) as e:
+            logger.warning("Erro ao invalidar cache do dashboard: %s", e)
+            return 0
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Retorna os contadores de hit/miss do cache."""
+        try:
+            raw = await self.redis_cache.hgetall(self.STATS_KEY)
+        except (RedisError, OSError) as e:
+            logger.warning("Erro ao ler estatísticas do cache do dashboard: %s", e)
+            raw = {}
+
+        hits = int(raw.get("hits", 0))
+        misses = int(raw.get("misses", 0))
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": (hits / total) if total else 0.0,
+        }
+
+
+# Instância global
+dashboard_cache = DashboardCache()
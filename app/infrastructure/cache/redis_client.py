@@ -1,5 +1,5 @@
 import json
-from typing import Optional, Any
+from typing import Optional, Any, Dict, List
 import redis.asyncio as redis
 from app.core.config import settings
 
@@ -23,6 +23,13 @@ class RedisCache:
         if self.redis_client:
             await self.redis_client.close()
     
+    async def get_client(self) -> redis.Redis:
+        """Retorna o cliente conectado (para pipelines e transações)."""
+        if not self.redis_client:
+            await self.connect()
+        
+        return self.redis_client
+    
     async def get(self, key: str) -> Optional[Any]:
         """Obtém valor do cache."""
         if not self.redis_client:
@@ -46,12 +53,43 @@ class RedisCache:
         
         await self.redis_client.setex(key, expire, value)
     
-    async def delete(self, key: str):
-        """Remove valor do cache."""
+    async def mget(self, *keys: str) -> List[Optional[Any]]:
+        """Obtém vários valores do cache (None para chaves ausentes)."""
+        if not keys:
+            return []
+        if not self.redis_client:
+            await self.connect()
+        
+        values = []
+        for value in await self.redis_client.mget(keys):
+            try:
+                values.append(json.loads(value) if value else None)
+            except json.JSONDecodeError:
+                values.append(value)
+        return values
+    
+    async def set_many(self, mapping: Dict[str, Any], expire: int = 3600):
+        """Define vários valores no cache em um único round-trip."""
+        if not mapping:
+            return
         if not self.redis_client:
             await self.connect()
         
-        await self.redis_client.delete(key)
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            for key, value in mapping.items():
+                if isinstance(value, (dict, list)):
+                    value = json.dumps(value)
+                pipe.setex(key, expire, value)
+            await pipe.execute()
+    
+    async def delete(self, *keys: str):
+        """Remove valores do cache."""
+        if not keys:
+            return
+        if not self.redis_client:
+            await self.connect()
+        
+        await self.redis_client.delete(*keys)
     
     async def exists(self, key: str) -> bool:
         """Verifica se chave existe."""
@@ -59,6 +97,46 @@ class RedisCache:
             await self.connect()
         
         return bool(await self.redis_client.exists(key))
+    
+    async def expire(self, key: str, seconds: int):
+        """Define o tempo de expiração de uma chave."""
+        if not self.redis_client:
+            await self.connect()
+        
+        await self.redis_client.expire(key, seconds)
+    
+    async def hset(self, name: str, key: str, value: Any):
+        """Define um campo de um hash."""
+        if not self.redis_client:
+            await self.connect()
+        
+        if isinstance(value, (dict, list)):
+            value = json.dumps(value)
+        
+        await self.redis_client.hset(name, key, value)
+    
+    async def hgetall(self, name: str) -> Dict[str, str]:
+        """Obtém todos os campos de um hash."""
+        if not self.redis_client:
+            await self.connect()
+        
+        return await self.redis_client.hgetall(name)
+    
+    async def hdel(self, name: str, *keys: str):
+        """Remove campos de um hash."""
+        if not keys:
+            return
+        if not self.redis_client:
+            await self.connect()
+        
+        await self.redis_client.hdel(name, *keys)
+    
+    async def hincrby(self, name: str, key: str, amount: int = 1) -> int:
+        """Incrementa um campo numérico de um hash."""
+        if not self.redis_client:
+            await self.connect()
+        
+        return await self.redis_client.hincrby(name, key, amount)
 
 
 # Instância global
@@ -1,4 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, ForeignKey, Float, Boolean
+from sqlalchemy import (
+    Column, Integer, BigInteger, String, DateTime, Date, Text, JSON, ForeignKey, Float, Boolean,
+    Index, UniqueConstraint,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from typing import List
@@ -9,6 +13,19 @@ from app.infrastructure.database.session import Base
 class PublicationModel(Base):
     """Model SQLAlchemy para Publicação."""
     __tablename__ = "publications"
+    __table_args__ = (
+        # Paginação por cursor: ORDER BY date DESC, id DESC
+        Index("ix_publications_date_id", "date", "id"),
+        # Ordenação por engajamento (sort=views|likes|shares): ORDER BY <métrica>_count DESC, id DESC
+        Index("ix_publications_views_count_id", "views_count", "id"),
+        Index("ix_publications_likes_count_id", "likes_count", "id"),
+        Index("ix_publications_shares_count_id", "shares_count", "id"),
+        # Filtro por tags (tags @> '["..."]')
+        Index(
+            "ix_publications_tags", "tags",
+            postgresql_using="gin", postgresql_ops={"tags": "jsonb_path_ops"},
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     publicacao_n = Column(Integer, unique=True, index=True, nullable=False)
@@ -20,29 +37,45 @@ class PublicationModel(Base):
     comments_count = Column(Integer, default=0)
     shares = Column(String, nullable=True)
     bookmarks = Column(String, nullable=True)
+    # Contagens numéricas dos valores exibidos acima (ex: "113.4K" -> 113400), ver parse_count
+    views_count = Column(BigInteger, nullable=False, default=0, server_default="0")
+    likes_count = Column(BigInteger, nullable=False, default=0, server_default="0")
+    shares_count = Column(BigInteger, nullable=False, default=0, server_default="0")
+    bookmarks_count = Column(BigInteger, nullable=False, default=0, server_default="0")
     music_title = Column(String, nullable=True)
-    tags = Column(JSON, default=list)
+    tags = Column(JSON().with_variant(JSONB(), "postgresql"), default=list)
+    # search_vector (tsvector gerado, Postgres) existe apenas no banco: ver migration add_text_search
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     comments = relationship("CommentModel", back_populates="publication", cascade="all, delete-orphan")
-    analyses = relationship("PublicationAnalysisModel", back_populates="publication", uselist=False)
+    analyses = relationship(
+        "PublicationAnalysisModel", back_populates="publication", uselist=False, cascade="all, delete-orphan"
+    )
 
 
 class CommentModel(Base):
     """Model SQLAlchemy para Comentário."""
     __tablename__ = "comments"
+    __table_args__ = (
+        # Paginação dos comentários de uma publicação (GET /publications/{id}/comments)
+        Index("ix_comments_publication_id_id", "publication_id", "id"),
+        Index("ix_comments_publication_id_likes_id", "publication_id", "likes", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    publication_id = Column(Integer, ForeignKey("publications.id"), nullable=False)
+    publication_id = Column(Integer, ForeignKey("publications.id"), nullable=False, index=True)
     username = Column(String, nullable=False)
     text = Column(Text, nullable=False)
-    likes = Column(Integer, default=0)
+    # NOT NULL: chave do keyset (likes, id) da paginação por likes
+    likes = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, default=datetime.utcnow)
     
     publication = relationship("PublicationModel", back_populates="comments")
     replies = relationship("ReplyModel", back_populates="comment", cascade="all, delete-orphan")
-    analyses = relationship("CommentAnalysisModel", back_populates="comment", uselist=False)
+    analyses = relationship(
+        "CommentAnalysisModel", back_populates="comment", uselist=False, cascade="all, delete-orphan"
+    )
 
 
 class ReplyModel(Base):
@@ -50,13 +83,16 @@ class ReplyModel(Base):
     __tablename__ = "replies"
     
     id = Column(Integer, primary_key=True, index=True)
-    comment_id = Column(Integer, ForeignKey("comments.id"), nullable=False)
+    comment_id = Column(Integer, ForeignKey("comments.id"), nullable=False, index=True)
     username = Column(String, nullable=False)
     text = Column(Text, nullable=False)
     likes = Column(Integer, default=0)
     created_at = Column(DateTime, default=datetime.utcnow)
     
     comment = relationship("CommentModel", back_populates="replies")
+    analyses = relationship(
+        "ReplyAnalysisModel", back_populates="reply", uselist=False, cascade="all, delete-orphan"
+    )
 
 
 class PublicationAnalysisModel(Base):
@@ -76,6 +112,10 @@ class PublicationAnalysisModel(Base):
 class CommentAnalysisModel(Base):
     """Model SQLAlchemy para Análise de Comentário."""
     __tablename__ = "comment_analyses"
+    __table_args__ = (
+        # Labels lidos (e filtrados) apenas pelo índice na listagem de comentários
+        Index("ix_comment_analyses_comment_id_labels", "comment_id", "sentiment", "emotion", "topic"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     comment_id = Column(Integer, ForeignKey("comments.id"), unique=True, nullable=False)
@@ -87,6 +127,71 @@ class CommentAnalysisModel(Base):
     comment = relationship("CommentModel", back_populates="analyses")
 
 
+class ReplyAnalysisModel(Base):
+    """Model SQLAlchemy para Análise de Resposta."""
+    __tablename__ = "reply_analyses"
+    __table_args__ = (
+        Index("ix_reply_analyses_reply_id_labels", "reply_id", "sentiment", "emotion", "topic"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    reply_id = Column(Integer, ForeignKey("replies.id"), unique=True, nullable=False)
+    sentiment = Column(String, nullable=False)
+    emotion = Column(String, nullable=False)
+    topic = Column(String, nullable=False)
+    analyzed_at = Column(DateTime, default=datetime.utcnow)
+    
+    reply = relationship("ReplyModel", back_populates="analyses")
+
+
+class DashboardRollupModel(Base):
+    """
+    Model SQLAlchemy para agregados diários do dashboard.
+    
+    Cada linha guarda a contagem de um label (`dimension` = sentiment, emotion, topic)
+    ou de um volume (`dimension` = volume: publications, comments, threats) por dia e tag.
+    A tag vazia ("") agrega todas as publicações do dia.
+    """
+    __tablename__ = "dashboard_rollups"
+    __table_args__ = (
+        UniqueConstraint("day", "tag", "dimension", "label", name="uq_dashboard_rollups_key"),
+        Index("ix_dashboard_rollups_tag_day", "tag", "day"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    day = Column(Date, nullable=False)
+    tag = Column(String, nullable=False, default="")
+    dimension = Column(String, nullable=False)
+    label = Column(String, nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class DetectionJobModel(Base):
+    """
+    Model SQLAlchemy para detecções de objetos assíncronas.
+    
+    O `id` é o task_id retornado ao cliente (e usado pela tarefa Celery);
+    `result` guarda as predições quando o status é `completed`.
+    """
+    __tablename__ = "detection_jobs"
+    __table_args__ = (
+        Index("ix_detection_jobs_status_created_at", "status", "created_at"),
+    )
+    
+    id = Column(String(32), primary_key=True)
+    status = Column(String, nullable=False, default="pending")
+    progress = Column(Float, nullable=True)
+    message = Column(Text, nullable=True)
+    confidence = Column(Float, nullable=False)
+    original_filename = Column(String, nullable=True)
+    image_path = Column(String, nullable=False)
+    annotated_path = Column(String, nullable=True)
+    result = Column(JSON, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+
 class UserModel(Base):
     """Model SQLAlchemy para Usuário."""
     __tablename__ = "users"
@@ -0,0 +1,293 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, union_all, exists, or_
+from sqlalchemy.orm import selectinload
+
+from app.domain.entities.publication import AnalyzedPublication
+from app.domain.value_objects.sentiment import Sentiment
+from app.domain.value_objects.emotion import Emotion
+from app.domain.value_objects.topic import Topic
+from app.infrastructure.database.models import (
+    PublicationModel,
+    CommentModel,
+    ReplyModel,
+    PublicationAnalysisModel,
+    CommentAnalysisModel,
+    ReplyAnalysisModel,
+)
+from app.infrastructure.database.repositories.filters import publication_conditions, local_bucket
+
+
+def attach_analysis(db_publication: PublicationModel, analyzed: AnalyzedPublication) -> None:
+    """
+    Anexa os labels de uma publicação analisada aos models correspondentes.
+
+    `analyzed.analyzed_comments` segue a ordem produzida por
+    `NLPService.analyze_publication`: cada comentário seguido das suas respostas.
+    """
+    db_publication.analyses = PublicationAnalysisModel(
+        main_sentiment=analyzed.main_sentiment.value,
+        main_emotion=analyzed.main_emotion.value,
+        main_topic=analyzed.main_topic.value,
+        analyzed_at=analyzed.analyzed_at,
+    )
+
+    labels = iter(analyzed.analyzed_comments)
+    for db_comment in db_publication.comments:
+        analyzed_comment = next(labels)
+        db_comment.analyses = CommentAnalysisModel(
+            sentiment=analyzed_comment.sentiment.value,
+            emotion=analyzed_comment.emotion.value,
+            topic=analyzed_comment.topic.value,
+            analyzed_at=analyzed_comment.analyzed_at,
+        )
+        for db_reply in db_comment.replies:
+            analyzed_reply = next(labels)
+            db_reply.analyses = ReplyAnalysisModel(
+                sentiment=analyzed_reply.sentiment.value,
+                emotion=analyzed_reply.emotion.value,
+                topic=analyzed_reply.topic.value,
+                analyzed_at=analyzed_reply.analyzed_at,
+            )
+
+
+def attach_labels(
+    rows: List[Union[CommentModel, ReplyModel]],
+    labels: List[Tuple[Sentiment, Emotion, Topic]],
+    analyzed_at: datetime,
+) -> None:
+    """Anexa labels (na mesma ordem) a comentários/respostas novos."""
+    for row, (sentiment, emotion, topic) in zip(rows, labels):
+        analysis_model = CommentAnalysisModel if isinstance(row, CommentModel) else ReplyAnalysisModel
+        row.analyses = analysis_model(
+            sentiment=sentiment.value,
+            emotion=emotion.value,
+            topic=topic.value,
+            analyzed_at=analyzed_at,
+        )
+
+
+def stored_labels(conditions: list):
+    """
+    Subquery com todos os labels armazenados (publicações, comentários e respostas)
+    das publicações que satisfazem `conditions`.
+    Colunas: publication_id, date (da publicação), sentiment, emotion, topic.
+    """
+    publication_labels = select(
+        PublicationAnalysisModel.publication_id.label("publication_id"),
+        PublicationModel.date.label("date"),
+        PublicationAnalysisModel.main_sentiment.label("sentiment"),
+        PublicationAnalysisModel.main_emotion.label("emotion"),
+        PublicationAnalysisModel.main_topic.label("topic"),
+    ).join(
+        PublicationModel, PublicationAnalysisModel.publication_id == PublicationModel.id
+    ).where(*conditions)
+
+    comment_labels = select(
+        CommentModel.publication_id,
+        PublicationModel.date,
+        CommentAnalysisModel.sentiment,
+        CommentAnalysisModel.emotion,
+        CommentAnalysisModel.topic,
+    ).join(
+        CommentModel, CommentAnalysisModel.comment_id == CommentModel.id
+    ).join(
+        PublicationModel, CommentModel.publication_id == PublicationModel.id
+    ).where(*conditions)
+
+    reply_labels = select(
+        CommentModel.publication_id,
+        PublicationModel.date,
+        ReplyAnalysisModel.sentiment,
+        ReplyAnalysisModel.emotion,
+        ReplyAnalysisModel.topic,
+    ).join(
+        ReplyModel, ReplyAnalysisModel.reply_id == ReplyModel.id
+    ).join(
+        CommentModel, ReplyModel.comment_id == CommentModel.id
+    ).join(
+        PublicationModel, CommentModel.publication_id == PublicationModel.id
+    ).where(*conditions)
+
+    return union_all(publication_labels, comment_labels, reply_labels).subquery()
+
+
+class AnalysisRepository:
+    """Repository para os labels de NLP armazenados."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @staticmethod
+    def _with_analyses(stmt):
+        # Carrega também as análises (vazias) para permitir a atribuição em contexto async
+        return stmt.options(
+            selectinload(PublicationModel.analyses),
+            selectinload(PublicationModel.comments).selectinload(CommentModel.analyses),
+            selectinload(PublicationModel.comments)
+            .selectinload(CommentModel.replies)
+            .selectinload(ReplyModel.analyses),
+        )
+
+    async def list_unanalyzed_publications(self, limit: int = 100) -> List[PublicationModel]:
+        """Lista publicações que ainda não possuem análise armazenada."""
+        stmt = select(PublicationModel).outerjoin(
+            PublicationAnalysisModel,
+            PublicationAnalysisModel.publication_id == PublicationModel.id,
+        ).where(
+            PublicationAnalysisModel.id.is_(None)
+        ).order_by(PublicationModel.id).limit(limit)
+
+        result = await self.session.execute(self._with_analyses(stmt))
+        return list(result.scalars().all())
+
+    async def get_publications(self, publication_ids: Sequence[int]) -> List[PublicationModel]:
+        """Publicações informadas, com comentários, respostas e labels carregados."""
+        if not publication_ids:
+            return []
+        stmt = select(PublicationModel).where(
+            PublicationModel.id.in_(publication_ids)
+        ).order_by(PublicationModel.id)
+
+        result = await self.session.execute(self._with_analyses(stmt))
+        return list(result.scalars().all())
+
+    async def list_pending_ids(self, after_id: int = 0, limit: int = 1000) -> List[int]:
+        """
+        IDs (após `after_id`, em ordem) das publicações com labels pendentes:
+        sem análise ou com comentários/respostas ainda não classificados.
+        """
+        unlabeled_comment = exists().where(
+            CommentModel.publication_id == PublicationModel.id,
+            ~exists().where(CommentAnalysisModel.comment_id == CommentModel.id),
+        )
+        unlabeled_reply = exists().where(
+            CommentModel.publication_id == PublicationModel.id,
+            ReplyModel.comment_id == CommentModel.id,
+            ~exists().where(ReplyAnalysisModel.reply_id == ReplyModel.id),
+        )
+        stmt = select(PublicationModel.id).where(
+            PublicationModel.id > after_id,
+            or_(
+                ~exists().where(PublicationAnalysisModel.publication_id == PublicationModel.id),
+                unlabeled_comment,
+                unlabeled_reply,
+            ),
+        ).order_by(PublicationModel.id).limit(limit)
+
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def save(self, db_publication: PublicationModel, analyzed: AnalyzedPublication) -> None:
+        """Armazena os labels de uma publicação já persistida."""
+        attach_analysis(db_publication, analyzed)
+        await self.session.flush()
+
+    async def get_date_range(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        tags: Optional[List[str]] = None,
+    ) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """
+        Retorna a menor e a maior data das publicações filtradas com labels
+        armazenados (o mesmo conjunto de `get_totals`).
+        """
+        stmt = select(
+            func.min(PublicationModel.date),
+            func.max(PublicationModel.date),
+        ).where(*publication_conditions(start_date, end_date, tags), PublicationModel.analyses.has())
+        row = (await self.session.execute(stmt)).one()
+        return row[0], row[1]
+
+    async def get_totals(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        tags: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Conta publicações, comentários + respostas e o período coberto, em uma única
+        query. Considera apenas linhas com labels armazenados, o mesmo conjunto
+        coberto pelos agregados diários (`dashboard_rollups`).
+        """
+        conditions = publication_conditions(start_date, end_date, tags)
+
+        comments_count = select(func.count(CommentModel.id)).join(
+            PublicationModel, CommentModel.publication_id == PublicationModel.id
+        ).where(*conditions, CommentModel.analyses.has()).scalar_subquery()
+
+        replies_count = select(func.count(ReplyModel.id)).join(
+            CommentModel, ReplyModel.comment_id == CommentModel.id
+        ).join(
+            PublicationModel, CommentModel.publication_id == PublicationModel.id
+        ).where(*conditions, ReplyModel.analyses.has()).scalar_subquery()
+
+        stmt = select(
+            func.count(PublicationModel.id),
+            func.min(PublicationModel.date),
+            func.max(PublicationModel.date),
+            comments_count,
+            replies_count,
+        ).where(*conditions, PublicationModel.analyses.has())
+
+        row = (await self.session.execute(stmt)).one()
+        return {
+            "total_publications": row[0] or 0,
+            "min_date": row[1],
+            "max_date": row[2],
+            "total_comments": (row[3] or 0) + (row[4] or 0),
+        }
+
+    async def count_labels(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        tags: Optional[List[str]] = None,
+    ) -> List[Tuple[str, str, str, int]]:
+        """
+        Agrupa os labels armazenados (publicações, comentários e respostas) por
+        (sentimento, emoção, tópico). O resultado tem no máximo uma linha por
+        combinação de labels, independente do volume de dados.
+        """
+        labels = stored_labels(publication_conditions(start_date, end_date, tags))
+        stmt = select(
+            labels.c.sentiment,
+            labels.c.emotion,
+            labels.c.topic,
+            func.count(),
+        ).group_by(labels.c.sentiment, labels.c.emotion, labels.c.topic)
+
+        result = await self.session.execute(stmt)
+        return [tuple(row) for row in result.all()]
+
+    async def count_labels_by_bucket(
+        self,
+        bucket: str,
+        tz: str = "UTC",
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        tags: Optional[List[str]] = None,
+    ) -> List[Tuple[datetime, str, str, str, int]]:
+        """
+        Agrupa os labels armazenados por intervalo de tempo (date_trunc no fuso `tz`)
+        e por (sentimento, emoção, tópico), em uma única query.
+        """
+        labels = stored_labels(publication_conditions(start_date, end_date, tags))
+        bucket_start = local_bucket(bucket, labels.c.date, tz).label("bucket")
+        stmt = select(
+            bucket_start,
+            labels.c.sentiment,
+            labels.c.emotion,
+            labels.c.topic,
+            func.count(),
+        ).group_by(
+            bucket_start,
+            labels.c.sentiment,
+            labels.c.emotion,
+            labels.c.topic,
+        ).order_by(bucket_start)
+
+        result = await self.session.execute(stmt)
+        return [tuple(row) for row in result.all()]
@@ -0,0 +1,53 @@
+from typing import Any, Optional
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.value_objects.detection_status import DetectionStatus
+from app.infrastructure.database.models import DetectionJobModel
+
+
+class DetectionJobRepository:
+    """Repository para as detecções de objetos assíncronas."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create(
+        self,
+        job_id: str,
+        image_path: str,
+        confidence: float,
+        original_filename: Optional[str] = None,
+        message: Optional[str] = None,
+    ) -> DetectionJobModel:
+        """Registra uma detecção pendente (faz commit)."""
+        job = DetectionJobModel(
+            id=job_id,
+            status=DetectionStatus.PENDING.value,
+            progress=0.0,
+            message=message,
+            confidence=confidence,
+            original_filename=original_filename,
+            image_path=image_path,
+        )
+        self.session.add(job)
+        await self.session.commit()
+        await self.session.refresh(job)
+        return job
+
+    async def get(self, job_id: str) -> Optional[DetectionJobModel]:
+        """Busca uma detecção pelo task_id."""
+        result = await self.session.execute(
+            select(DetectionJobModel).where(DetectionJobModel.id == job_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def update(self, job_id: str, **values: Any) -> Optional[DetectionJobModel]:
+        """Atualiza os campos informados e faz commit (o status é visível imediatamente)."""
+        await self.session.execute(
+            update(DetectionJobModel)
+            .where(DetectionJobModel.id == job_id)
+            .values(**values)
+        )
+        await self.session.commit()
+        return await self.get(job_id)
@@ -0,0 +1,154 @@
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from datetime import datetime
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.database.models import (
+    PublicationModel,
+    CommentModel,
+    ReplyModel,
+    PublicationAnalysisModel,
+    CommentAnalysisModel,
+    ReplyAnalysisModel,
+)
+from app.infrastructure.database.repositories.filters import publication_conditions
+
+
+# Conjuntos exportados (uma linha por publicação, comentário ou resposta, com seus labels)
+DATASET_PUBLICATIONS = "publications"
+DATASET_COMMENTS = "comments"
+DATASET_REPLIES = "replies"
+EXPORT_DATASETS = (DATASET_PUBLICATIONS, DATASET_COMMENTS, DATASET_REPLIES)
+
+# Colunas de cada conjunto: (nome, tipo Python do valor)
+EXPORT_COLUMNS = {
+    DATASET_PUBLICATIONS: [
+        ("id", int),
+        ("publicacao_n", int),
+        ("url", str),
+        ("description", str),
+        ("date", datetime),
+        ("views", str),
+        ("likes", str),
+        ("comments_count", int),
+        ("shares", str),
+        ("bookmarks", str),
+        ("views_count", int),
+        ("likes_count", int),
+        ("shares_count", int),
+        ("bookmarks_count", int),
+        ("music_title", str),
+        ("tags", list),
+        ("sentiment", str),
+        ("emotion", str),
+        ("topic", str),
+    ],
+    DATASET_COMMENTS: [
+        ("id", int),
+        ("publication_id", int),
+        ("publicacao_n", int),
+        ("username", str),
+        ("text", str),
+        ("likes", int),
+        ("created_at", datetime),
+        ("sentiment", str),
+        ("emotion", str),
+        ("topic", str),
+    ],
+    DATASET_REPLIES: [
+        ("id", int),
+        ("comment_id", int),
+        ("publication_id", int),
+        ("publicacao_n", int),
+        ("username", str),
+        ("text", str),
+        ("likes", int),
+        ("created_at", datetime),
+        ("sentiment", str),
+        ("emotion", str),
+        ("topic", str),
+    ],
+}
+
+
+def export_statement(dataset: str, conditions: list):
+    """SELECT do conjunto `dataset` (labels por LEFT JOIN) para as publicações filtradas."""
+    if dataset == DATASET_PUBLICATIONS:
+        analysis = PublicationAnalysisModel
+        return select(
+            *(getattr(PublicationModel, name) for name, _ in EXPORT_COLUMNS[dataset][:-3]),
+            analysis.main_sentiment.label("sentiment"),
+            analysis.main_emotion.label("emotion"),
+            analysis.main_topic.label("topic"),
+        ).outerjoin(
+            analysis, analysis.publication_id == PublicationModel.id
+        ).where(*conditions).order_by(PublicationModel.id)
+
+    if dataset == DATASET_COMMENTS:
+        return select(
+            CommentModel.id,
+            CommentModel.publication_id,
+            PublicationModel.publicacao_n,
+            CommentModel.username,
+            CommentModel.text,
+            CommentModel.likes,
+            CommentModel.created_at,
+            CommentAnalysisModel.sentiment,
+            CommentAnalysisModel.emotion,
+            CommentAnalysisModel.topic,
+        ).join(
+            PublicationModel, CommentModel.publication_id == PublicationModel.id
+        ).outerjoin(
+            CommentAnalysisModel, CommentAnalysisModel.comment_id == CommentModel.id
+        ).where(*conditions).order_by(CommentModel.id)
+
+    return select(
+        ReplyModel.id,
+        ReplyModel.comment_id,
+        CommentModel.publication_id,
+        PublicationModel.publicacao_n,
+        ReplyModel.username,
+        ReplyModel.text,
+        ReplyModel.likes,
+        ReplyModel.created_at,
+        ReplyAnalysisModel.sentiment,
+        ReplyAnalysisModel.emotion,
+        ReplyAnalysisModel.topic,
+    ).join(
+        CommentModel, ReplyModel.comment_id == CommentModel.id
+    ).join(
+        PublicationModel, CommentModel.publication_id == PublicationModel.id
+    ).outerjoin(
+        ReplyAnalysisModel, ReplyAnalysisModel.reply_id == ReplyModel.id
+    ).where(*conditions).order_by(ReplyModel.id)
+
+
+class ExportRepository:
+    """Repository para leitura em streaming dos dados exportados."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def stream(
+        self,
+        dataset: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        tags: Optional[List[str]] = None,
+        engagement: Optional[Dict[str, Tuple[Optional[int], Optional[int]]]] = None,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Lê as linhas de `dataset` em lotes de `chunk_size`, com um cursor no
+        servidor (`yield_per`): apenas um lote fica em memória por vez.
+        """
+        stmt = export_statement(
+            dataset, publication_conditions(start_date, end_date, tags, engagement)
+        ).execution_options(yield_per=chunk_size)
+
+        result = await self.session.stream(stmt)
+        try:
+            async for partition in result.mappings().partitions():
+                yield [dict(row) for row in partition]
+        finally:
+            await result.close()
@@ -0,0 +1,80 @@
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+from sqlalchemy import Boolean, and_, exists, func, select, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ColumnElement
+
+from app.infrastructure.database.models import PublicationModel
+
+
+class TagsContain(ColumnElement):
+    """
+    Condição "a lista de tags contém todas as `tags`". No Postgres é o operador
+    JSONB `@>`, atendido pelo índice GIN ix_publications_tags; nos demais
+    bancos, uma busca por tag em json_each.
+    """
+
+    type = Boolean()
+    inherit_cache = False
+
+    def __init__(self, column, tags: List[str]):
+        self.column = column
+        self.tags = list(tags)
+
+
+@compiles(TagsContain, "postgresql")
+def _compile_tags_contain_postgresql(element: TagsContain, compiler, **kw) -> str:
+    return compiler.process(type_coerce(element.column, JSONB).contains(element.tags), **kw)
+
+
+@compiles(TagsContain)
+def _compile_tags_contain(element: TagsContain, compiler, **kw) -> str:
+    conditions = []
+    for tag in element.tags:
+        values = func.json_each(element.column).table_valued("value")
+        conditions.append(exists(select(1).select_from(values).where(values.c.value == tag)))
+    return f"({compiler.process(and_(*conditions), **kw)})"
+
+
+def tag_values(column, dialect: str):
+    """Tabela (coluna `value`) com um elemento da lista de tags por linha, no dialeto informado."""
+    if dialect == "postgresql":
+        return func.jsonb_array_elements_text(type_coerce(column, JSONB)).table_valued("value")
+    return func.json_each(column).table_valued("value")
+
+
+def publication_conditions(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    tags: Optional[List[str]] = None,
+    engagement: Optional[Dict[str, Tuple[Optional[int], Optional[int]]]] = None,
+) -> list:
+    """
+    Monta as condições de filtro de publicações (período, tags e, em
+    `engagement`, faixas {métrica: (mínimo, máximo)} das contagens
+    `<métrica>_count`).
+    """
+    conditions = []
+    if start_date:
+        conditions.append(PublicationModel.date >= start_date)
+    if end_date:
+        conditions.append(PublicationModel.date <= end_date)
+    if tags:
+        conditions.append(TagsContain(PublicationModel.tags, tags))
+    for metric, (minimum, maximum) in (engagement or {}).items():
+        column = getattr(PublicationModel, f"{metric}_count")
+        if minimum is not None:
+            conditions.append(column >= minimum)
+        if maximum is not None:
+            conditions.append(column <= maximum)
+    return conditions
+
+
+def local_bucket(bucket: str, column, tz: str = "UTC"):
+    """
+    Trunca uma coluna de data (armazenada em UTC, sem fuso) para o início do
+    intervalo `bucket` (hour, day, week) no fuso `tz`.
+    """
+    local_time = func.timezone(tz, func.timezone("UTC", column))
+    return func.date_trunc(bucket, local_time)
@@ -0,0 +1,76 @@
+import base64
+import json
+from typing import Any, Optional, Tuple, Union
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+
+# Abaixo deste valor estimado a contagem exata é barata o suficiente
+EXACT_COUNT_THRESHOLD = 10000
+
+# Chave de ordenação do cursor: date ou uma contagem de engajamento
+CursorKey = Union[datetime, int]
+Cursor = Tuple[CursorKey, int]
+
+
+def encode_cursor(key: CursorKey, id: int, sort: Optional[str] = None) -> str:
+    """
+    Gera o cursor opaco da posição (chave de ordenação, id). Com `sort`, o
+    cursor registra a ordenação em que foi gerado.
+    """
+    value = key.isoformat() if isinstance(key, datetime) else key
+    raw = json.dumps([value, id] if sort is None else [value, id, sort], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, key_type: type = datetime, sort: Optional[str] = None) -> Cursor:
+    """
+    Lê um cursor gerado por `encode_cursor` cuja chave é do tipo `key_type`
+    (datetime ou int) e, se informada, cuja ordenação é `sort`. Levanta
+    ValueError se inválido ou gerado para outra ordenação.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key, id, *rest = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError, UnicodeError) as e:
+        raise ValueError("Cursor inválido") from e
+    if sort is not None and rest != [sort]:
+        raise ValueError(f"Cursor não corresponde à ordenação sort={sort}")
+    try:
+        if key_type is datetime:
+            return datetime.fromisoformat(key), int(id)
+        if type(key) is not int:
+            raise TypeError(key)
+        return key, int(id)
+    except (ValueError, TypeError, UnicodeError) as e:
+        raise ValueError("Cursor inválido") from e
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) de um SELECT, preservando os parâmetros."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Any):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def estimate_rows(session: AsyncSession, statement: Any) -> Optional[int]:
+    """
+    Número de linhas estimado pelo planner do Postgres (estatísticas do ANALYZE),
+    sem executar a query. Retorna None em outros bancos.
+    """
+    if session.get_bind().dialect.name != "postgresql":
+        return None
+
+    plan = (await session.execute(Explain(statement))).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
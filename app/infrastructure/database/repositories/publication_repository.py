@@ -1,16 +1,186 @@
-from typing import List, Optional
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union
 from datetime import datetime
+import asyncpg
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, String as SQLString
-from sqlalchemy.orm import selectinload
+from sqlalchemy import (
+    select, insert, update, and_, or_, func, tuple_, literal, null, cast, union_all, true,
+    Integer, String as SQLString,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import selectinload, raiseload, load_only
 
-from app.domain.entities.publication import Publication
-from app.domain.entities.comment import Comment, Reply
+from app.domain.entities.publication import Publication, AnalyzedPublication
+from app.domain.entities.comment import Comment, Reply, AnalyzedComment, content_key
+from app.domain.value_objects.engagement import ENGAGEMENT_METRICS, parse_count
 from app.infrastructure.database.models import (
     PublicationModel,
     CommentModel,
-    ReplyModel
+    ReplyModel,
+    PublicationAnalysisModel,
+    CommentAnalysisModel,
+    ReplyAnalysisModel,
+)
+from app.infrastructure.database.repositories.analysis_repository import attach_analysis
+from app.infrastructure.database.repositories.filters import publication_conditions, tag_values
+from app.infrastructure.database.repositories.text_search import (
+    MODE_FULLTEXT,
+    MODE_SUBSTRING,
+    KIND_COMMENT,
+    KIND_REPLY,
+    PUBLICATIONS_SEARCH_VECTOR,
+    COMMENTS_SEARCH_VECTOR,
+    REPLIES_SEARCH_VECTOR,
+    ts_query,
+    ts_rank,
+    ts_headline,
+    format_headline,
+    substring_pattern,
+    highlight_substring,
 )
+from app.infrastructure.database.repositories.pagination import (
+    Cursor,
+    EXACT_COUNT_THRESHOLD,
+    estimate_rows,
+)
+
+
+def _label_row(key: str, id: int, analyzed_comment: AnalyzedComment) -> Dict[str, Any]:
+    """Linha de comment_analyses/reply_analyses para um comentário analisado."""
+    return {
+        key: id,
+        "sentiment": analyzed_comment.sentiment.value,
+        "emotion": analyzed_comment.emotion.value,
+        "topic": analyzed_comment.topic.value,
+        "analyzed_at": analyzed_comment.analyzed_at,
+    }
+
+
+def engagement_counts(publication: Any) -> Dict[str, int]:
+    """Colunas `<métrica>_count` com as contagens dos valores exibidos da publicação."""
+    return {
+        f"{metric}_count": parse_count(getattr(publication, metric))
+        for metric in ENGAGEMENT_METRICS
+    }
+
+
+# Contadores da publicação atualizados no merge
+PUBLICATION_COUNTERS = ("views", "likes", "comments_count", "shares", "bookmarks")
+
+
+def merge_comments(
+    db_publication: PublicationModel,
+    publication: Publication,
+) -> Tuple[List[Union[CommentModel, ReplyModel]], int]:
+    """
+    Mescla uma nova coleta de uma publicação existente (carregada com comentários
+    e respostas) nos models.
+
+    Comentários e respostas são identificados pela chave de conteúdo (usuário +
+    hash do texto): os já armazenados têm apenas as curtidas atualizadas, os
+    demais são adicionados. Contadores da publicação são atualizados quando
+    informados. Retorna (linhas novas, na ordem comentário seguido das suas
+    respostas; número de valores atualizados).
+    """
+    updated = 0
+    for name in PUBLICATION_COUNTERS:
+        value = getattr(publication, name)
+        if value is not None and value != getattr(db_publication, name):
+            setattr(db_publication, name, value)
+            if name in ENGAGEMENT_METRICS:
+                setattr(db_publication, f"{name}_count", parse_count(value))
+            updated += 1
+
+    stored_comments = defaultdict(list)
+    for db_comment in db_publication.comments:
+        stored_comments[content_key(db_comment.username, db_comment.text)].append(db_comment)
+
+    new_rows: List[Union[CommentModel, ReplyModel]] = []
+    for comment in publication.comments:
+        matches = stored_comments.get(comment.content_key())
+        if matches:
+            db_comment = matches.pop(0)
+            if db_comment.likes != comment.likes:
+                db_comment.likes = comment.likes
+                updated += 1
+        else:
+            db_comment = CommentModel(username=comment.username, text=comment.text, likes=comment.likes)
+            db_publication.comments.append(db_comment)
+            new_rows.append(db_comment)
+
+        stored_replies = defaultdict(list)
+        for db_reply in db_comment.replies:
+            stored_replies[content_key(db_reply.username, db_reply.text)].append(db_reply)
+
+        for reply in comment.replies:
+            matches = stored_replies.get(reply.content_key())
+            if matches:
+                db_reply = matches.pop(0)
+                if db_reply.likes != reply.likes:
+                    db_reply.likes = reply.likes
+                    updated += 1
+            else:
+                db_reply = ReplyModel(username=reply.username, text=reply.text, likes=reply.likes)
+                db_comment.replies.append(db_reply)
+                new_rows.append(db_reply)
+
+    return new_rows, updated
+
+
+# Estratégias de carregamento dos relacionamentos
+LOAD_NONE = "none"
+LOAD_COMMENTS = "comments"
+LOAD_FULL = "full"
+LOAD_STRATEGIES = (LOAD_NONE, LOAD_COMMENTS, LOAD_FULL)
+
+# Ordenações da listagem (sempre decrescente, desempate por id)
+SORT_DATE = "date"
+SORT_VIEWS = "views"
+SORT_LIKES = "likes"
+SORT_SHARES = "shares"
+SORT_OPTIONS = (SORT_DATE, SORT_VIEWS, SORT_LIKES, SORT_SHARES)
+
+
+# Ordenações da listagem de comentários de uma publicação
+COMMENT_SORT_ID = "id"
+COMMENT_SORT_LIKES = "likes"
+COMMENT_SORT_OPTIONS = (COMMENT_SORT_ID, COMMENT_SORT_LIKES)
+
+# Labels de NLP armazenados de comentários e respostas
+LABEL_FIELDS = ("sentiment", "emotion", "topic")
+
+
+def sort_column(sort: str = SORT_DATE):
+    """Coluna da ordenação `sort`: date ou a contagem `<métrica>_count`."""
+    if sort == SORT_DATE:
+        return PublicationModel.date
+    return getattr(PublicationModel, f"{sort}_count")
+
+
+def load_options(load: str = LOAD_FULL, fields: Optional[Sequence[str]] = None) -> list:
+    """
+    Options de carregamento para consultas de publicações.
+
+    - `none`: nenhum relacionamento (acesso a `comments` levanta erro em vez de
+      disparar uma query implícita)
+    - `comments`: comentários
+    - `full`: comentários e respostas
+
+    `fields` restringe as colunas carregadas da publicação (`id` e `date`, usados
+    na paginação, são sempre incluídos).
+    """
+    if load == LOAD_NONE:
+        options = [raiseload(PublicationModel.comments)]
+    elif load == LOAD_COMMENTS:
+        options = [selectinload(PublicationModel.comments)]
+    else:
+        options = [selectinload(PublicationModel.comments).selectinload(CommentModel.replies)]
+    
+    if fields:
+        columns = dict.fromkeys(["id", "date", *fields])
+        options.append(load_only(*(getattr(PublicationModel, name) for name in columns)))
+    return options
 
 
 class PublicationRepository:
@@ -19,8 +189,12 @@ class PublicationRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
     
-    async def create(self, publication: Publication) -> PublicationModel:
-        """Cria uma nova publicação."""
+    async def create(
+        self,
+        publication: Publication,
+        analyzed: Optional[AnalyzedPublication] = None,
+    ) -> PublicationModel:
+        """Cria uma nova publicação (e seus labels de NLP, se fornecidos)."""
         db_publication = PublicationModel(
             publicacao_n=publication.publicacao_n,
             url=publication.url,
@@ -33,6 +207,7 @@ class PublicationRepository:
             bookmarks=publication.bookmarks,
             music_title=publication.music_title,
             tags=publication.tags,
+            **engagement_counts(publication),
         )
         
         # Adiciona comentários
@@ -53,95 +228,569 @@ class PublicationRepository:
             
             db_publication.comments.append(db_comment)
         
+        if analyzed is not None:
+            attach_analysis(db_publication, analyzed)
+        
         self.session.add(db_publication)
         await self.session.commit()
         await self.session.refresh(db_publication)
         return db_publication
     
-    async def get_by_id(self, publication_id: int) -> Optional[PublicationModel]:
+    def _insert(self, model):
+        """INSERT com suporte a ON CONFLICT no dialeto da sessão."""
+        dialect = self.session.get_bind().dialect.name
+        if dialect == "sqlite":
+            return sqlite.insert(model)
+        return postgresql.insert(model)
+    
+    async def create_many(
+        self,
+        publications: List[Publication],
+        analyzed: Optional[List[AnalyzedPublication]] = None,
+    ) -> Dict[int, int]:
+        """
+        Insere publicações, comentários, respostas e labels em lote (não faz
+        commit): INSERT multi-row para as publicações e COPY (Postgres) para o
+        restante. Sem `analyzed`, as linhas são inseridas sem labels (análise em
+        background). `publicacao_n` deve ser único no lote;
+        publicações já existentes no banco são ignoradas (ON CONFLICT DO NOTHING).
+        Retorna {índice no lote: id} das publicações inseridas.
+        """
+        if not publications:
+            return {}
+        
+        stmt = self._insert(PublicationModel).on_conflict_do_nothing(
+            index_elements=["publicacao_n"]
+        ).returning(PublicationModel.id, PublicationModel.publicacao_n)
+        result = await self.session.execute(stmt, [
+            {
+                "publicacao_n": publication.publicacao_n,
+                "url": publication.url,
+                "description": publication.description,
+                "date": publication.date,
+                "views": publication.views,
+                "likes": publication.likes,
+                "comments_count": publication.comments_count,
+                "shares": publication.shares,
+                "bookmarks": publication.bookmarks,
+                "music_title": publication.music_title,
+                "tags": publication.tags,
+                **engagement_counts(publication),
+            }
+            for publication in publications
+        ])
+        publication_ids = {publicacao_n: id for id, publicacao_n in result.all()}
+        inserted = {
+            index: publication_ids[publication.publicacao_n]
+            for index, publication in enumerate(publications)
+            if publication.publicacao_n in publication_ids
+        }
+        if not inserted:
+            return {}
+        
+        now = datetime.utcnow()
+        publication_analyses, comment_rows, comment_labels, comment_replies = [], [], [], []
+        for index, publication_id in inserted.items():
+            publication = publications[index]
+            labels = iter(())
+            if analyzed is not None:
+                analysis = analyzed[index]
+                publication_analyses.append({
+                    "publication_id": publication_id,
+                    "main_sentiment": analysis.main_sentiment.value,
+                    "main_emotion": analysis.main_emotion.value,
+                    "main_topic": analysis.main_topic.value,
+                    "analyzed_at": analysis.analyzed_at,
+                })
+                # analyzed_comments: cada comentário seguido das suas respostas
+                labels = iter(analysis.analyzed_comments)
+            
+            for comment in publication.comments:
+                comment_rows.append({
+                    "publication_id": publication_id,
+                    "username": comment.username,
+                    "text": comment.text,
+                    "likes": comment.likes,
+                    "created_at": now,
+                })
+                comment_labels.append(next(labels, None))
+                comment_replies.append([(reply, next(labels, None)) for reply in comment.replies])
+        
+        # IDs reservados antecipadamente: respostas e labels referenciam os
+        # comentários sem depender da ordem de um RETURNING
+        comment_ids = await self._allocate_ids(CommentModel, len(comment_rows))
+        comment_analyses, reply_rows, reply_labels = [], [], []
+        for row, comment_id, label, replies in zip(
+            comment_rows, comment_ids, comment_labels, comment_replies
+        ):
+            row["id"] = comment_id
+            if label is not None:
+                comment_analyses.append(_label_row("comment_id", comment_id, label))
+            for reply, reply_label in replies:
+                reply_rows.append({
+                    "comment_id": comment_id,
+                    "username": reply.username,
+                    "text": reply.text,
+                    "likes": reply.likes,
+                    "created_at": now,
+                })
+                reply_labels.append(reply_label)
+        
+        reply_ids = await self._allocate_ids(ReplyModel, len(reply_rows))
+        for row, reply_id in zip(reply_rows, reply_ids):
+            row["id"] = reply_id
+        
+        await self._write_rows(PublicationAnalysisModel, publication_analyses)
+        await self._write_rows(CommentModel, comment_rows)
+        await self._write_rows(CommentAnalysisModel, comment_analyses)
+        await self._write_rows(ReplyModel, reply_rows)
+        await self._write_rows(ReplyAnalysisModel, [
+            _label_row("reply_id", reply_id, label)
+            for reply_id, label in zip(reply_ids, reply_labels)
+            if label is not None
+        ])
+        return inserted
+    
+    async def _allocate_ids(self, model, count: int) -> List[int]:
+        """Reserva `count` IDs da tabela (sequence no Postgres; max(id) nos demais)."""
+        if not count:
+            return []
+        
+        if self.session.get_bind().dialect.name == "postgresql":
+            sequence = func.pg_get_serial_sequence(model.__tablename__, "id")
+            result = await self.session.execute(
+                select(func.nextval(sequence)).select_from(func.generate_series(1, count))
+            )
+            return list(result.scalars().all())
+        
+        # SQLite: a transação já detém o lock de escrita (INSERT das publicações)
+        result = await self.session.execute(select(func.coalesce(func.max(model.id), 0)))
+        start = result.scalar() + 1
+        return list(range(start, start + count))
+    
+    async def _write_rows(self, model, rows: List[Dict[str, Any]]) -> None:
+        """
+        Grava linhas em lote: COPY (asyncpg) no Postgres, INSERT multi-row nos demais.
+        Erros do asyncpg no COPY são convertidos em `DBAPIError`, como os demais
+        erros de banco vistos pelos chamadores.
+        """
+        if not rows:
+            return
+        
+        if self.session.get_bind().dialect.name == "postgresql":
+            columns = list(rows[0])
+            connection = await self.session.connection()
+            raw_connection = await connection.get_raw_connection()
+            try:
+                await raw_connection.driver_connection.copy_records_to_table(
+                    model.__tablename__,
+                    records=[tuple(row[column] for column in columns) for row in rows],
+                    columns=columns,
+                )
+            except (asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+                raise DBAPIError(f"COPY {model.__tablename__}", None, e) from e
+            return
+        
+        await self.session.execute(insert(model), rows)
+    
+    async def existing_publicacao_ns(self, publicacao_ns: Sequence[int]) -> Set[int]:
+        """Retorna quais dos números de publicação informados já existem."""
+        if not publicacao_ns:
+            return set()
+        result = await self.session.execute(
+            select(PublicationModel.publicacao_n).where(
+                PublicationModel.publicacao_n.in_(publicacao_ns)
+            )
+        )
+        return set(result.scalars().all())
+    
+    async def get_by_id(
+        self,
+        publication_id: int,
+        load: str = LOAD_FULL,
+    ) -> Optional[PublicationModel]:
         """Busca publicação por ID."""
         stmt = select(PublicationModel).where(
             PublicationModel.id == publication_id
-        ).options(
-            selectinload(PublicationModel.comments).selectinload(CommentModel.replies)
-        )
+        ).options(*load_options(load))
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
     
-    async def get_by_publicacao_n(self, publicacao_n: int) -> Optional[PublicationModel]:
+    async def exists(self, publication_id: int) -> bool:
+        """Verifica se a publicação existe (sem carregá-la)."""
+        result = await self.session.execute(
+            select(literal(1)).where(PublicationModel.id == publication_id)
+        )
+        return result.scalar() is not None
+    
+    async def list_comments(
+        self,
+        publication_id: int,
+        limit: int = 100,
+        cursor: Optional[Cursor] = None,
+        sort: str = COMMENT_SORT_ID,
+        labels: Optional[Dict[str, str]] = None,
+        include_labels: bool = False,
+        include_replies: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Lista os comentários de uma publicação como dicionários (sem hidratar
+        models), em ordem de coleta (`id`) ou dos mais curtidos (`likes`, com
+        desempate por id). Com `cursor`, retorna os comentários posteriores à
+        posição (chave, id) informada (keyset); com `sort=id` a chave é o próprio
+        id. `labels` filtra por {sentiment, emotion, topic} armazenados;
+        `include_labels` inclui os labels e `include_replies` as respostas de cada
+        comentário (sem filtro), carregadas em uma query para a página.
+        """
+        columns = [
+            CommentModel.id,
+            CommentModel.username,
+            CommentModel.text,
+            CommentModel.likes,
+            CommentModel.created_at,
+        ]
+        if include_labels:
+            columns += [getattr(CommentAnalysisModel, name) for name in LABEL_FIELDS]
+        stmt = select(*columns).where(CommentModel.publication_id == publication_id)
+        
+        if include_labels or labels:
+            stmt = stmt.join(
+                CommentAnalysisModel,
+                CommentAnalysisModel.comment_id == CommentModel.id,
+                isouter=not labels,
+            )
+            for name, value in (labels or {}).items():
+                stmt = stmt.where(getattr(CommentAnalysisModel, name) == value)
+        
+        if sort == COMMENT_SORT_LIKES:
+            if cursor is not None:
+                stmt = stmt.where(tuple_(CommentModel.likes, CommentModel.id) < tuple_(*cursor))
+            stmt = stmt.order_by(CommentModel.likes.desc(), CommentModel.id.desc())
+        else:
+            if cursor is not None:
+                stmt = stmt.where(CommentModel.id > cursor[1])
+            stmt = stmt.order_by(CommentModel.id)
+        
+        result = await self.session.execute(stmt.limit(limit))
+        rows = [dict(row) for row in result.mappings().all()]
+        
+        if include_replies:
+            replies = await self._replies_by_comment([row["id"] for row in rows], include_labels)
+            for row in rows:
+                row["replies"] = replies.get(row["id"], [])
+        return rows
+    
+    async def _replies_by_comment(
+        self,
+        comment_ids: Sequence[int],
+        include_labels: bool = False,
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """Respostas dos comentários informados, agrupadas por comentário, em ordem de coleta."""
+        if not comment_ids:
+            return {}
+        
+        columns = [
+            ReplyModel.id,
+            ReplyModel.comment_id,
+            ReplyModel.username,
+            ReplyModel.text,
+            ReplyModel.likes,
+            ReplyModel.created_at,
+        ]
+        if include_labels:
+            columns += [getattr(ReplyAnalysisModel, name) for name in LABEL_FIELDS]
+        stmt = select(*columns).where(ReplyModel.comment_id.in_(comment_ids))
+        if include_labels:
+            stmt = stmt.outerjoin(ReplyAnalysisModel, ReplyAnalysisModel.reply_id == ReplyModel.id)
+        
+        result = await self.session.execute(stmt.order_by(ReplyModel.comment_id, ReplyModel.id))
+        replies = defaultdict(list)
+        for row in result.mappings().all():
+            row = dict(row)
+            replies[row.pop("comment_id")].append(row)
+        return replies
+    
+    async def get_by_publicacao_n(
+        self,
+        publicacao_n: int,
+        load: str = LOAD_FULL,
+    ) -> Optional[PublicationModel]:
         """Busca publicação por número de publicação."""
         stmt = select(PublicationModel).where(
             PublicationModel.publicacao_n == publicacao_n
-        ).options(
-            selectinload(PublicationModel.comments).selectinload(CommentModel.replies)
-        )
+        ).options(*load_options(load))
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
     
-    async def list(
+    async def get_many_by_publicacao_n(
+        self,
+        publicacao_ns: Sequence[int],
+        load: str = LOAD_FULL,
+    ) -> List[PublicationModel]:
+        """Busca publicações por número de publicação."""
+        if not publicacao_ns:
+            return []
+        stmt = select(PublicationModel).where(
+            PublicationModel.publicacao_n.in_(publicacao_ns)
+        ).options(*load_options(load))
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+    
+    async def analyzed_ids(self, publication_ids: Sequence[int]) -> Set[int]:
+        """IDs, dentre os informados, das publicações que já possuem labels de NLP."""
+        if not publication_ids:
+            return set()
+        result = await self.session.execute(
+            select(PublicationAnalysisModel.publication_id).where(
+                PublicationAnalysisModel.publication_id.in_(publication_ids)
+            )
+        )
+        return set(result.scalars().all())
+    
+    async def list(
         self,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         tags: Optional[List[str]] = None,
         limit: int = 100,
         offset: int = 0,
+        cursor: Optional[Cursor] = None,
+        load: str = LOAD_FULL,
+        fields: Optional[Sequence[str]] = None,
+        sort: str = SORT_DATE,
+        engagement: Optional[Dict[str, Tuple[Optional[int], Optional[int]]]] = None,
     ) -> List[PublicationModel]:
-        """Lista publicações com filtros."""
-        stmt = select(PublicationModel).options(
-            selectinload(PublicationModel.comments).selectinload(CommentModel.replies)
-        )
-        
-        conditions = []
-        if start_date:
-            conditions.append(PublicationModel.date >= start_date)
-        if end_date:
-            conditions.append(PublicationModel.date <= end_date)
-        if tags:
-            conditions.append(PublicationModel.tags.contains(tags))
+        """
+        Lista publicações com filtros, ordenadas pela coluna de `sort` (date ou
+        uma contagem de engajamento) e id, em ordem decrescente. Com `cursor`,
+        retorna as publicações posteriores à posição (chave, id) informada
+        (keyset), sem OFFSET. `load` e `fields` controlam o que é carregado (ver
+        `load_options`).
+        """
+        key = sort_column(sort)
+        if fields:
+            fields = [*fields, key.key]
+        stmt = select(PublicationModel).options(*load_options(load, fields))
         
+        conditions = publication_conditions(start_date, end_date, tags, engagement)
+        if cursor is not None:
+            conditions.append(tuple_(key, PublicationModel.id) < tuple_(*cursor))
         if conditions:
             stmt = stmt.where(and_(*conditions))
         
-        stmt = stmt.order_by(PublicationModel.date.desc()).limit(limit).offset(offset)
+        stmt = stmt.order_by(
+            key.desc(), PublicationModel.id.desc()
+        ).limit(limit).offset(offset)
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
     
-    async def search(self, query: str, limit: int = 100) -> List[PublicationModel]:
-        """Busca publicações por texto."""
-        stmt = select(PublicationModel).where(
-            or_(
-                PublicationModel.description.ilike(f"%{query}%"),
-                PublicationModel.publicacao_n.cast(SQLString).ilike(f"%{query}%")
-            )
-        ).options(
-            selectinload(PublicationModel.comments).selectinload(CommentModel.replies)
-        ).limit(limit)
+    async def search(
+        self,
+        query: str,
+        limit: int = 100,
+        mode: str = MODE_FULLTEXT,
+        load: str = LOAD_FULL,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[Tuple[PublicationModel, float, Optional[str]]]:
+        """
+        Busca publicações por texto, ordenadas por relevância.
+        Retorna (publicação, rank, descrição com os termos destacados).
+        
+        - `fulltext`: tsvector da descrição (índice GIN); uma consulta numérica
+          também encontra a publicação pelo `publicacao_n`
+        - `substring`: ILIKE na descrição e no `publicacao_n` (índice pg_trgm),
+          ordenado por similaridade
+        """
+        if mode == MODE_SUBSTRING:
+            rank = func.similarity(PublicationModel.description, query).label("rank")
+            pattern = substring_pattern(query)
+            stmt = select(PublicationModel, rank, PublicationModel.description).where(
+                or_(
+                    PublicationModel.description.ilike(pattern),
+                    PublicationModel.publicacao_n.cast(SQLString).ilike(pattern),
+                )
+            ).options(*load_options(load, fields)).order_by(
+                rank.desc(), PublicationModel.id.desc()
+            ).limit(limit)
+            
+            result = await self.session.execute(stmt)
+            return [
+                (publication, float(rank or 0), highlight_substring(description, query))
+                for publication, rank, description in result.all()
+            ]
+        
+        matches = PUBLICATIONS_SEARCH_VECTOR.op("@@")(ts_query(query))
+        if query.strip().isdigit():
+            matches = or_(matches, PublicationModel.publicacao_n == int(query))
+        
+        # Ranking e LIMIT primeiro; o destaque (custoso) só é gerado para a página
+        rank = ts_rank(PUBLICATIONS_SEARCH_VECTOR, query).label("rank")
+        ranked = select(PublicationModel.id, rank).where(matches).order_by(
+            rank.desc(), PublicationModel.id.desc()
+        ).limit(limit).subquery()
+        
+        stmt = select(
+            PublicationModel,
+            ranked.c.rank,
+            ts_headline(PublicationModel.description, query),
+        ).join(
+            ranked, ranked.c.id == PublicationModel.id
+        ).options(*load_options(load, fields)).order_by(
+            ranked.c.rank.desc(), PublicationModel.id.desc()
+        )
         
         result = await self.session.execute(stmt)
-        return list(result.scalars().all())
+        return [
+            (publication, float(rank or 0), format_headline(highlight))
+            for publication, rank, highlight in result.all()
+        ]
+    
+    async def search_comments(
+        self,
+        query: str,
+        limit: int = 100,
+        mode: str = MODE_FULLTEXT,
+    ) -> List[Dict[str, Any]]:
+        """
+        Busca comentários e respostas por texto, ordenados por relevância.
+        Cada resultado contém kind (comment/reply), id, publication_id,
+        comment_id (comentário pai, para respostas), username, text, likes,
+        rank e highlight.
+        """
+        if mode == MODE_SUBSTRING:
+            pattern = substring_pattern(query)
+            comment_matches = CommentModel.text.ilike(pattern)
+            reply_matches = ReplyModel.text.ilike(pattern)
+            comment_rank = func.similarity(CommentModel.text, query)
+            reply_rank = func.similarity(ReplyModel.text, query)
+        else:
+            comment_matches = COMMENTS_SEARCH_VECTOR.op("@@")(ts_query(query))
+            reply_matches = REPLIES_SEARCH_VECTOR.op("@@")(ts_query(query))
+            comment_rank = ts_rank(COMMENTS_SEARCH_VECTOR, query)
+            reply_rank = ts_rank(REPLIES_SEARCH_VECTOR, query)
+        
+        comment_hits = select(
+            literal(KIND_COMMENT).label("kind"),
+            CommentModel.id.label("id"),
+            CommentModel.publication_id.label("publication_id"),
+            cast(null(), Integer).label("comment_id"),
+            CommentModel.username.label("username"),
+            CommentModel.text.label("text"),
+            CommentModel.likes.label("likes"),
+            comment_rank.label("rank"),
+        ).where(comment_matches)
+        
+        reply_hits = select(
+            literal(KIND_REPLY),
+            ReplyModel.id,
+            CommentModel.publication_id,
+            ReplyModel.comment_id,
+            ReplyModel.username,
+            ReplyModel.text,
+            ReplyModel.likes,
+            reply_rank,
+        ).join(
+            CommentModel, ReplyModel.comment_id == CommentModel.id
+        ).where(reply_matches)
+        
+        hits = union_all(comment_hits, reply_hits).subquery()
+        top = select(hits).order_by(hits.c.rank.desc(), hits.c.id.desc()).limit(limit).subquery()
+        
+        highlight = null() if mode == MODE_SUBSTRING else ts_headline(top.c.text, query)
+        stmt = select(top, highlight.label("highlight")).order_by(top.c.rank.desc(), top.c.id.desc())
+        
+        result = await self.session.execute(stmt)
+        rows = []
+        for row in result.mappings().all():
+            row = dict(row)
+            row["rank"] = float(row["rank"] or 0)
+            if mode == MODE_SUBSTRING:
+                row["highlight"] = highlight_substring(row["text"], query)
+            else:
+                row["highlight"] = format_headline(row["highlight"])
+            rows.append(row)
+        return rows
     
     async def count(
         self,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         tags: Optional[List[str]] = None,
+        engagement: Optional[Dict[str, Tuple[Optional[int], Optional[int]]]] = None,
     ) -> int:
         """Conta publicações com filtros."""
-        from sqlalchemy import func
-        
         stmt = select(func.count(PublicationModel.id))
         
-        conditions = []
-        if start_date:
-            conditions.append(PublicationModel.date >= start_date)
-        if end_date:
-            conditions.append(PublicationModel.date <= end_date)
-        if tags:
-            conditions.append(PublicationModel.tags.contains(tags))
-        
+        conditions = publication_conditions(start_date, end_date, tags, engagement)
         if conditions:
             stmt = stmt.where(and_(*conditions))
         
         result = await self.session.execute(stmt)
         return result.scalar() or 0
-
+    
+    async def estimate_count(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        tags: Optional[List[str]] = None,
+        engagement: Optional[Dict[str, Tuple[Optional[int], Optional[int]]]] = None,
+    ) -> Tuple[int, bool]:
+        """
+        Conta publicações com filtros usando a estimativa do planner quando ela
+        passa de EXACT_COUNT_THRESHOLD; abaixo disso (ou fora do Postgres) a
+        contagem é exata. Retorna (total, is_estimate).
+        """
+        stmt = select(PublicationModel.id).where(
+            *publication_conditions(start_date, end_date, tags, engagement)
+        )
+        estimate = await estimate_rows(self.session, stmt)
+        if estimate is not None and estimate > EXACT_COUNT_THRESHOLD:
+            return estimate, True
+        
+        return await self.count(start_date, end_date, tags, engagement), False
+    
+    async def tag_facets(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        tags: Optional[List[str]] = None,
+        engagement: Optional[Dict[str, Tuple[Optional[int], Optional[int]]]] = None,
+        limit: int = 100,
+    ) -> List[Tuple[str, int]]:
+        """
+        Conta as publicações filtradas por tag, em uma única query (uma linha
+        por tag da lista de cada publicação). Retorna (tag, publicações), das
+        tags mais frequentes para as menos frequentes.
+        """
+        values = tag_values(PublicationModel.tags, self.session.get_bind().dialect.name)
+        tag = values.c.value
+        count = func.count(PublicationModel.id.distinct())
+        stmt = select(tag, count).select_from(PublicationModel).join(values, true()).where(
+            tag != "", *publication_conditions(start_date, end_date, tags, engagement)
+        ).group_by(tag).order_by(count.desc(), tag).limit(limit)
+        
+        result = await self.session.execute(stmt)
+        return [(row[0], row[1]) for row in result.all()]
+    
+    async def backfill_engagement_counts(self, after_id: int = 0, limit: int = 1000) -> List[int]:
+        """
+        Recalcula as colunas `<métrica>_count` das próximas `limit` publicações
+        com id maior que `after_id` (não faz commit). Retorna os ids
+        processados, em ordem (vazio se não houver mais publicações).
+        """
+        result = await self.session.execute(
+            select(PublicationModel.id, *(getattr(PublicationModel, metric) for metric in ENGAGEMENT_METRICS))
+            .where(PublicationModel.id > after_id)
+            .order_by(PublicationModel.id)
+            .limit(limit)
+        )
+        rows = result.all()
+        if not rows:
+            return []
+        
+        # UPDATE em lote pela chave primária (executemany)
+        await self.session.execute(
+            update(PublicationModel),
+            [{"id": row.id, **engagement_counts(row)} for row in rows],
+        )
+        return [row.id for row in rows]
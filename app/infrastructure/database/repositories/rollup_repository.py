@@ -0,0 +1,272 @@
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import date, datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, func, cast, DateTime
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.domain.entities.publication import AnalyzedPublication
+from app.domain.value_objects.sentiment import Sentiment
+from app.domain.value_objects.emotion import Emotion
+from app.domain.value_objects.topic import Topic
+from app.infrastructure.database.models import (
+    PublicationModel,
+    CommentModel,
+    ReplyModel,
+    DashboardRollupModel,
+)
+from app.infrastructure.database.repositories.analysis_repository import stored_labels
+
+
+# Tag usada para agregar todas as publicações do dia
+ALL_TAGS = ""
+
+# Dimensões armazenadas
+SENTIMENT = "sentiment"
+EMOTION = "emotion"
+TOPIC = "topic"
+VOLUME = "volume"
+
+# Labels da dimensão de volume
+PUBLICATIONS = "publications"
+COMMENTS = "comments"
+THREATS = "threats"
+
+RollupKey = Tuple[date, str, str, str]
+
+
+def _tag_keys(tags: Optional[Iterable[str]]) -> List[str]:
+    """Tags em que uma publicação é contabilizada (inclui a tag agregada)."""
+    return [ALL_TAGS] + sorted({tag for tag in (tags or []) if tag})
+
+
+def _add_labels(
+    deltas: Counter,
+    day: date,
+    tag_keys: List[str],
+    sentiment: str,
+    emotion: str,
+    topic: str,
+    count: int = 1,
+) -> None:
+    for tag in tag_keys:
+        deltas[(day, tag, SENTIMENT, sentiment)] += count
+        deltas[(day, tag, EMOTION, emotion)] += count
+        deltas[(day, tag, TOPIC, topic)] += count
+        if topic == Topic.AMEACAS_E_RISCOS.value:
+            deltas[(day, tag, VOLUME, THREATS)] += count
+
+
+def publication_rollup_deltas(
+    publication_date: datetime,
+    tags: Optional[Iterable[str]],
+    analyzed: AnalyzedPublication,
+) -> Counter:
+    """
+    Calcula os incrementos dos agregados diários para uma publicação analisada
+    (`analyzed.analyzed_comments` contém comentários e respostas).
+    """
+    deltas = comment_rollup_deltas(publication_date, tags, [
+        (analyzed_comment.sentiment, analyzed_comment.emotion, analyzed_comment.topic)
+        for analyzed_comment in analyzed.analyzed_comments
+    ])
+
+    day = publication_date.date()
+    tag_keys = _tag_keys(tags)
+    for tag in tag_keys:
+        deltas[(day, tag, VOLUME, PUBLICATIONS)] += 1
+    _add_labels(
+        deltas, day, tag_keys,
+        analyzed.main_sentiment.value,
+        analyzed.main_emotion.value,
+        analyzed.main_topic.value,
+    )
+    return deltas
+
+
+def comment_rollup_deltas(
+    publication_date: datetime,
+    tags: Optional[Iterable[str]],
+    labels: List[Tuple[Sentiment, Emotion, Topic]],
+) -> Counter:
+    """
+    Calcula os incrementos dos agregados diários para comentários/respostas de
+    uma publicação, dados os seus labels (ex: novos comentários de uma
+    publicação já agregada).
+    """
+    deltas: Counter = Counter()
+    day = publication_date.date()
+    tag_keys = _tag_keys(tags)
+
+    for sentiment, emotion, topic in labels:
+        _add_labels(deltas, day, tag_keys, sentiment.value, emotion.value, topic.value)
+    if labels:
+        for tag in tag_keys:
+            deltas[(day, tag, VOLUME, COMMENTS)] += len(labels)
+
+    return deltas
+
+
+class RollupRepository:
+    """
+    Repository para os agregados diários do dashboard (`dashboard_rollups`).
+
+    Os agregados cobrem as publicações com labels armazenados e são mantidos
+    incrementalmente sempre que análises são gravadas; `rebuild` recalcula
+    tudo a partir dos labels (backfills).
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def _insert(self):
+        """INSERT com suporte a ON CONFLICT no dialeto da sessão."""
+        dialect = self.session.get_bind().dialect.name
+        if dialect == "sqlite":
+            return sqlite.insert(DashboardRollupModel)
+        return postgresql.insert(DashboardRollupModel)
+
+    async def apply(self, deltas: Dict[RollupKey, int]) -> None:
+        """Soma os incrementos aos agregados (upsert; não faz commit)."""
+        rows = [
+            {"day": day, "tag": tag, "dimension": dimension, "label": label, "count": count}
+            for (day, tag, dimension, label), count in deltas.items()
+            if count
+        ]
+        if not rows:
+            return
+
+        stmt = self._insert()
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["day", "tag", "dimension", "label"],
+            set_={"count": DashboardRollupModel.count + stmt.excluded.count},
+        )
+        await self.session.execute(stmt, rows)
+
+    async def sum(
+        self,
+        tag: str = ALL_TAGS,
+        first_day: Optional[date] = None,
+        last_day: Optional[date] = None,
+    ) -> List[Tuple[str, str, int]]:
+        """Soma os agregados de uma tag no intervalo de dias (inclusivo)."""
+        stmt = select(
+            DashboardRollupModel.dimension,
+            DashboardRollupModel.label,
+            func.sum(DashboardRollupModel.count),
+        ).where(DashboardRollupModel.tag == tag)
+        if first_day:
+            stmt = stmt.where(DashboardRollupModel.day >= first_day)
+        if last_day:
+            stmt = stmt.where(DashboardRollupModel.day <= last_day)
+        stmt = stmt.group_by(DashboardRollupModel.dimension, DashboardRollupModel.label)
+
+        result = await self.session.execute(stmt)
+        return [(dimension, label, int(count or 0)) for dimension, label, count in result.all()]
+
+    async def sum_by_bucket(
+        self,
+        bucket: str,
+        tag: str = ALL_TAGS,
+        first_day: Optional[date] = None,
+        last_day: Optional[date] = None,
+    ) -> List[Tuple[datetime, str, str, int]]:
+        """Soma os agregados de uma tag por intervalo (day, week) no intervalo de dias."""
+        bucket_start = func.date_trunc(
+            bucket, cast(DashboardRollupModel.day, DateTime)
+        ).label("bucket")
+        stmt = select(
+            bucket_start,
+            DashboardRollupModel.dimension,
+            DashboardRollupModel.label,
+            func.sum(DashboardRollupModel.count),
+        ).where(DashboardRollupModel.tag == tag)
+        if first_day:
+            stmt = stmt.where(DashboardRollupModel.day >= first_day)
+        if last_day:
+            stmt = stmt.where(DashboardRollupModel.day <= last_day)
+        stmt = stmt.group_by(
+            bucket_start, DashboardRollupModel.dimension, DashboardRollupModel.label
+        ).order_by(bucket_start)
+
+        result = await self.session.execute(stmt)
+        return [
+            (bucket_value, dimension, label, int(count or 0))
+            for bucket_value, dimension, label, count in result.all()
+        ]
+
+    async def rebuild(self, batch_size: int = 1000) -> int:
+        """
+        Recalcula todos os agregados a partir dos labels armazenados, em lotes de
+        publicações. Executa em uma única transação. Retorna o número de
+        publicações agregadas.
+        """
+        await self.session.execute(delete(DashboardRollupModel))
+
+        total = 0
+        last_id = 0
+        while True:
+            result = await self.session.execute(
+                select(PublicationModel.id, PublicationModel.date, PublicationModel.tags)
+                .where(PublicationModel.id > last_id)
+                .where(PublicationModel.analyses.has())
+                .order_by(PublicationModel.id)
+                .limit(batch_size)
+            )
+            publications = {row[0]: (row[1].date(), _tag_keys(row[2])) for row in result.all()}
+            if not publications:
+                break
+            last_id = max(publications)
+            ids = list(publications)
+
+            deltas: Counter = Counter()
+            for day, tag_keys in publications.values():
+                for tag in tag_keys:
+                    deltas[(day, tag, VOLUME, PUBLICATIONS)] += 1
+
+            # Labels agrupados por publicação
+            labels = stored_labels([PublicationModel.id.in_(ids)])
+            result = await self.session.execute(
+                select(
+                    labels.c.publication_id,
+                    labels.c.sentiment,
+                    labels.c.emotion,
+                    labels.c.topic,
+                    func.count(),
+                ).group_by(
+                    labels.c.publication_id,
+                    labels.c.sentiment,
+                    labels.c.emotion,
+                    labels.c.topic,
+                )
+            )
+            for publication_id, sentiment, emotion, topic, count in result.all():
+                day, tag_keys = publications[publication_id]
+                _add_labels(deltas, day, tag_keys, sentiment, emotion, topic, count)
+
+            # Comentários e respostas analisados por publicação
+            comment_counts = select(
+                CommentModel.publication_id, func.count(CommentModel.id)
+            ).where(
+                CommentModel.publication_id.in_(ids),
+                CommentModel.analyses.has(),
+            ).group_by(CommentModel.publication_id)
+            reply_counts = select(
+                CommentModel.publication_id, func.count(ReplyModel.id)
+            ).join(
+                CommentModel, ReplyModel.comment_id == CommentModel.id
+            ).where(
+                CommentModel.publication_id.in_(ids),
+                ReplyModel.analyses.has(),
+            ).group_by(CommentModel.publication_id)
+            for stmt in (comment_counts, reply_counts):
+                for publication_id, count in (await self.session.execute(stmt)).all():
+                    day, tag_keys = publications[publication_id]
+                    for tag in tag_keys:
+                        deltas[(day, tag, VOLUME, COMMENTS)] += count
+
+            await self.apply(deltas)
+            total += len(publications)
+
+        await self.session.commit()
+        return total
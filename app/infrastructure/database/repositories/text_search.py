@@ -0,0 +1,82 @@
+import html
+import re
+from typing import Optional
+from sqlalchemy import func, literal_column
+
+
+# Configuração de busca textual: português sem acentos (criada na migration add_text_search)
+TS_CONFIG = "portuguese_unaccent"
+
+# Modos de busca
+MODE_AUTO = "auto"
+MODE_FULLTEXT = "fulltext"
+MODE_SUBSTRING = "substring"
+SEARCH_MODES = (MODE_AUTO, MODE_FULLTEXT, MODE_SUBSTRING)
+
+# Tipos de resultado da busca em comentários
+KIND_COMMENT = "comment"
+KIND_REPLY = "reply"
+
+# Destaques são HTML: o texto coletado é escapado e só as marcas são tags.
+# O ts_headline marca os termos com sentinelas (caracteres de controle STX/ETX),
+# trocadas por <mark> depois do escape, em Python
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_STOP = "</mark>"
+HEADLINE_START = "\x02"
+HEADLINE_STOP = "\x03"
+HEADLINE_OPTIONS = (
+    f"StartSel={HEADLINE_START}, StopSel={HEADLINE_STOP}, "
+    "MaxWords=35, MinWords=15, MaxFragments=2"
+)
+
+# Colunas tsvector geradas (GENERATED ALWAYS ... STORED) existentes apenas no
+# Postgres; não fazem parte dos models para não serem lidas nem escritas pelo ORM
+PUBLICATIONS_SEARCH_VECTOR = literal_column("publications.search_vector")
+COMMENTS_SEARCH_VECTOR = literal_column("comments.search_vector")
+REPLIES_SEARCH_VECTOR = literal_column("replies.search_vector")
+
+
+def ts_query(query: str):
+    """Consulta em sintaxe de busca web ("frase", -exclusão, or) na configuração em português."""
+    return func.websearch_to_tsquery(TS_CONFIG, query)
+
+
+def ts_rank(search_vector, query: str):
+    """Relevância da linha (cover density, normalizada pelo tamanho do documento)."""
+    return func.ts_rank_cd(search_vector, ts_query(query), 32)
+
+
+def ts_headline(column, query: str):
+    """Trechos do texto com os termos encontrados entre sentinelas (ver `format_headline`)."""
+    return func.ts_headline(TS_CONFIG, column, ts_query(query), HEADLINE_OPTIONS)
+
+
+def format_headline(headline: Optional[str]) -> Optional[str]:
+    """Resultado de `ts_headline` como HTML: texto escapado, termos entre <mark>."""
+    if not headline:
+        return headline
+    return (
+        html.escape(headline)
+        .replace(HEADLINE_START, HIGHLIGHT_START)
+        .replace(HEADLINE_STOP, HIGHLIGHT_STOP)
+    )
+
+
+def substring_pattern(query: str) -> str:
+    """Padrão ILIKE para busca por substring (atendida pelos índices pg_trgm)."""
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def highlight_substring(text: Optional[str], query: str) -> Optional[str]:
+    """Destaca as ocorrências de `query` em `text` (busca por substring), como HTML escapado."""
+    if not text:
+        return text
+    parts = []
+    position = 0
+    for match in re.finditer(re.escape(query), text, flags=re.IGNORECASE):
+        parts.append(html.escape(text[position:match.start()]))
+        parts.append(f"{HIGHLIGHT_START}{html.escape(match.group(0))}{HIGHLIGHT_STOP}")
+        position = match.end()
+    parts.append(html.escape(text[position:]))
+    return "".join(parts)
@@ -0,0 +1,94 @@
+import asyncio
+import os
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+from app.core.config import settings
+from app.infrastructure.detection.executor import InferenceExecutor, detection_executor
+
+
+# Executa um lote: recebe os itens e retorna, na mesma ordem, o resultado ou a exceção de cada um
+BatchFunction = Callable[[List[Any]], List[Any]]
+
+
+def batch_size() -> int:
+    """Imagens por lote de inferência (OBJECT_DETECTOR_BATCH_SIZE; 0 = número de CPUs)."""
+    return settings.OBJECT_DETECTOR_BATCH_SIZE or os.cpu_count() or 1
+
+
+class MicroBatcher:
+    """
+    Agrupa chamadas concorrentes em lotes executados por uma única tarefa do
+    executor de detecção.
+
+    O primeiro item abre uma janela de `window` segundos; o lote é enviado
+    quando a janela fecha ou quando atinge `max_batch_size` itens. Itens de
+    funções de lote diferentes (ex: services com outros modelos) não são
+    misturados. Com `window` 0, cada chamada é executada sozinha.
+    """
+
+    def __init__(
+        self,
+        executor: InferenceExecutor = detection_executor,
+        max_batch_size: int = 0,
+        window: float = settings.OBJECT_DETECTOR_BATCH_WINDOW_MS / 1000,
+    ):
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.window = window
+        self._pending: Dict[BatchFunction, List[Tuple[Any, asyncio.Future]]] = {}
+        self._timers: Dict[BatchFunction, asyncio.TimerHandle] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, run_batch: BatchFunction, item: Any) -> Any:
+        """
+        Executa `item` no próximo lote de `run_batch` e retorna o seu resultado
+        (levanta a exceção do item, ou ExecutorOverloaded se a fila estiver cheia).
+        """
+        if self.window <= 0:
+            result = (await self.executor.run(run_batch, [item]))[0]
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.setdefault(run_batch, [])
+        pending.append((item, future))
+
+        if len(pending) >= (self.max_batch_size or batch_size()):
+            self._flush(run_batch)
+        elif run_batch not in self._timers:
+            self._timers[run_batch] = loop.call_later(self.window, self._flush, run_batch)
+        return await future
+
+    def _flush(self, run_batch: BatchFunction) -> None:
+        timer = self._timers.pop(run_batch, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(run_batch, [])
+        if not batch:
+            return
+        task = asyncio.ensure_future(self._run(run_batch, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, run_batch: BatchFunction, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        try:
+            results = await self.executor.run(run_batch, [item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if future.done():  # requisição cancelada
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+# Instância global
+detection_batcher = MicroBatcher()
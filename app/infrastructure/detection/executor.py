@@ -0,0 +1,194 @@
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, Optional
+
+from app.core.config import settings
+
+
+class ExecutorOverloaded(Exception):
+    """Fila do executor de inferência cheia; `retry_after` estima a espera em segundos."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Fila de inferência cheia, tente novamente em {retry_after}s")
+        self.retry_after = retry_after
+
+
+# Tarefa do executor em andamento na thread atual (ver `waiting`)
+_current = threading.local()
+
+
+@contextmanager
+def waiting() -> Iterator[None]:
+    """
+    Marca uma espera por recurso compartilhado (o lock de um modelo) dentro de
+    uma tarefa do executor: a tarefa sai de `running` e o tempo conta como
+    espera na fila, não como inferência. Fora do executor não faz nada.
+    """
+    executor = getattr(_current, "executor", None)
+    if executor is None:
+        yield
+        return
+    started = time.perf_counter()
+    with executor._lock:
+        executor._running -= 1
+    try:
+        yield
+    finally:
+        _current.waited += time.perf_counter() - started
+        with executor._lock:
+            executor._running += 1
+
+
+class _Timings:
+    """Contagem, média, máximo e percentis (janela recente) de durações em segundos."""
+
+    def __init__(self, window: int = 1000):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent: Deque[float] = deque(maxlen=window)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+    def average(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        if not self.recent:
+            return 0.0
+        values = sorted(self.recent)
+        return values[min(len(values) - 1, int(fraction * len(values)))]
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "avg": round(self.average(), 4),
+            "p50": round(self.percentile(0.5), 4),
+            "p95": round(self.percentile(0.95), 4),
+            "max": round(self.max, 4),
+        }
+
+
+class InferenceExecutor:
+    """
+    Executor limitado para a detecção de objetos fora do event loop.
+
+    No máximo `max_concurrency` tarefas rodam ao mesmo tempo, em um pool de
+    threads; até `max_queue` aguardam a vez. Acima disso a chamada é recusada
+    com ExecutorOverloaded, em vez de acumular requisições e conexões abertas.
+    
+    Cada conjunto de modelos é um detector compartilhado (ModelRegistry) que
+    atende uma inferência por vez: com um único conjunto, aumentar
+    `max_concurrency` só paraleliza o trabalho fora da inferência (leitura e
+    anotação das imagens). O tempo à espera do modelo (`waiting`) é
+    registrado como espera na fila, não como inferência.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = settings.OBJECT_DETECTOR_MAX_CONCURRENCY,
+        max_queue: int = settings.OBJECT_DETECTOR_MAX_QUEUE,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._rejected = 0
+        self._failed = 0
+        self.queue_wait = _Timings()
+        self.inference = _Timings()
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_concurrency,
+                thread_name_prefix="detection",
+            )
+        return self._pool
+
+    def _retry_after(self) -> int:
+        """Segundos estimados até uma vaga: fila atual x tempo médio de inferência."""
+        average = self.inference.average() or 1.0
+        waiting = self._pending - self._running
+        return max(1, math.ceil(average * (waiting + 1) / self.max_concurrency))
+
+    def _release(self, future: Future) -> None:
+        # Chamado também quando a tarefa é cancelada antes de iniciar (cliente desconectou)
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Executa `fn(*args, **kwargs)` no pool sem bloquear o event loop.
+        Levanta ExecutorOverloaded se a fila estiver cheia.
+        """
+        with self._lock:
+            if self._pending >= self.max_concurrency + self.max_queue:
+                self._rejected += 1
+                raise ExecutorOverloaded(self._retry_after())
+            self._pending += 1
+
+        submitted = time.perf_counter()
+
+        def task() -> Any:
+            started = time.perf_counter()
+            with self._lock:
+                self._running += 1
+            _current.executor, _current.waited = self, 0.0
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                with self._lock:
+                    self._failed += 1
+                raise
+            finally:
+                waited = _current.waited
+                _current.executor = None
+                with self._lock:
+                    self._running -= 1
+                    self.queue_wait.add(started - submitted + waited)
+                    self.inference.add(time.perf_counter() - started - waited)
+
+        try:
+            future = self._get_pool().submit(task)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Ocupação, rejeições e tempos (segundos) de fila e de inferência."""
+        with self._lock:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queued": self._pending - self._running,
+                "rejected": self._rejected,
+                "failed": self._failed,
+                "queue_wait": self.queue_wait.to_dict(),
+                "inference": self.inference.to_dict(),
+            }
+
+    def shutdown(self) -> None:
+        """Encerra o pool (chamado no shutdown da aplicação)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# Instância global
+detection_executor = InferenceExecutor()
@@ -0,0 +1,164 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Sequence, Tuple
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # dependência opcional, necessária apenas para Parquet
+    pyarrow = None
+
+
+# Formatos de exportação
+FORMAT_NDJSON = "ndjson"
+FORMAT_CSV = "csv"
+FORMAT_PARQUET = "parquet"
+EXPORT_FORMATS = (FORMAT_NDJSON, FORMAT_CSV, FORMAT_PARQUET)
+
+MEDIA_TYPES = {
+    FORMAT_NDJSON: "application/x-ndjson",
+    FORMAT_CSV: "text/csv; charset=utf-8",
+    FORMAT_PARQUET: "application/vnd.apache.parquet",
+}
+
+# Colunas exportadas: (nome, tipo Python do valor: int, str, datetime ou list de str)
+Columns = Sequence[Tuple[str, type]]
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Tipo não serializável: {type(value).__name__}")
+
+
+class NDJSONWriter:
+    """Um objeto JSON por linha."""
+
+    def __init__(self, columns: Columns):
+        self.names = [name for name, _ in columns]
+
+    def open(self) -> bytes:
+        return b""
+
+    def write(self, rows: List[Dict[str, Any]]) -> bytes:
+        return "".join(
+            json.dumps({name: row[name] for name in self.names}, ensure_ascii=False, default=_json_default)
+            + "\n"
+            for row in rows
+        ).encode("utf-8")
+
+    def close(self) -> bytes:
+        return b""
+
+
+class CSVWriter:
+    """CSV com cabeçalho; listas (tags) são gravadas como JSON."""
+
+    def __init__(self, columns: Columns):
+        self.columns = list(columns)
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer)
+
+    def _drain(self) -> bytes:
+        data = self.buffer.getvalue().encode("utf-8")
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return data
+
+    def open(self) -> bytes:
+        self.writer.writerow([name for name, _ in self.columns])
+        return self._drain()
+
+    def write(self, rows: List[Dict[str, Any]]) -> bytes:
+        for row in rows:
+            self.writer.writerow([self._cell(row[name], kind) for name, kind in self.columns])
+        return self._drain()
+
+    @staticmethod
+    def _cell(value: Any, kind: type) -> Any:
+        if value is None:
+            return ""
+        if kind is datetime:
+            return value.isoformat()
+        if kind is list:
+            return json.dumps(value, ensure_ascii=False)
+        return value
+
+    def close(self) -> bytes:
+        return b""
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    Destino do ParquetWriter que acumula os bytes escritos até serem drenados,
+    mantendo a posição absoluta (usada pelo rodapé do Parquet).
+    """
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+class ParquetWriter:
+    """Parquet com um row group por lote; requer o pacote pyarrow."""
+
+    def __init__(self, columns: Columns):
+        if pyarrow is None:
+            raise RuntimeError("A exportação em Parquet requer o pacote pyarrow")
+        types = {
+            int: pyarrow.int64(),
+            str: pyarrow.string(),
+            datetime: pyarrow.timestamp("us"),
+            list: pyarrow.list_(pyarrow.string()),
+        }
+        self.schema = pyarrow.schema([(name, types[kind]) for name, kind in columns])
+        self.sink = _ChunkSink()
+        self.writer = None
+
+    def open(self) -> bytes:
+        self.writer = pyarrow.parquet.ParquetWriter(self.sink, self.schema, compression="zstd")
+        return self.sink.drain()
+
+    def write(self, rows: List[Dict[str, Any]]) -> bytes:
+        if rows:
+            self.writer.write_table(pyarrow.Table.from_pylist(rows, schema=self.schema))
+        return self.sink.drain()
+
+    def close(self) -> bytes:
+        self.writer.close()
+        return self.sink.drain()
+
+
+_WRITERS = {
+    FORMAT_NDJSON: NDJSONWriter,
+    FORMAT_CSV: CSVWriter,
+    FORMAT_PARQUET: ParquetWriter,
+}
+
+
+def create_writer(format: str, columns: Columns):
+    """
+    Writer do formato: `open()` retorna o início do arquivo, `write(rows)` os
+    bytes de um lote e `close()` o final. Levanta RuntimeError se o formato
+    depender de um pacote não instalado.
+    """
+    return _WRITERS[format](columns)
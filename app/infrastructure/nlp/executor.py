@@ -0,0 +1,129 @@
+import asyncio
+import multiprocessing
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from app.core.config import settings
+from app.infrastructure.nlp.keyword_matcher import (
+    KeywordMatcher,
+    Labels,
+    get_keyword_matcher,
+    reload_keyword_matcher,
+)
+
+
+def _classify_texts(texts: List[str]) -> List[Labels]:
+    """Classifica um lote de textos com o matcher instalado no worker de processo."""
+    return get_keyword_matcher().match_batch(texts)
+
+
+class NLPExecutor:
+    """
+    Executor limitado para a classificação de textos fora do event loop.
+
+    Lotes pequenos vão para um pool de threads (sem custo de serialização);
+    lotes a partir de `process_batch_threshold` textos vão para um pool de
+    processos, onde não disputam o GIL com o servidor. No máximo
+    `max_concurrency` lotes são processados ao mesmo tempo por event loop
+    (API e worker Celery têm loops próprios); os demais aguardam.
+
+    Os workers de processo recebem o matcher compilado na inicialização; se o
+    matcher muda (`reload_keyword_matcher`), o pool é recriado com o novo.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = settings.NLP_MAX_CONCURRENCY,
+        thread_workers: int = settings.NLP_THREAD_WORKERS,
+        process_workers: int = settings.NLP_PROCESS_WORKERS,
+        process_batch_threshold: int = settings.NLP_PROCESS_BATCH_THRESHOLD,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.thread_workers = max(1, thread_workers)
+        self.process_workers = max(0, process_workers)
+        self.process_batch_threshold = process_batch_threshold
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._process_fingerprint: Optional[str] = None
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Semáforo do event loop corrente (um semáforo não pode ser compartilhado entre loops)."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+            return semaphore
+
+    def _get_process_pool(self, matcher: KeywordMatcher) -> ProcessPoolExecutor:
+        """Pool de processos com `matcher` instalado nos workers (criado sob demanda)."""
+        with self._lock:
+            if self._process_pool is not None and self._process_fingerprint != matcher.fingerprint:
+                # Lotes em andamento terminam com o matcher antigo
+                self._process_pool.shutdown(wait=False)
+                self._process_pool = None
+            if self._process_pool is None:
+                # spawn: fork de um processo com event loop e threads não é seguro
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.process_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=reload_keyword_matcher,
+                    initargs=(matcher,),
+                )
+                self._process_fingerprint = matcher.fingerprint
+            return self._process_pool
+
+    def _get_thread_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(
+                    max_workers=self.thread_workers,
+                    thread_name_prefix="nlp",
+                )
+            return self._thread_pool
+
+    async def classify(
+        self,
+        texts: List[str],
+        matcher: Optional[KeywordMatcher] = None,
+    ) -> List[Labels]:
+        """
+        Classifica textos sem bloquear o event loop, com `matcher` (por padrão o
+        matcher atual). Lotes a partir de `process_batch_threshold` textos vão
+        para o pool de processos.
+        """
+        if not texts:
+            return []
+        matcher = matcher or get_keyword_matcher()
+
+        async with self._get_semaphore():
+            loop = asyncio.get_running_loop()
+            if self.process_workers and len(texts) >= self.process_batch_threshold:
+                pool = self._get_process_pool(matcher)
+                classify: Callable[[List[str]], List[Labels]] = _classify_texts
+            else:
+                pool = self._get_thread_pool()
+                classify = matcher.match_batch
+            return await loop.run_in_executor(pool, classify, texts)
+
+    def shutdown(self) -> None:
+        """Encerra os pools (chamado no shutdown da aplicação)."""
+        with self._lock:
+            if self._thread_pool is not None:
+                self._thread_pool.shutdown(wait=False, cancel_futures=True)
+                self._thread_pool = None
+            if self._process_pool is not None:
+                self._process_pool.shutdown(wait=False, cancel_futures=True)
+                self._process_pool = None
+                self._process_fingerprint = None
+            self._semaphores.clear()
+
+
+# Instância global
+nlp_executor = NLPExecutor()
@@ -0,0 +1,171 @@
+import hashlib
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.domain.value_objects.sentiment import Sentiment
+from app.domain.value_objects.emotion import Emotion
+from app.domain.value_objects.topic import Topic
+from app.infrastructure.nlp.sentiment_analyzer import SentimentAnalyzer
+from app.infrastructure.nlp.emotion_classifier import EmotionClassifier
+from app.infrastructure.nlp.topic_classifier import TopicClassifier
+
+
+# Índices das dimensões no resultado do matcher
+SENTIMENT, EMOTION, TOPIC = 0, 1, 2
+
+# Rank usado quando nenhuma keyword da dimensão foi encontrada
+_NO_MATCH = 1 << 30
+
+Labels = Tuple[Sentiment, Emotion, Topic]
+
+
+class KeywordMatcher:
+    """
+    Matcher multi-padrão (Aho-Corasick) compartilhado pelos três classificadores.
+
+    O autômato é compilado uma única vez a partir das listas de keywords de
+    `SentimentAnalyzer`, `EmotionClassifier` e `TopicClassifier`. Cada texto é
+    percorrido uma única vez e o resultado é a tripla (sentimento, emoção, tópico),
+    respeitando as mesmas prioridades dos classificadores:
+
+    - sentimento: negativo antes de positivo
+    - emoção: ordem do dicionário `EMOTION_KEYWORDS`
+    - tópico: `TopicClassifier.PRIORITY_ORDER`
+    """
+
+    def __init__(
+        self,
+        negative_keywords: Sequence[str] = SentimentAnalyzer.NEGATIVE_KEYWORDS,
+        positive_keywords: Sequence[str] = SentimentAnalyzer.POSITIVE_KEYWORDS,
+        emotion_keywords: Dict[Emotion, List[str]] = EmotionClassifier.EMOTION_KEYWORDS,
+        topic_keywords: Dict[Topic, List[str]] = TopicClassifier.TOPIC_KEYWORDS,
+        topic_priority: Sequence[Topic] = TopicClassifier.PRIORITY_ORDER,
+    ):
+        # Labels por dimensão, indexados pelo rank de prioridade (menor vence)
+        self._labels: Tuple[list, list, list] = (
+            [Sentiment.NEGATIVO, Sentiment.POSITIVO],
+            list(emotion_keywords.keys()),
+            list(topic_priority),
+        )
+        self._defaults: Labels = (Sentiment.NEUTRO, Emotion.GERAL, Topic.GERAL)
+
+        patterns: List[Tuple[str, int, int]] = []
+        patterns += [(kw, SENTIMENT, 0) for kw in negative_keywords]
+        patterns += [(kw, SENTIMENT, 1) for kw in positive_keywords]
+        for rank, emotion in enumerate(self._labels[EMOTION]):
+            patterns += [(kw, EMOTION, rank) for kw in emotion_keywords[emotion]]
+        for rank, topic in enumerate(self._labels[TOPIC]):
+            patterns += [(kw, TOPIC, rank) for kw in topic_keywords.get(topic, [])]
+
+        # Identifica as listas de keywords/prioridades usadas na compilação
+        self.fingerprint = hashlib.sha1(
+            repr((patterns, self._labels)).encode("utf-8")
+        ).hexdigest()
+
+        self._build(patterns)
+
+    def _build(self, patterns: List[Tuple[str, int, int]]) -> None:
+        """Compila o autômato (trie + links de falha) em uma tabela de transições."""
+        goto: List[Dict[str, int]] = [{}]
+        # Melhor rank por dimensão para cada estado (None = sem saída)
+        ranks: List[Optional[List[int]]] = [None]
+
+        for keyword, dimension, rank in patterns:
+            # Keywords vazias casariam com qualquer texto; os classificadores
+            # originais não possuem nenhuma, então são ignoradas
+            if not keyword:
+                continue
+            state = 0
+            for char in keyword:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    ranks.append(None)
+                state = next_state
+            if ranks[state] is None:
+                ranks[state] = [_NO_MATCH, _NO_MATCH, _NO_MATCH]
+            ranks[state][dimension] = min(ranks[state][dimension], rank)
+
+        # BFS: calcula links de falha, propaga saídas e transforma o trie em DFA,
+        # de modo que a varredura faça exatamente uma transição por caractere
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])]
+        delta.extend({} for _ in range(len(goto) - 1))
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            fallback = fail[state]
+            if ranks[fallback] is not None:
+                if ranks[state] is None:
+                    ranks[state] = list(ranks[fallback])
+                else:
+                    ranks[state] = [min(a, b) for a, b in zip(ranks[state], ranks[fallback])]
+            transitions = dict(delta[fallback])
+            for char, child in goto[state].items():
+                fail[child] = delta[fallback].get(char, 0)
+                transitions[char] = child
+                queue.append(child)
+            delta[state] = transitions
+
+        self._delta = delta
+        self._outputs: List[Optional[Tuple[int, int, int]]] = [
+            tuple(r) if r is not None else None for r in ranks
+        ]
+
+    def match(self, text: str) -> Labels:
+        """Classifica um texto em uma única varredura."""
+        if not text:
+            return self._defaults
+
+        delta = self._delta
+        outputs = self._outputs
+        best_sentiment = best_emotion = best_topic = _NO_MATCH
+        state = 0
+        for char in text.lower():
+            state = delta[state].get(char, 0)
+            output = outputs[state]
+            if output is not None:
+                s, e, t = output
+                if s < best_sentiment:
+                    best_sentiment = s
+                if e < best_emotion:
+                    best_emotion = e
+                if t < best_topic:
+                    best_topic = t
+
+        labels = self._labels
+        defaults = self._defaults
+        return (
+            labels[SENTIMENT][best_sentiment] if best_sentiment != _NO_MATCH else defaults[SENTIMENT],
+            labels[EMOTION][best_emotion] if best_emotion != _NO_MATCH else defaults[EMOTION],
+            labels[TOPIC][best_topic] if best_topic != _NO_MATCH else defaults[TOPIC],
+        )
+
+    def match_batch(self, texts: List[str]) -> List[Labels]:
+        """Classifica múltiplos textos."""
+        return [self.match(text) for text in texts]
+
+
+# Instância compartilhada (o autômato é imutável após a compilação)
+_keyword_matcher: Optional[KeywordMatcher] = None
+
+
+def get_keyword_matcher() -> KeywordMatcher:
+    """Retorna o matcher compilado a partir das keywords dos classificadores."""
+    global _keyword_matcher
+    if _keyword_matcher is None:
+        _keyword_matcher = KeywordMatcher()
+    return _keyword_matcher
+
+
+def reload_keyword_matcher(matcher: Optional[KeywordMatcher] = None) -> KeywordMatcher:
+    """
+    Recompila o matcher após alterações nas listas de keywords (ou instala
+    `matcher`, já compilado, como nos workers do pool de processos). O novo
+    fingerprint invalida o cache de classificação.
+    """
+    global _keyword_matcher
+    _keyword_matcher = matcher if matcher is not None else KeywordMatcher()
+    return _keyword_matcher
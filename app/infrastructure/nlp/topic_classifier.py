@@ -33,6 +33,16 @@ class TopicClassifier:
         ],
     }
     
+    # Ordem de prioridade (mais específico primeiro)
+    PRIORITY_ORDER: List[Topic] = [
+        Topic.AMEACAS_E_RISCOS,
+        Topic.SEGURANCA_POLICIAL,
+        Topic.RIVALIDADE_ESPORTIVA,
+        Topic.POLITICA_E_GESTAO,
+        Topic.ORGANIZACAO_E_EVENTOS,
+        Topic.APOIO_E_UNIAO,
+    ]
+    
     def classify(self, text: str) -> Topic:
         """Classifica o tópico de um texto."""
         if not text:
@@ -41,16 +51,7 @@ class TopicClassifier:
         lower_text = text.lower()
         
         # Verifica em ordem de prioridade (mais específico primeiro)
-        priority_order = [
-            Topic.AMEACAS_E_RISCOS,
-            Topic.SEGURANCA_POLICIAL,
-            Topic.RIVALIDADE_ESPORTIVA,
-            Topic.POLITICA_E_GESTAO,
-            Topic.ORGANIZACAO_E_EVENTOS,
-            Topic.APOIO_E_UNIAO,
-        ]
-        
-        for topic in priority_order:
+        for topic in self.PRIORITY_ORDER:
             for keyword in self.TOPIC_KEYWORDS.get(topic, []):
                 if keyword in lower_text:
                     return topic
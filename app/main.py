@@ -1,13 +1,26 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
-from app.api.v1.routes import publications, dashboard, analysis, auth, object_detector
+from app.api.v1.routes import publications, dashboard, analysis, auth, object_detector, export
+from app.infrastructure.nlp.executor import nlp_executor
+from app.infrastructure.detection.executor import detection_executor
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Encerra os pools dos executores de NLP e de detecção
+    nlp_executor.shutdown()
+    detection_executor.shutdown()
+
 
 app = FastAPI(
     title="Scrapping Backend API",
     description="API para análise de sentimento e tópicos em publicações",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # CORS
@@ -24,6 +37,7 @@ app.include_router(auth.router, prefix=settings.API_V1_PREFIX, tags=["auth"])
 app.include_router(publications.router, prefix=settings.API_V1_PREFIX, tags=["publications"])
 app.include_router(dashboard.router, prefix=settings.API_V1_PREFIX, tags=["dashboard"])
 app.include_router(analysis.router, prefix=settings.API_V1_PREFIX, tags=["analysis"])
+app.include_router(export.router, prefix=settings.API_V1_PREFIX, tags=["export"])
 app.include_router(object_detector.router, prefix=settings.API_V1_PREFIX, tags=["object-detector"])
 
 
@@ -0,0 +1,39 @@
+from celery import Celery
+from celery.signals import worker_process_init
+
+from app.core.config import settings
+from app.infrastructure.nlp.executor import nlp_executor
+
+
+celery_app = Celery(
+    "scrapping_backend",
+    broker=settings.CELERY_BROKER_URL,
+    backend=settings.CELERY_RESULT_BACKEND,
+    include=["app.worker.tasks", "app.worker.detection_tasks"],
+)
+celery_app.conf.update(
+    task_serializer="json",
+    accept_content=["json"],
+    result_serializer="json",
+    timezone="UTC",
+    enable_utc=True,
+    # Confirma a mensagem só após a execução: tarefas de um worker que caiu são
+    # reentregues (as escritas são idempotentes)
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_prefetch_multiplier=1,
+    # Resultados não são consultados; as tarefas gravam direto no banco
+    task_ignore_result=True,
+    # Detecções (YOLO) em uma fila própria, consumida por workers dedicados:
+    # celery -A app.worker.celery_app worker -Q object_detector
+    task_routes={"object_detector.*": {"queue": "object_detector"}},
+    task_always_eager=settings.CELERY_TASK_ALWAYS_EAGER,
+    task_eager_propagates=True,
+)
+
+
+@worker_process_init.connect
+def _init_worker_process(**kwargs) -> None:
+    # Processos do pool prefork são daemon e não podem criar processos filhos:
+    # a classificação roda no pool de threads do executor de NLP
+    nlp_executor.process_workers = 0
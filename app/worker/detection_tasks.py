@@ -0,0 +1,46 @@
+import asyncio
+import logging
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.worker.celery_app import celery_app
+from app.worker.tasks import get_session_factory, run_async
+
+
+logger = logging.getLogger(__name__)
+
+
+async def _detect(job_id: str) -> None:
+    # Import tardio: apenas workers que executam detecções carregam o YOLO
+    from app.application.services.detection_job_service import DetectionJobService
+    
+    async with get_session_factory()() as session:
+        await DetectionJobService(session).run(job_id)
+
+
+@celery_app.task(
+    name="object_detector.detect",
+    bind=True,
+    # Erros da inferência são gravados na detecção (status failed); apenas
+    # falhas do banco são refeitas
+    autoretry_for=(SQLAlchemyError,),
+    retry_backoff=True,
+    retry_backoff_max=60,
+    max_retries=3,
+)
+def detect(self, job_id: str) -> None:
+    """Executa a detecção de objetos `job_id` (ver `DetectionJobService.run`)."""
+    run_async(_detect(job_id))
+
+
+async def enqueue_detection(job_id: str) -> bool:
+    """
+    Enfileira a detecção (a tarefa Celery usa o mesmo id). Retorna se o
+    enfileiramento foi concluído.
+    """
+    try:
+        await asyncio.to_thread(detect.apply_async, args=[job_id], task_id=job_id)
+        return True
+    except Exception as e:
+        logger.warning("Erro ao enfileirar detecção %s: %s", job_id, e)
+        return False
@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import threading
+from typing import List, Optional, Sequence
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.worker.celery_app import celery_app
+from app.application.services.analysis_service import AnalysisService
+from app.infrastructure.cache.dashboard_cache import DashboardCache
+from app.infrastructure.cache.redis_client import RedisCache
+from app.infrastructure.database.repositories.analysis_repository import AnalysisRepository
+
+
+logger = logging.getLogger(__name__)
+
+# Sessões usadas pelas tarefas (criadas sob demanda); pode ser substituído,
+# ex: testes com CELERY_TASK_ALWAYS_EAGER apontando para o banco de teste
+session_factory: Optional[async_sessionmaker] = None
+
+_local = threading.local()
+
+
+def get_session_factory() -> async_sessionmaker:
+    """Fábrica de sessões das tarefas (engine próprio do worker)."""
+    global session_factory
+    if session_factory is None:
+        # NullPool: conexões asyncpg pertencem a um event loop e não são reaproveitadas
+        engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    return session_factory
+
+
+def run_async(coro):
+    """
+    Executa a coroutine no event loop da thread, reaproveitado entre tarefas
+    (o executor de NLP e os clientes globais ficam presos ao primeiro loop).
+    """
+    loop = getattr(_local, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = _local.loop = asyncio.new_event_loop()
+    return loop.run_until_complete(coro)
+
+
+def _chunks(ids: Sequence[int], size: int) -> List[List[int]]:
+    size = max(1, size)
+    return [list(ids[start:start + size]) for start in range(0, len(ids), size)]
+
+
+async def _analyze_publications(publication_ids: List[int]) -> int:
+    # Cliente Redis próprio: o global pode pertencer ao event loop da API (modo eager)
+    cache = DashboardCache(RedisCache())
+    try:
+        async with get_session_factory()() as session:
+            service = AnalysisService(session, cache=cache)
+            return await service.analyze_pending(publication_ids)
+    finally:
+        await cache.redis_cache.disconnect()
+
+
+async def _pending_ids(batch_size: int) -> List[int]:
+    ids: List[int] = []
+    async with get_session_factory()() as session:
+        repository = AnalysisRepository(session)
+        while True:
+            page = await repository.list_pending_ids(
+                after_id=ids[-1] if ids else 0, limit=batch_size
+            )
+            if not page:
+                break
+            ids.extend(page)
+    return ids
+
+
+@celery_app.task(
+    name="analysis.analyze_publications",
+    bind=True,
+    # Falhas transitórias (banco, rede) e corridas entre tarefas da mesma
+    # publicação (IntegrityError) são refeitas: a nova execução ignora o que
+    # já foi gravado
+    autoretry_for=(SQLAlchemyError, OSError),
+    retry_backoff=True,
+    retry_backoff_max=300,
+    retry_jitter=True,
+    max_retries=5,
+)
+def analyze_publications(self, publication_ids: List[int]) -> int:
+    """
+    Classifica e grava os labels pendentes das publicações informadas (ver
+    `AnalysisService.analyze_pending`). Retorna o número de publicações alteradas.
+    """
+    return run_async(_analyze_publications(publication_ids))
+
+
+@celery_app.task(name="analysis.enqueue_pending")
+def enqueue_pending(batch_size: int = 1000) -> int:
+    """
+    Enfileira a análise de todas as publicações com labels pendentes (ex:
+    enfileiramento que falhou na ingestão, dados carregados por script).
+    Retorna o número de publicações enfileiradas.
+    """
+    ids = run_async(_pending_ids(batch_size))
+    enqueue(ids)
+    return len(ids)
+
+
+def enqueue(publication_ids: Sequence[int]) -> int:
+    """
+    Enfileira a análise das publicações em tarefas de até
+    ANALYSIS_TASK_CHUNK_SIZE publicações. Retorna o número de tarefas.
+    """
+    chunks = _chunks(publication_ids, settings.ANALYSIS_TASK_CHUNK_SIZE)
+    for chunk in chunks:
+        analyze_publications.delay(chunk)
+    return len(chunks)
+
+
+async def enqueue_analysis(publication_ids: Sequence[int]) -> bool:
+    """
+    Enfileira a análise a partir do event loop (a publicação no broker, ou a
+    execução no modo eager, roda em uma thread). Falhas não propagam: os dados
+    já foram gravados e os labels pendentes são recuperados por
+    `enqueue_pending`. Retorna se o enfileiramento foi concluído.
+    """
+    if not publication_ids:
+        return True
+    try:
+        await asyncio.to_thread(enqueue, list(publication_ids))
+        return True
+    except Exception as e:
+        logger.warning("Erro ao enfileirar análise de publicações: %s", e)
+        return False
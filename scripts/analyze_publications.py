@@ -0,0 +1,32 @@
+"""
+Script para analisar e armazenar os labels de NLP de publicações ainda não analisadas.
+Uso: uv run python scripts/analyze_publications.py [tamanho_do_lote] [--enqueue]
+
+Com --enqueue, a análise de todas as publicações com labels pendentes (inclusive
+comentários/respostas novos de publicações já analisadas) é enfileirada para o
+worker Celery em vez de executada pelo script.
+"""
+import asyncio
+import sys
+
+from app.infrastructure.database.session import AsyncSessionLocal
+from app.application.services.analysis_service import AnalysisService
+from app.worker.tasks import enqueue_pending
+
+
+async def analyze_publications(batch_size: int = 100):
+    """Armazena os labels de todas as publicações sem análise."""
+    async with AsyncSessionLocal() as session:
+        service = AnalysisService(session)
+        total = await service.backfill_analyses(batch_size=batch_size)
+        print(f"Análise concluída! {total} publicações analisadas.")
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if arg != "--enqueue"]
+    batch_size = int(args[0]) if args else 100
+    if "--enqueue" in sys.argv[1:]:
+        enqueue_pending.delay()
+        print("Análise das publicações pendentes enfileirada.")
+    else:
+        asyncio.run(analyze_publications(batch_size))
@@ -0,0 +1,23 @@
+"""
+Script para preencher as contagens numéricas de engajamento (views_count,
+likes_count, shares_count, bookmarks_count) a partir dos valores exibidos.
+Uso: uv run python scripts/backfill_engagement.py [tamanho_do_lote]
+"""
+import asyncio
+import sys
+
+from app.infrastructure.database.session import AsyncSessionLocal
+from app.application.services.publication_service import PublicationService
+
+
+async def backfill_engagement(batch_size: int = 1000):
+    """Recalcula as contagens de engajamento de todas as publicações."""
+    async with AsyncSessionLocal() as session:
+        service = PublicationService(session)
+        total = await service.backfill_engagement(batch_size=batch_size)
+        print(f"Backfill concluído! {total} publicações atualizadas.")
+
+
+if __name__ == "__main__":
+    batch_size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    asyncio.run(backfill_engagement(batch_size))
@@ -22,6 +22,8 @@ CREATE TABLE IF NOT EXISTS publications (
 CREATE INDEX IF NOT EXISTS ix_publications_id ON publications(id);
 CREATE UNIQUE INDEX IF NOT EXISTS ix_publications_publicacao_n ON publications(publicacao_n);
 CREATE INDEX IF NOT EXISTS ix_publications_date ON publications(date);
+CREATE INDEX IF NOT EXISTS ix_publications_date_id ON publications(date, id);
+CREATE INDEX IF NOT EXISTS ix_publications_tags ON publications USING gin (tags jsonb_path_ops);
 
 -- Tabela comments
 CREATE TABLE IF NOT EXISTS comments (
@@ -29,13 +31,15 @@ CREATE TABLE IF NOT EXISTS comments (
     publication_id INTEGER NOT NULL,
     username VARCHAR NOT NULL,
     text TEXT NOT NULL,
-    likes INTEGER DEFAULT 0,
+    likes INTEGER NOT NULL DEFAULT 0,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     CONSTRAINT fk_comments_publication FOREIGN KEY (publication_id) REFERENCES publications(id) ON DELETE CASCADE
 );
 
 CREATE INDEX IF NOT EXISTS ix_comments_id ON comments(id);
 CREATE INDEX IF NOT EXISTS ix_comments_publication_id ON comments(publication_id);
+CREATE INDEX IF NOT EXISTS ix_comments_publication_id_id ON comments(publication_id, id);
+CREATE INDEX IF NOT EXISTS ix_comments_publication_id_likes_id ON comments(publication_id, likes, id);
 
 -- Tabela replies
 CREATE TABLE IF NOT EXISTS replies (
@@ -78,6 +82,92 @@ CREATE TABLE IF NOT EXISTS comment_analyses (
 
 CREATE INDEX IF NOT EXISTS ix_comment_analyses_id ON comment_analyses(id);
 CREATE UNIQUE INDEX IF NOT EXISTS ix_comment_analyses_comment_id ON comment_analyses(comment_id);
+CREATE INDEX IF NOT EXISTS ix_comment_analyses_comment_id_labels ON comment_analyses(comment_id, sentiment, emotion, topic);
+
+-- Tabela reply_analyses
+CREATE TABLE IF NOT EXISTS reply_analyses (
+    id SERIAL PRIMARY KEY,
+    reply_id INTEGER NOT NULL UNIQUE,
+    sentiment VARCHAR NOT NULL,
+    emotion VARCHAR NOT NULL,
+    topic VARCHAR NOT NULL,
+    analyzed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT fk_reply_analyses_reply FOREIGN KEY (reply_id) REFERENCES replies(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS ix_reply_analyses_id ON reply_analyses(id);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_reply_analyses_reply_id ON reply_analyses(reply_id);
+CREATE INDEX IF NOT EXISTS ix_reply_analyses_reply_id_labels ON reply_analyses(reply_id, sentiment, emotion, topic);
+
+-- Tabela dashboard_rollups (agregados diários do dashboard por tag e label)
+CREATE TABLE IF NOT EXISTS dashboard_rollups (
+    id SERIAL PRIMARY KEY,
+    day DATE NOT NULL,
+    tag VARCHAR NOT NULL DEFAULT '',
+    dimension VARCHAR NOT NULL,
+    label VARCHAR NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    CONSTRAINT uq_dashboard_rollups_key UNIQUE (day, tag, dimension, label)
+);
+
+CREATE INDEX IF NOT EXISTS ix_dashboard_rollups_id ON dashboard_rollups(id);
+CREATE INDEX IF NOT EXISTS ix_dashboard_rollups_tag_day ON dashboard_rollups(tag, day);
+
+-- Tabela detection_jobs (detecções de objetos assíncronas; id = task_id)
+CREATE TABLE IF NOT EXISTS detection_jobs (
+    id VARCHAR(32) PRIMARY KEY,
+    status VARCHAR NOT NULL,
+    progress DOUBLE PRECISION,
+    message TEXT,
+    confidence DOUBLE PRECISION NOT NULL,
+    original_filename VARCHAR,
+    image_path VARCHAR NOT NULL,
+    annotated_path VARCHAR,
+    result JSON,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_detection_jobs_status_created_at ON detection_jobs(status, created_at);
+
+-- Busca textual (português sem acentos) e fallback por substring (pg_trgm)
+CREATE EXTENSION IF NOT EXISTS unaccent;
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'portuguese_unaccent') THEN
+        CREATE TEXT SEARCH CONFIGURATION portuguese_unaccent (COPY = portuguese);
+        ALTER TEXT SEARCH CONFIGURATION portuguese_unaccent
+            ALTER MAPPING FOR hword, hword_part, word WITH unaccent, portuguese_stem;
+    END IF;
+END
+$$;
+
+ALTER TABLE publications ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (to_tsvector('portuguese_unaccent', coalesce(description, ''))) STORED;
+ALTER TABLE comments ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (to_tsvector('portuguese_unaccent', coalesce(text, ''))) STORED;
+ALTER TABLE replies ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (to_tsvector('portuguese_unaccent', coalesce(text, ''))) STORED;
+
+CREATE INDEX IF NOT EXISTS ix_publications_search_vector ON publications USING gin (search_vector);
+CREATE INDEX IF NOT EXISTS ix_comments_search_vector ON comments USING gin (search_vector);
+CREATE INDEX IF NOT EXISTS ix_replies_search_vector ON replies USING gin (search_vector);
+CREATE INDEX IF NOT EXISTS ix_publications_description_trgm ON publications USING gin (description gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_comments_text_trgm ON comments USING gin (text gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_replies_text_trgm ON replies USING gin (text gin_trgm_ops);
+
+-- Contagens numéricas de engajamento (preenchidas por scripts/backfill_engagement.py)
+ALTER TABLE publications ADD COLUMN IF NOT EXISTS views_count BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE publications ADD COLUMN IF NOT EXISTS likes_count BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE publications ADD COLUMN IF NOT EXISTS shares_count BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE publications ADD COLUMN IF NOT EXISTS bookmarks_count BIGINT NOT NULL DEFAULT 0;
+
+CREATE INDEX IF NOT EXISTS ix_publications_views_count_id ON publications(views_count, id);
+CREATE INDEX IF NOT EXISTS ix_publications_likes_count_id ON publications(likes_count, id);
+CREATE INDEX IF NOT EXISTS ix_publications_shares_count_id ON publications(shares_count, id);
 
 -- Nota: A tabela users já foi criada anteriormente, então não precisa ser criada novamente aqui
 
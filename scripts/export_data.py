@@ -0,0 +1,53 @@
+"""
+Script para exportar publicações, comentários ou respostas (com seus labels).
+Uso: uv run python scripts/export_data.py <publications|comments|replies> <ndjson|csv|parquet> <arquivo> [data_inicial] [data_final] [tag...]
+
+As linhas são lidas do banco com um cursor no servidor e gravadas em lotes; a
+memória usada não depende do tamanho da exportação. Parquet requer o pacote
+pyarrow.
+"""
+import asyncio
+import sys
+import time
+from datetime import datetime
+
+from app.infrastructure.database.session import AsyncSessionLocal
+from app.application.services.export_service import ExportService
+from app.infrastructure.database.repositories.export_repository import EXPORT_DATASETS
+from app.infrastructure.export.writers import EXPORT_FORMATS
+
+
+async def export_data(
+    dataset: str,
+    format: str,
+    path: str,
+    start_date: datetime = None,
+    end_date: datetime = None,
+    tags: list = None,
+):
+    """Grava a exportação de `dataset` no formato `format` em `path`."""
+    started = time.perf_counter()
+    written = 0
+    async with AsyncSessionLocal() as session:
+        service = ExportService(session)
+        writer = service.writer(dataset, format)
+        with open(path, "wb") as file:
+            async for data in service.export(
+                dataset, writer, start_date=start_date, end_date=end_date, tags=tags
+            ):
+                file.write(data)
+                written += len(data)
+    elapsed = time.perf_counter() - started
+    print(f"Exportação concluída! {written / 1024 / 1024:.1f} MB em {path} ({elapsed:.1f}s)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 4 or sys.argv[1] not in EXPORT_DATASETS or sys.argv[2] not in EXPORT_FORMATS:
+        print(__doc__.strip())
+        sys.exit(1)
+
+    dataset, format, path = sys.argv[1:4]
+    start_date = datetime.fromisoformat(sys.argv[4]) if len(sys.argv) > 4 else None
+    end_date = datetime.fromisoformat(sys.argv[5]) if len(sys.argv) > 5 else None
+    tags = sys.argv[6:] or None
+    asyncio.run(export_data(dataset, format, path, start_date, end_date, tags))
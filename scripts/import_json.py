@@ -1,19 +1,65 @@
 """
 Script para importar dados JSON para o banco de dados.
-Uso: uv run python scripts/import_json.py <caminho_do_json>
+Uso: uv run python scripts/import_json.py <caminho_do_json_ou_diretório> [tamanho_do_lote] [processos]
+
+O arquivo (uma lista de publicações) é lido em streaming: os itens são
+convertidos em uma thread e entregues em lotes, por uma fila limitada, ao
+gravador, que grava cada lote em sua própria transação. A memória usada não
+depende do tamanho do arquivo.
+
+Um diretório (ex: json/) é importado em paralelo, um arquivo por processo
+(cada um com sua conexão ao banco), com um manifest que permite retomar a
+importação: arquivos concluídos são pulados e os parciais continuam do último
+lote gravado. Publicações repetidas entre arquivos são importadas a partir da
+cópia com mais comentários.
 """
 import asyncio
+import codecs
+import dataclasses
+import hashlib
 import json
+import multiprocessing
+import re
+import sqlite3
 import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime
+from typing import Any, BinaryIO, Iterable, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy.exc import SQLAlchemyError
 
-from sqlalchemy.ext.asyncio import AsyncSession
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
 
 from app.infrastructure.database.session import AsyncSessionLocal
+from app.infrastructure.nlp.executor import nlp_executor
 from app.application.services.publication_service import PublicationService
 from app.domain.entities.publication import Publication
 from app.domain.entities.comment import Comment, Reply
+from app.domain.value_objects.engagement import parse_count
+
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_WORKERS = 4
+# Lotes convertidos aguardando gravação (limita a memória usada pela leitura)
+QUEUE_SIZE = 4
+# Bytes lidos do arquivo por vez
+CHUNK_SIZE = 1024 * 1024
+
+# Estado da importação de um diretório (criado dentro do próprio diretório)
+MANIFEST_NAME = ".import_manifest.sqlite3"
+# Cópias gravadas por vez no índice de deduplicação
+INDEX_BATCH_SIZE = 10000
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Caracteres que podem seguir um item da lista
+_DELIMITERS = (" ", "\t", "\n", "\r", ",", "]")
 
 
 def parse_date(date_str: str) -> datetime:
@@ -30,94 +76,561 @@ def parse_date(date_str: str) -> datetime:
         return datetime.now()
 
 
-def parse_number(value: str) -> int:
-    """Parse string number (e.g., '113.4K') to int."""
-    if not value:
-        return 0
-    value = value.replace(",", "").replace(".", "")
-    if "K" in value.upper():
-        return int(float(value.upper().replace("K", "")) * 1000)
-    if "M" in value.upper():
-        return int(float(value.upper().replace("M", "")) * 1000000)
+class JSONArrayReader:
+    """
+    Lê uma lista JSON em streaming, item a item.
+
+    Apenas o item corrente e um bloco de `chunk_size` bytes ficam em memória.
+    `offset` é a posição em bytes logo após o último item lido; a leitura pode
+    ser retomada a partir de uma posição obtida assim. Levanta ValueError se o
+    conteúdo não for uma lista JSON.
+    """
+
+    def __init__(self, file: BinaryIO, chunk_size: int = CHUNK_SIZE, offset: int = 0):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.offset = offset
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._position = 0
+        self._eof = False
+        self._at_start = not offset
+        if offset:
+            file.seek(offset)
+
+    def _read(self) -> bool:
+        """Lê mais um bloco, descartando o que já foi consumido. Retorna False no fim do arquivo."""
+        if self._eof:
+            return False
+        chunk = self.file.read(self.chunk_size)
+        self._eof = not chunk
+        self._buffer = self._buffer[self._position:] + self._utf8.decode(chunk, final=self._eof)
+        self._position = 0
+        if self._at_start and self._buffer:
+            self._at_start = False
+            if self._buffer.startswith("\ufeff"):
+                self._position = 1
+                self.offset = len(codecs.BOM_UTF8)
+        return not self._eof
+
+    def _consume(self, end: int) -> None:
+        self.offset += len(self._buffer[self._position:end].encode("utf-8"))
+        self._position = end
+
+    def _peek(self) -> str:
+        """Pula espaços e retorna o próximo caractere sem consumi-lo ('' no fim do arquivo)."""
+        while True:
+            self._consume(_WHITESPACE.match(self._buffer, self._position).end())
+            if self._position < len(self._buffer) or not self._read():
+                return self._buffer[self._position:self._position + 1]
+
+    def _expect(self, chars: str) -> str:
+        """Consome o próximo caractere, que deve estar em `chars`."""
+        char = self._peek()
+        if not char or char not in chars:
+            expected = " ou ".join(f"'{c}'" for c in chars)
+            raise ValueError(f"JSON inválido na posição {self.offset}: esperado {expected}")
+        self._consume(self._position + 1)
+        return char
+
+    def _decode_item(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                item, end = self._decoder.raw_decode(self._buffer, self._position)
+                # Um número no fim do buffer ("12", "1.", "1e") pode continuar no próximo bloco
+                if self._eof or self._buffer[end:end + 1] in _DELIMITERS:
+                    self._consume(end)
+                    return item
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._read()
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._at_start:
+            if self._peek() != "[":
+                raise ValueError("JSON deve ser uma lista de publicações")
+            self._expect("[")
+            more = self._peek() != "]"
+        else:
+            # Retomada logo após um item
+            more = self._expect(",]") == ","
+        while more:
+            yield self._decode_item()
+            more = self._expect(",]") == ","
+
+
+def to_publication(item: dict, idx: int) -> Publication:
+    """Converte um item do JSON do scraper para a entidade de domínio."""
+    comments = []
+    for comment_data in item.get("comments", []):
+        replies = [
+            Reply(
+                username=reply.get("username", ""),
+                text=reply.get("text", ""),
+                likes=parse_count(reply.get("likes", "0")),
+            )
+            for reply in comment_data.get("replies", [])
+        ]
+
+        comments.append(Comment(
+            username=comment_data.get("username", ""),
+            text=comment_data.get("text", ""),
+            likes=parse_count(comment_data.get("likes", "0")),
+            replies=replies,
+        ))
+
+    return Publication(
+        publicacao_n=item.get("publicacao_n", idx),
+        url=item.get("url", ""),
+        description=item.get("description", ""),
+        date=parse_date(item.get("date", "")),
+        views=item.get("views"),
+        likes=item.get("likes"),
+        comments_count=item.get("comments_count", 0),
+        shares=item.get("shares"),
+        bookmarks=item.get("bookmarks"),
+        music_title=item.get("musicTitle"),
+        tags=item.get("tags", []),
+        comments=comments,
+    )
+
+
+def file_hash(file_path: Path) -> str:
+    """Hash SHA-256 do conteúdo do arquivo."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def count_rows(publication: Publication) -> int:
+    """Linhas de uma publicação (publicação, comentários e respostas)."""
+    return 1 + sum(1 + len(comment.replies) for comment in publication.comments)
+
+
+@dataclass
+class ImportStats:
+    """Contadores da importação."""
+    items: int = 0
+    rows: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    # Cópias descartadas por existir outra com mais comentários
+    skipped: int = 0
+    errors: int = 0
+    batches: int = 0
+
+    def add(self, other: "ImportStats") -> None:
+        for field in dataclasses.fields(self):
+            setattr(self, field.name, getattr(self, field.name) + getattr(other, field.name))
+
+    def report(self, elapsed: float) -> str:
+        items_per_second = self.items / elapsed if elapsed else 0.0
+        rows_per_second = self.rows / elapsed if elapsed else 0.0
+        skipped = f"{self.skipped} cópias ignoradas, " if self.skipped else ""
+        report = (
+            f"{self.items} itens ({self.inserted} inseridos, {self.duplicates} duplicados, "
+            f"{skipped}{self.errors} erros) em {self.batches} lotes, {elapsed:.1f}s: "
+            f"{items_per_second:.1f} itens/s, {rows_per_second:.1f} linhas/s"
+        )
+        if resource is not None:
+            # ru_maxrss em KB no Linux (RUSAGE_CHILDREN: maior processo de importação encerrado)
+            max_rss = max(
+                resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+            )
+            report += f", memória máxima {max_rss // 1024} MB"
+        return report
+
+
+_MANIFEST_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    hash TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    status TEXT NOT NULL,
+    offset INTEGER NOT NULL DEFAULT 0,
+    items INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS copies (
+    publicacao_n INTEGER PRIMARY KEY,
+    file TEXT NOT NULL,
+    item INTEGER NOT NULL,
+    comments INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_copies_file_item ON copies (file, item);
+"""
+
+
+class ImportManifest:
+    """
+    Estado da importação de um diretório, em um arquivo SQLite:
+
+    - `files`: um registro por conteúdo de arquivo (hash SHA-256) com o status
+      (pending, indexed, done) e o checkpoint (posição em bytes e itens lidos
+      até o último lote gravado);
+    - `copies`: índice publicacao_n -> cópia a importar (arquivo, item): a com
+      mais comentários; em empate, a de menor (hash do arquivo, item).
+
+    Cada processo abre sua própria conexão; o SQLite serializa as escritas.
+    """
+
+    PENDING = "pending"
+    INDEXED = "indexed"
+    DONE = "done"
+
+    def __init__(self, path: Path):
+        self.connection = sqlite3.connect(path, timeout=60)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(_MANIFEST_SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def known_hash(self, file_path: Path) -> Optional[str]:
+        """Hash já calculado para o arquivo, se ele não mudou (nome, tamanho e data)."""
+        stat = file_path.stat()
+        row = self.connection.execute(
+            "SELECT hash FROM files WHERE name = ? AND size = ? AND mtime = ?",
+            (file_path.name, stat.st_size, stat.st_mtime),
+        ).fetchone()
+        return row[0] if row else None
+
+    def register(self, file_path: Path, file_hash: str) -> str:
+        """Registra um arquivo (novo conteúdo como pending) e retorna o seu status."""
+        stat = file_path.stat()
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO files (hash, name, size, mtime, status) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (hash) DO UPDATE SET name = excluded.name, mtime = excluded.mtime",
+                (file_hash, file_path.name, stat.st_size, stat.st_mtime, self.PENDING),
+            )
+        return self.connection.execute("SELECT status FROM files WHERE hash = ?", (file_hash,)).fetchone()[0]
+
+    def forget_missing(self, file_hashes: Set[str]) -> int:
+        """
+        Remove os arquivos não concluídos que não existem mais (ou mudaram). Como
+        o índice guarda apenas a melhor cópia de cada publicação, ele é refeito:
+        os demais arquivos não concluídos voltam a pending. Retorna o número de
+        arquivos removidos.
+        """
+        rows = self.connection.execute("SELECT hash FROM files WHERE status != ?", (self.DONE,))
+        missing = [row[0] for row in rows if row[0] not in file_hashes]
+        if missing:
+            with self.connection:
+                self.connection.executemany("DELETE FROM files WHERE hash = ?", [(h,) for h in missing])
+                self.connection.execute("DELETE FROM copies")
+                self.connection.execute(
+                    "UPDATE files SET status = ? WHERE status != ?", (self.PENDING, self.DONE)
+                )
+        return len(missing)
+
+    def set_status(self, file_hash: str, status: str) -> None:
+        with self.connection:
+            self.connection.execute("UPDATE files SET status = ? WHERE hash = ?", (status, file_hash))
+
+    def get_checkpoint(self, file_hash: str) -> Tuple[int, int]:
+        """(posição em bytes, itens lidos) do último lote gravado."""
+        return self.connection.execute(
+            "SELECT offset, items FROM files WHERE hash = ?", (file_hash,)
+        ).fetchone()
+
+    def checkpoint(self, file_hash: str, offset: int, items: int) -> None:
+        with self.connection:
+            self.connection.execute(
+                "UPDATE files SET offset = ?, items = ? WHERE hash = ?", (offset, items, file_hash)
+            )
+
+    def add_copies(self, copies: Iterable[Tuple[Any, str, int, int]]) -> None:
+        """Registra cópias (publicacao_n, arquivo, item, comentários), mantendo a melhor de cada publicação."""
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO copies (publicacao_n, file, item, comments) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (publicacao_n) DO UPDATE SET "
+                "file = excluded.file, item = excluded.item, comments = excluded.comments "
+                "WHERE excluded.comments > copies.comments OR ("
+                "excluded.comments = copies.comments "
+                "AND (excluded.file, excluded.item) < (copies.file, copies.item))",
+                copies,
+            )
+
+    def chosen_items(self, file_hash: str, first: int, last: int) -> Set[int]:
+        """Itens do arquivo, entre `first` e `last`, que são a cópia a importar."""
+        rows = self.connection.execute(
+            "SELECT item FROM copies WHERE file = ? AND item BETWEEN ? AND ?",
+            (file_hash, first, last),
+        )
+        return {row[0] for row in rows}
+
+
+@dataclass
+class Batch:
+    """Lote convertido e o checkpoint (itens lidos, posição em bytes) logo após ele."""
+    publications: List[Publication]
+    positions: List[int]
+    items: int
+    offset: int
+
+
+def _produce(
+    file_path: Path,
+    batch_size: int,
+    queue: asyncio.Queue,
+    loop: asyncio.AbstractEventLoop,
+    stop: threading.Event,
+    stats: ImportStats,
+    offset: int = 0,
+    items: int = 0,
+) -> None:
+    """
+    Lê e converte os itens do arquivo (em uma thread), a partir de um
+    checkpoint, entregando lotes à fila. Bloqueia enquanto a fila estiver
+    cheia; `None` sinaliza o fim.
+    """
+    def put(batch: Optional[Batch]) -> None:
+        asyncio.run_coroutine_threadsafe(queue.put(batch), loop).result()
+
     try:
-        return int(value)
-    except:
-        return 0
+        batch = Batch([], [], items, offset)
+        with open(file_path, "rb") as f:
+            reader = JSONArrayReader(f, offset=offset)
+            for idx, item in enumerate(reader, items + 1):
+                if stop.is_set():
+                    return
+                batch.items, batch.offset = idx, reader.offset
+                try:
+                    batch.publications.append(to_publication(item, idx))
+                    batch.positions.append(idx)
+                except Exception as e:
+                    print(f"Erro ao importar publicação {idx} de {file_path.name}: {e}")
+                    stats.errors += 1
+                    continue
+
+                if len(batch.publications) >= batch_size:
+                    put(batch)
+                    batch = Batch([], [], idx, reader.offset)
+        # O último lote é entregue mesmo vazio (checkpoint no fim do arquivo)
+        if not stop.is_set():
+            put(batch)
+    finally:
+        put(None)
 
 
-async def import_json_file(file_path: Path):
-    """Importa um arquivo JSON para o banco de dados."""
+async def _write_batch(batch: List[Publication], stats: ImportStats) -> bool:
+    """Grava um lote em sua própria sessão e transação. Retorna False se falhar."""
+    if not batch:
+        return True
+
     async with AsyncSessionLocal() as session:
-        service = PublicationService(session)
-        
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        
-        if not isinstance(data, list):
-            print("Erro: JSON deve ser uma lista de publicações")
+        try:
+            # Análise no próprio lote: os processos do import já paralelizam o NLP
+            result = await PublicationService(session, background=False).create_publications(batch)
+        except SQLAlchemyError as e:
+            await session.rollback()
+            print(f"Erro ao gravar lote {stats.batches + 1}: {e}")
+            stats.errors += len(batch)
+            return False
+
+    stats.inserted += result["inserted"]
+    stats.duplicates += result["duplicates"]
+    stats.rows += sum(count_rows(publication) for publication in batch)
+    return True
+
+
+async def import_json_file(
+    file_path: Path,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    manifest: Optional[ImportManifest] = None,
+    file_hash: Optional[str] = None,
+) -> ImportStats:
+    """
+    Importa um arquivo JSON para o banco de dados.
+
+    Com um `manifest`, a leitura começa no checkpoint do arquivo, apenas as
+    cópias escolhidas no índice de deduplicação são gravadas e o checkpoint
+    avança a cada lote gravado. Uma falha ao gravar interrompe o arquivo, que é
+    retomado a partir do último lote gravado na próxima execução.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    stop = threading.Event()
+    stats = ImportStats()
+    started = time.perf_counter()
+    offset, items = manifest.get_checkpoint(file_hash) if manifest is not None else (0, 0)
+
+    resume = f" a partir do item {items + 1}" if items else ""
+    print(f"Importando {file_path}{resume} em lotes de {batch_size}...")
+    producer = loop.run_in_executor(
+        None, _produce, file_path, batch_size, queue, loop, stop, stats, offset, items
+    )
+    try:
+        while (batch := await queue.get()) is not None:
+            publications = batch.publications
+            if manifest is not None and publications:
+                chosen = manifest.chosen_items(file_hash, batch.positions[0], batch.positions[-1])
+                publications = [
+                    publication
+                    for publication, position in zip(batch.publications, batch.positions)
+                    if position in chosen
+                ]
+                stats.skipped += len(batch.publications) - len(publications)
+
+            if not await _write_batch(publications, stats) and manifest is not None:
+                raise RuntimeError(f"falha ao gravar o lote {stats.batches + 1} de {file_path.name}")
+            if manifest is not None:
+                manifest.checkpoint(file_hash, batch.offset, batch.items)
+            if batch.publications:
+                stats.items += len(batch.publications)
+                stats.batches += 1
+                print(f"{file_path.name} lote {stats.batches}: {stats.report(time.perf_counter() - started)}")
+    finally:
+        # Libera o leitor caso esteja bloqueado na fila
+        stop.set()
+        while not queue.empty():
+            queue.get_nowait()
+        await producer
+        nlp_executor.shutdown()
+
+    if manifest is not None:
+        manifest.set_status(file_hash, ImportManifest.DONE)
+    print(f"Importação de {file_path.name} concluída! {stats.report(time.perf_counter() - started)}")
+    return stats
+
+
+def index_file(file_path: Path, file_hash: str, manifest_path: Path) -> int:
+    """Registra no índice de deduplicação as cópias de publicações do arquivo. Retorna o número de itens."""
+    manifest = ImportManifest(manifest_path)
+    try:
+        copies, items = [], 0
+        with open(file_path, "rb") as f:
+            for items, item in enumerate(JSONArrayReader(f), 1):
+                if not isinstance(item, dict):
+                    continue
+                copies.append((item.get("publicacao_n", items), file_hash, items, len(item.get("comments") or [])))
+                if len(copies) >= INDEX_BATCH_SIZE:
+                    manifest.add_copies(copies)
+                    copies = []
+        manifest.add_copies(copies)
+        manifest.set_status(file_hash, ImportManifest.INDEXED)
+        return items
+    finally:
+        manifest.close()
+
+
+def _init_worker() -> None:
+    """Processo de importação: a classificação usa apenas threads (o paralelismo vem dos processos)."""
+    nlp_executor.process_workers = 0
+
+
+def _import_file_worker(file_path: Path, file_hash: str, manifest_path: Path, batch_size: int) -> ImportStats:
+    manifest = ImportManifest(manifest_path)
+    try:
+        return asyncio.run(import_json_file(file_path, batch_size, manifest, file_hash))
+    finally:
+        manifest.close()
+
+
+def import_json_dir(
+    json_dir: Path,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int = DEFAULT_WORKERS,
+) -> None:
+    """
+    Importa todos os arquivos .json de um diretório em `workers` processos.
+
+    1. Calcula o hash de cada arquivo (reaproveitado do manifest se o arquivo
+       não mudou); conteúdos repetidos são importados uma vez.
+    2. Indexa os arquivos novos: para cada publicação, a cópia com mais
+       comentários entre todos os arquivos.
+    3. Importa os arquivos não concluídos, cada um em um processo com sua
+       própria conexão, gravando apenas as cópias escolhidas.
+
+    Publicações já gravadas (ex: por um arquivo importado em uma execução
+    anterior) são mantidas, como em `create_publications`.
+    """
+    started = time.perf_counter()
+    manifest_path = json_dir / MANIFEST_NAME
+    manifest = ImportManifest(manifest_path)
+    files = sorted(json_dir.glob("*.json"))
+
+    hashes = {file_path: manifest.known_hash(file_path) for file_path in files}
+    unknown = [file_path for file_path, known in hashes.items() if known is None]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        hashes.update(zip(unknown, pool.map(file_hash, unknown)))
+
+    if manifest.forget_missing(set(hashes.values())):
+        print("Arquivos não concluídos foram removidos ou alterados: o índice de deduplicação será refeito")
+    statuses = {}
+    for file_path in files:
+        if hashes[file_path] in statuses:
+            print(f"{file_path.name} tem o mesmo conteúdo de outro arquivo e será ignorado")
+            continue
+        statuses[hashes[file_path]] = (file_path, manifest.register(file_path, hashes[file_path]))
+    manifest.close()
+
+    to_index = {h: path for h, (path, status) in statuses.items() if status == ImportManifest.PENDING}
+    to_import = {h: path for h, (path, status) in statuses.items() if status != ImportManifest.DONE}
+    print(
+        f"{len(files)} arquivos: {len(statuses) - len(to_import)} já importados, "
+        f"{len(to_index)} a indexar, {len(to_import)} a importar ({workers} processos)"
+    )
+
+    total = ImportStats()
+    failed = []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        # spawn: fork de um processo com event loop e threads não é seguro
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        # Um processo (e um engine/conexão) por arquivo
+        max_tasks_per_child=1,
+    ) as pool:
+        # A escolha das cópias depende de todos os arquivos: indexa antes de importar
+        futures = {pool.submit(index_file, path, h, manifest_path): path for h, path in to_index.items()}
+        for future in as_completed(futures):
+            try:
+                print(f"{futures[future].name} indexado: {future.result()} itens")
+            except Exception as e:
+                failed.append(futures[future])
+                print(f"Erro ao indexar {futures[future].name}: {e}")
+        if failed:
+            print("Importação interrompida: corrija os arquivos acima e execute novamente")
             return
-        
-        print(f"Importando {len(data)} publicações...")
-        
-        for idx, item in enumerate(data, 1):
+
+        futures = {
+            pool.submit(_import_file_worker, path, h, manifest_path, batch_size): path
+            for h, path in to_import.items()
+        }
+        for future in as_completed(futures):
             try:
-                # Parse comments
-                comments = []
-                for comment_data in item.get("comments", []):
-                    replies = [
-                        Reply(
-                            username=reply.get("username", ""),
-                            text=reply.get("text", ""),
-                            likes=parse_number(reply.get("likes", "0")),
-                        )
-                        for reply in comment_data.get("replies", [])
-                    ]
-                    
-                    comments.append(Comment(
-                        username=comment_data.get("username", ""),
-                        text=comment_data.get("text", ""),
-                        likes=parse_number(comment_data.get("likes", "0")),
-                        replies=replies,
-                    ))
-                
-                # Create publication entity
-                publication = Publication(
-                    publicacao_n=item.get("publicacao_n", idx),
-                    url=item.get("url", ""),
-                    description=item.get("description", ""),
-                    date=parse_date(item.get("date", "")),
-                    views=item.get("views"),
-                    likes=item.get("likes"),
-                    comments_count=item.get("comments_count", 0),
-                    shares=item.get("shares"),
-                    bookmarks=item.get("bookmarks"),
-                    music_title=item.get("musicTitle"),
-                    tags=item.get("tags", []),
-                    comments=comments,
-                )
-                
-                await service.create_publication(publication)
-                
-                if idx % 10 == 0:
-                    print(f"Processadas {idx}/{len(data)} publicações...")
-                    
+                total.add(future.result())
             except Exception as e:
-                print(f"Erro ao importar publicação {idx}: {e}")
-                continue
-        
-        await session.commit()
-        print(f"Importação concluída! {len(data)} publicações processadas.")
+                failed.append(futures[future])
+                print(f"Erro ao importar {futures[future].name}: {e}")
+
+    if failed:
+        print(f"{len(failed)} arquivos não concluídos; serão retomados na próxima execução")
+    print(f"Importação concluída! {total.report(time.perf_counter() - started)}")
 
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Uso: python scripts/import_json.py <caminho_do_json>")
+        print("Uso: python scripts/import_json.py <caminho_do_json_ou_diretório> [tamanho_do_lote] [processos]")
         sys.exit(1)
-    
-    file_path = Path(sys.argv[1])
-    if not file_path.exists():
-        print(f"Erro: Arquivo {file_path} não encontrado")
+
+    path = Path(sys.argv[1])
+    if not path.exists():
+        print(f"Erro: Arquivo {path} não encontrado")
         sys.exit(1)
-    
-    asyncio.run(import_json_file(file_path))
 
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_BATCH_SIZE
+    if path.is_dir():
+        workers = int(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_WORKERS
+        import_json_dir(path, batch_size, workers)
+    else:
+        asyncio.run(import_json_file(path, batch_size))
@@ -0,0 +1,22 @@
+"""
+Script para recalcular os agregados diários do dashboard (dashboard_rollups).
+Uso: uv run python scripts/rebuild_rollups.py [tamanho_do_lote]
+"""
+import asyncio
+import sys
+
+from app.infrastructure.database.session import AsyncSessionLocal
+from app.application.services.analysis_service import AnalysisService
+
+
+async def rebuild_rollups(batch_size: int = 1000):
+    """Recalcula os agregados a partir dos labels armazenados."""
+    async with AsyncSessionLocal() as session:
+        service = AnalysisService(session)
+        total = await service.rebuild_rollups(batch_size=batch_size)
+        print(f"Agregados recalculados! {total} publicações agregadas.")
+
+
+if __name__ == "__main__":
+    batch_size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    asyncio.run(rebuild_rollups(batch_size))
@@ -1,8 +1,13 @@
+import fakeredis
+import httpx
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from app.infrastructure.database import models  # noqa: F401 (registra as tabelas em Base.metadata)
 from app.infrastructure.database.session import Base, get_db
+from app.infrastructure.cache.dashboard_cache import DashboardCache
+from app.infrastructure.cache.redis_client import RedisCache
 from app.core.config import settings
 
 
@@ -31,3 +36,35 @@ async def db_session(test_db):
     """Fixture para sessão de banco de dados de teste."""
     yield test_db
 
+
+@pytest.fixture
+async def dashboard_cache(monkeypatch):
+    """Cache do dashboard sobre um Redis falso, usado pelos serviços."""
+    import app.application.services.analysis_service as analysis_service
+    import app.application.services.publication_service as publication_service
+
+    redis_cache = RedisCache()
+    redis_cache.redis_client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    cache = DashboardCache(redis_cache)
+    monkeypatch.setattr(analysis_service, "dashboard_cache", cache)
+    monkeypatch.setattr(publication_service, "dashboard_cache", cache)
+    yield cache
+    await redis_cache.redis_client.aclose()
+
+
+@pytest.fixture
+async def client(test_db, dashboard_cache, monkeypatch):
+    """Cliente HTTP da API usando o banco de teste (análise de NLP na própria escrita)."""
+    from app.main import app
+
+    async def override_get_db():
+        yield test_db
+
+    monkeypatch.setattr(settings, "ANALYSIS_IN_BACKGROUND", False)
+    app.dependency_overrides[get_db] = override_get_db
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as http_client:
+        yield http_client
+    app.dependency_overrides.clear()
+
@@ -0,0 +1,173 @@
+import asyncio
+from datetime import datetime
+
+import fakeredis
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.application.services.analysis_service import AnalysisService
+from app.application.services.publication_service import PublicationService
+from app.domain.entities.comment import Comment, Reply
+from app.domain.entities.publication import Publication
+from app.infrastructure.cache.redis_client import RedisCache
+from app.infrastructure.database.models import (
+    CommentAnalysisModel,
+    DashboardRollupModel,
+    PublicationAnalysisModel,
+    ReplyAnalysisModel,
+)
+from app.worker import tasks
+from app.worker.celery_app import celery_app
+
+
+class _FakeRedisCache(RedisCache):
+    """Cliente Redis das tarefas sobre um servidor falso."""
+
+    def __init__(self):
+        super().__init__()
+        self.redis_client = fakeredis.FakeAsyncRedis(decode_responses=True)
+
+
+@pytest.fixture
+def worker(test_db, dashboard_cache, monkeypatch):
+    """Tarefas executadas em modo eager sobre o banco de teste."""
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+    monkeypatch.setattr(
+        tasks,
+        "session_factory",
+        async_sessionmaker(test_db.bind, class_=AsyncSession, expire_on_commit=False),
+    )
+    monkeypatch.setattr(tasks, "RedisCache", _FakeRedisCache)
+
+
+def _publication(n: int, comments) -> Publication:
+    return Publication(
+        publicacao_n=n,
+        url=f"https://example.com/{n}",
+        description="briga na saída do estádio",
+        date=datetime(2024, 1, n),
+        views="1K",
+        likes="10",
+        comments_count=len(comments),
+        shares="0",
+        bookmarks="0",
+        music_title=None,
+        tags=["corinthians"],
+        comments=[
+            Comment(username="u", text=text, likes=1, replies=[Reply(username="r", text=f"re: {text}")])
+            for text in comments
+        ],
+    )
+
+
+async def _counts(session):
+    return [
+        (await session.execute(select(func.count()).select_from(model))).scalar()
+        for model in (PublicationAnalysisModel, CommentAnalysisModel, ReplyAnalysisModel)
+    ]
+
+
+async def _rollups(session):
+    result = await session.execute(select(
+        DashboardRollupModel.day,
+        DashboardRollupModel.tag,
+        DashboardRollupModel.dimension,
+        DashboardRollupModel.label,
+        DashboardRollupModel.count,
+    ))
+    return sorted(result.all())
+
+
+async def test_ingestao_em_background_grava_labels_e_agregados(test_db, worker):
+    """A tarefa grava os labels e agregados; repeti-la (retry) não conta nada duas vezes."""
+    service = PublicationService(test_db, background=True)
+    await service.create_publications([
+        _publication(1, ["odeio", "vai corinthians"]),
+        _publication(2, ["polícia chegou"]),
+    ])
+
+    assert await _counts(test_db) == [2, 3, 3]
+    rollups = await _rollups(test_db)
+    assert rollups
+
+    # Os agregados incrementais coincidem com o recálculo a partir dos labels
+    await AnalysisService(test_db).rebuild_rollups()
+    assert await _rollups(test_db) == rollups
+
+    # Reentrega da mesma tarefa: nada a fazer
+    assert await tasks.AnalysisRepository(test_db).list_pending_ids() == []
+    result = await asyncio.to_thread(tasks.analyze_publications.apply, args=[[1, 2]])
+    assert result.get() == 0
+    test_db.expire_all()
+    assert await _counts(test_db) == [2, 3, 3]
+    assert await _rollups(test_db) == rollups
+
+
+async def test_retry_apos_falha_nao_duplica_agregados(test_db, worker, monkeypatch):
+    """Uma falha depois do commit dispara o retry, que não grava nada de novo."""
+    with monkeypatch.context() as patch:
+        patch.setattr(tasks, "enqueue", lambda publication_ids: 0)
+        await PublicationService(test_db, background=True).create_publications(
+            [_publication(1, ["odeio"]), _publication(2, ["tmj"])]
+        )
+
+    analyze_pending = AnalysisService.analyze_pending
+    calls = []
+
+    async def fail_after_commit(self, publication_ids):
+        changed = await analyze_pending(self, publication_ids)
+        calls.append(changed)
+        if len(calls) == 1:
+            raise OSError("conexão perdida")
+        return changed
+
+    monkeypatch.setattr(AnalysisService, "analyze_pending", fail_after_commit)
+    monkeypatch.setattr(tasks.analyze_publications, "retry_backoff", False)
+    monkeypatch.setattr(tasks.analyze_publications, "default_retry_delay", 0)
+    # throw=False: em modo eager, `apply` executa o retry na hora em vez de propagá-lo
+    result = await asyncio.to_thread(tasks.analyze_publications.apply, args=[[1, 2]], throw=False)
+    assert result.get() == 0
+
+    assert calls == [2, 0]
+    test_db.expire_all()
+    assert await _counts(test_db) == [2, 2, 2]
+    rollups = await _rollups(test_db)
+    await AnalysisService(test_db).rebuild_rollups()
+    assert await _rollups(test_db) == rollups
+
+
+async def test_merge_classifica_apenas_comentarios_novos(test_db, worker):
+    """Comentários novos de uma publicação já analisada entram uma única vez nos agregados."""
+    service = PublicationService(test_db, background=True)
+    await service.create_publications([_publication(1, ["odeio"])])
+    await service.create_publications([_publication(1, ["odeio", "tmj"])], merge=True)
+
+    assert await _counts(test_db) == [1, 2, 2]
+    rollups = await _rollups(test_db)
+
+    result = await asyncio.to_thread(tasks.analyze_publications.apply, args=[[1]])
+    assert result.get() == 0
+    test_db.expire_all()
+    assert await _rollups(test_db) == rollups
+
+    await AnalysisService(test_db).rebuild_rollups()
+    assert await _rollups(test_db) == rollups
+
+
+async def test_enqueue_pending_recupera_enfileiramento_perdido(test_db, worker, monkeypatch):
+    """Falhas ao enfileirar não propagam; `enqueue_pending` recupera os labels pendentes."""
+    def broker_down(publication_ids):
+        raise OSError("broker indisponível")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(tasks, "enqueue", broker_down)
+        await PublicationService(test_db, background=True).create_publications(
+            [_publication(1, ["tmj"])]
+        )
+    assert await _counts(test_db) == [0, 0, 0]
+
+    result = await asyncio.to_thread(tasks.enqueue_pending.apply)
+    assert result.get() == 1
+    test_db.expire_all()
+    assert await _counts(test_db) == [1, 1, 1]
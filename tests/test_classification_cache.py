@@ -0,0 +1,65 @@
+import threading
+
+import pytest
+
+import app.application.services.nlp_service as nlp_service_module
+from app.application.services.nlp_service import NLPService
+from app.domain.value_objects.sentiment import Sentiment
+from app.infrastructure.cache.classification_cache import ClassificationCache
+from app.infrastructure.nlp import keyword_matcher
+from app.infrastructure.nlp.keyword_matcher import KeywordMatcher, reload_keyword_matcher
+
+
+@pytest.fixture
+def classification_cache(monkeypatch):
+    matcher = keyword_matcher.get_keyword_matcher()
+    cache = ClassificationCache(max_size=100, redis_cache=None)
+    monkeypatch.setattr(nlp_service_module, "classification_cache", cache)
+    yield cache
+    reload_keyword_matcher(matcher)
+
+
+def test_reload_e_usado_pelo_servico(classification_cache):
+    """Após `reload_keyword_matcher`, o serviço classifica com o novo matcher."""
+    service = NLPService()
+    assert service.classify_text("xyzzy")[0] == Sentiment.NEUTRO
+
+    reload_keyword_matcher(KeywordMatcher(negative_keywords=["xyzzy"]))
+
+    assert service.classify_text("xyzzy")[0] == Sentiment.NEGATIVO
+
+
+async def test_resultado_de_matcher_substituido_nao_e_armazenado(classification_cache):
+    """Labels calculados com um matcher antigo não entram no cache do novo."""
+    old = keyword_matcher.get_keyword_matcher()
+    key = classification_cache.build_key("xyzzy")
+    stale = {key: old.match("xyzzy")}
+
+    new = reload_keyword_matcher(KeywordMatcher(negative_keywords=["xyzzy"]))
+    await classification_cache.put_many(stale, old.fingerprint)
+
+    assert await classification_cache.get_many([key], new.fingerprint) == {}
+    assert classification_cache.get("xyzzy", old.fingerprint) is None
+
+    labels = await NLPService().classify_texts_async(["xyzzy"])
+    assert labels[0][0] == Sentiment.NEGATIVO
+    assert await classification_cache.get_many([key], new.fingerprint) == {key: labels[0]}
+
+
+def test_contadores_consistentes_entre_threads(classification_cache):
+    """Hits e misses contados por várias threads somam o total de consultas."""
+    service = NLPService()
+
+    def classify():
+        for i in range(2000):
+            service.classify_text(f"texto {i % 50}")
+
+    threads = [threading.Thread(target=classify) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = classification_cache.get_stats()
+    assert stats["lookups"] == 8 * 2000
+    assert stats["local_hits"] + stats["misses"] == stats["lookups"]
@@ -0,0 +1,124 @@
+from datetime import datetime
+
+import fakeredis
+import pytest
+
+from app.infrastructure.cache.dashboard_cache import DashboardCache
+from app.infrastructure.cache.redis_client import RedisCache
+
+
+@pytest.fixture
+async def redis_client():
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    yield client
+    await client.aclose()
+
+
+@pytest.fixture
+def dashboard_cache(redis_client):
+    redis_cache = RedisCache()
+    redis_cache.redis_client = redis_client
+    return DashboardCache(redis_cache, expire=60)
+
+
+async def _store(dashboard_cache, value, start_date=None, end_date=None, tags=None):
+    key = dashboard_cache.build_key("stats", start_date, end_date, tags)
+    generation = await dashboard_cache.generation()
+    assert await dashboard_cache.set(key, value, start_date, end_date, tags, generation=generation)
+    return key
+
+
+async def test_set_get(dashboard_cache):
+    """Respostas gravadas são lidas de volta e contabilizadas como hit/miss."""
+    key = await _store(dashboard_cache, {"total": 1}, datetime(2024, 1, 1), datetime(2024, 1, 31))
+
+    assert await dashboard_cache.get(key) == {"total": 1}
+    assert await dashboard_cache.get("dashboard:stats:outra") is None
+    assert await dashboard_cache.get_stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+
+async def test_build_key_normaliza_tags(dashboard_cache):
+    """A ordem e repetição das tags não alteram a chave."""
+    assert dashboard_cache.build_key("stats", tags=["b", "a", "a"]) == dashboard_cache.build_key(
+        "stats", tags=["a", "b"]
+    )
+
+
+async def test_invalidate_remove_apenas_entradas_afetadas(dashboard_cache, redis_client):
+    """Apenas entradas cujo período contém a data e cujas tags a publicação possui."""
+    january = await _store(dashboard_cache, {"m": 1}, datetime(2024, 1, 1), datetime(2024, 1, 31))
+    february = await _store(dashboard_cache, {"m": 2}, datetime(2024, 2, 1), datetime(2024, 2, 29))
+    tagged = await _store(dashboard_cache, {"m": 3}, tags=["corinthians"])
+    unbounded = await _store(dashboard_cache, {"m": 4})
+
+    removed = await dashboard_cache.invalidate([(datetime(2024, 1, 10), ["outra"])])
+
+    assert removed == 2
+    assert await dashboard_cache.get(january) is None
+    assert await dashboard_cache.get(unbounded) is None
+    assert await dashboard_cache.get(february) == {"m": 2}
+    assert await dashboard_cache.get(tagged) == {"m": 3}
+    assert set(await redis_client.hkeys(DashboardCache.INDEX_KEY)) == {february, tagged}
+    assert set(await redis_client.zrange(DashboardCache.EXPIRY_KEY, 0, -1)) == {february, tagged}
+
+
+async def test_invalidate_sem_publicacoes(dashboard_cache):
+    key = await _store(dashboard_cache, {"m": 1})
+    assert await dashboard_cache.invalidate([]) == 0
+    assert await dashboard_cache.get(key) == {"m": 1}
+
+
+async def test_invalidate_all(dashboard_cache, redis_client):
+    keys = [
+        await _store(dashboard_cache, {"m": 1}),
+        await _store(dashboard_cache, {"m": 2}, tags=["a"]),
+    ]
+
+    assert await dashboard_cache.invalidate_all() == 2
+    for key in keys:
+        assert await dashboard_cache.get(key) is None
+    assert not await redis_client.exists(DashboardCache.INDEX_KEY, DashboardCache.EXPIRY_KEY)
+
+
+async def test_set_descarta_resultado_calculado_antes_de_uma_escrita(dashboard_cache):
+    """Uma leitura iniciada antes de uma invalidação não grava o resultado antigo."""
+    key = dashboard_cache.build_key("stats")
+    generation = await dashboard_cache.generation()
+
+    await dashboard_cache.invalidate([(datetime(2024, 1, 10), [])])
+
+    assert not await dashboard_cache.set(key, {"m": "antigo"}, generation=generation)
+    assert await dashboard_cache.get(key) is None
+
+    assert await dashboard_cache.set(key, {"m": "novo"}, generation=await dashboard_cache.generation())
+    assert await dashboard_cache.get(key) == {"m": "novo"}
+
+
+async def test_indice_descarta_chaves_expiradas(dashboard_cache, redis_client):
+    """Entradas expiradas saem do índice, que não cresce indefinidamente."""
+    expired = await _store(dashboard_cache, {"m": 1})
+    # Simula a expiração da chave
+    await redis_client.delete(expired)
+    await redis_client.zadd(DashboardCache.EXPIRY_KEY, {expired: 0})
+
+    live = await _store(dashboard_cache, {"m": 2}, tags=["a"])
+
+    assert await redis_client.hkeys(DashboardCache.INDEX_KEY) == [live]
+    assert await redis_client.zrange(DashboardCache.EXPIRY_KEY, 0, -1) == [live]
+
+
+async def test_falhas_do_redis_nao_propagam():
+    """Com o Redis indisponível, leituras são miss e escritas são ignoradas."""
+    redis_cache = RedisCache()
+    redis_cache.redis_client = fakeredis.FakeAsyncRedis(
+        decode_responses=True, server=fakeredis.FakeServer(server_type="redis")
+    )
+    redis_cache.redis_client.connection_pool.connection_kwargs["server"].connected = False
+    dashboard_cache = DashboardCache(redis_cache)
+
+    assert await dashboard_cache.get("dashboard:stats") is None
+    assert await dashboard_cache.generation() is None
+    assert not await dashboard_cache.set("dashboard:stats", {"m": 1}, generation=None)
+    assert await dashboard_cache.invalidate([(datetime(2024, 1, 1), [])]) == 0
+    assert await dashboard_cache.invalidate_all() == 0
+    assert await dashboard_cache.get_stats() == {"hits": 0, "misses": 0, "hit_rate": 0.0}
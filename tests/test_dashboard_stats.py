@@ -0,0 +1,57 @@
+from datetime import datetime
+
+from app.application.services.analysis_service import AnalysisService
+from app.application.services.publication_service import PublicationService
+from app.domain.entities.comment import Comment
+from app.domain.entities.publication import Publication
+from app.worker import tasks
+
+
+def _publication(n: int, day: int, tags) -> Publication:
+    return Publication(
+        publicacao_n=n,
+        url=f"https://example.com/{n}",
+        description="briga na saída do estádio",
+        date=datetime(2024, 1, day, 12),
+        views="1K",
+        likes="10",
+        comments_count=1,
+        shares="0",
+        bookmarks="0",
+        music_title=None,
+        tags=tags,
+        comments=[Comment(username="u", text="odeio", likes=1, replies=[])],
+    )
+
+
+async def test_periodo_considera_apenas_publicacoes_analisadas(test_db, dashboard_cache, monkeypatch):
+    """`date_range` cobre o mesmo conjunto dos totais: publicações com labels."""
+    monkeypatch.setattr(tasks, "enqueue", lambda publication_ids: 0)
+    await PublicationService(test_db, background=False).create_publications(
+        [_publication(1, 2, ["a"])]
+    )
+    await PublicationService(test_db, background=True).create_publications(
+        [_publication(2, 20, ["a"])]
+    )
+
+    stats = await AnalysisService(test_db).get_dashboard_stats()
+
+    assert stats.total_publications == 1
+    assert stats.date_range == (datetime(2024, 1, 2, 12), datetime(2024, 1, 2, 12))
+
+
+async def test_tags_vazias_equivalem_a_sem_filtro(test_db, dashboard_cache, monkeypatch):
+    """Tags vazias são ignoradas tanto nos dias inteiros quanto nas frações de dia."""
+    monkeypatch.setattr(tasks, "enqueue", lambda publication_ids: 0)
+    await PublicationService(test_db, background=False).create_publications(
+        [_publication(1, 2, ["a"]), _publication(2, 3, ["b"]), _publication(3, 5, ["a"])]
+    )
+    service = AnalysisService(test_db)
+    start, end = datetime(2024, 1, 2, 6), datetime(2024, 1, 5, 18)
+
+    unfiltered = await service._compute_dashboard_stats(start, end, None)
+    assert unfiltered.total_publications == 3
+    assert await service.get_dashboard_stats(start, end, tags=[""]) == unfiltered
+    assert await service.get_dashboard_stats(start, end, tags=["a", "", "a"]) == (
+        await service._compute_dashboard_stats(start, end, ["a"])
+    )
@@ -0,0 +1,45 @@
+import threading
+
+from app.infrastructure.detection.executor import InferenceExecutor, waiting
+
+
+async def test_espera_pelo_modelo_conta_como_fila():
+    """O tempo aguardando o lock do modelo entra em queue_wait, não em inference."""
+    executor = InferenceExecutor(max_concurrency=2, max_queue=0)
+    model_lock = threading.Lock()
+    model_lock.acquire()
+    waiting_started = threading.Event()
+    stats = {}
+
+    def infer():
+        waiting_started.set()
+        with waiting():
+            model_lock.acquire()
+        model_lock.release()
+
+    def release_model():
+        waiting_started.wait(timeout=5)
+        threading.Event().wait(0.2)
+        stats.update(executor.get_stats())
+        model_lock.release()
+
+    releaser = threading.Thread(target=release_model)
+    releaser.start()
+    try:
+        await executor.run(infer)
+    finally:
+        releaser.join(timeout=5)
+        executor.shutdown()
+
+    # Enquanto aguardava o modelo, a tarefa não contava como em execução
+    assert stats["running"] == 0
+    assert stats["queued"] == 1
+    final = executor.get_stats()
+    assert final["queue_wait"]["max"] >= 0.2
+    assert final["inference"]["max"] < 0.1
+
+
+def test_waiting_fora_do_executor():
+    """Fora de uma tarefa do executor, `waiting` não altera nada."""
+    with waiting():
+        pass
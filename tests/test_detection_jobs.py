@@ -0,0 +1,21 @@
+import io
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.application.services.detection_job_service import DetectionJobService
+
+
+async def test_falha_no_registro_remove_a_imagem(test_db, tmp_path, monkeypatch):
+    """Se o INSERT da detecção falha, a imagem gravada não fica órfã."""
+    service = DetectionJobService(test_db, storage_dir=tmp_path)
+
+    async def failing_create(*args, **kwargs):
+        raise OperationalError("INSERT INTO detection_jobs", None, Exception("banco indisponível"))
+
+    monkeypatch.setattr(service.repository, "create", failing_create)
+
+    with pytest.raises(OperationalError):
+        await service.submit(io.BytesIO(b"jpeg"), "frame.jpg", confidence=0.25)
+
+    assert list(tmp_path.iterdir()) == []
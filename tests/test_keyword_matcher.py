@@ -0,0 +1,113 @@
+import random
+
+import pytest
+
+from app.domain.value_objects.emotion import Emotion
+from app.domain.value_objects.sentiment import Sentiment
+from app.domain.value_objects.topic import Topic
+from app.infrastructure.nlp.emotion_classifier import EmotionClassifier
+from app.infrastructure.nlp.keyword_matcher import KeywordMatcher
+from app.infrastructure.nlp.sentiment_analyzer import SentimentAnalyzer
+from app.infrastructure.nlp.topic_classifier import TopicClassifier
+
+
+CORPUS = [
+    "",
+    "   ",
+    "texto sem nenhuma palavra conhecida",
+    # Acentos e caixa
+    "PARABÉNS time, que orgulho!",
+    "Parabens mesmo assim",
+    "A POLÍCIA chegou no estádio",
+    "Policia sem acento não casa",
+    "Que FRUSTRAÇÃO, absurdo isso",
+    "Família unida, é nós",
+    "lamentavel sem acento, lamentável com acento",
+    # Sobreposição de keywords (uma contida na outra ou compartilhando prefixos)
+    "lixos por todo lado",
+    "vai corinthians",
+    "corinthians",
+    "o melhor e o pior",
+    "time pequeno que correram",
+    "sempre a mesma coisa de novo",
+    "não aguento mais",
+    "fora diretoria, fora presidente",
+    "isso é guerra de torcida",
+    "kkkkkkkkkk",
+    "vamooo",
+    # Limites de palavra: os classificadores casam substrings
+    "forasteiro chegou",
+    "algumas pessoas somem",
+    "topzera demais",
+    "pmdb e governo",
+    "showzinho na caravana",
+    "bombardeio",
+    "perdemos o jogo final",
+    # Emojis e caracteres multibyte
+    "🦅🦅 👊🏼 ⚫⚪",
+    "👊 sem modificador",
+    "cadê o ingresso? será que vai ter?",
+    "medo da emboscada na pista",
+]
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return KeywordMatcher()
+
+
+def _expected(text):
+    return (
+        SentimentAnalyzer().analyze(text),
+        EmotionClassifier().classify(text),
+        TopicClassifier().classify(text),
+    )
+
+
+@pytest.mark.parametrize("text", CORPUS)
+def test_match_equivale_aos_classificadores(matcher, text):
+    """O matcher deve produzir exatamente a tripla dos classificadores originais."""
+    assert matcher.match(text) == _expected(text)
+
+
+def test_match_combinacoes_aleatorias(matcher):
+    """Textos montados a partir das próprias keywords, com semente fixa."""
+    keywords = (
+        SentimentAnalyzer.NEGATIVE_KEYWORDS
+        + SentimentAnalyzer.POSITIVE_KEYWORDS
+        + [kw for kws in EmotionClassifier.EMOTION_KEYWORDS.values() for kw in kws]
+        + [kw for kws in TopicClassifier.TOPIC_KEYWORDS.values() for kw in kws]
+    )
+    fillers = ["", " ", "x", "ão", "É", "!", "\n"]
+    rng = random.Random(1234)
+    for _ in range(500):
+        parts = []
+        for _ in range(rng.randint(1, 6)):
+            word = rng.choice(keywords)
+            if rng.random() < 0.3:
+                word = word.upper()
+            if rng.random() < 0.2:
+                word = word[: rng.randint(1, len(word))]
+            parts.append(word)
+            parts.append(rng.choice(fillers))
+        text = "".join(parts)
+        assert matcher.match(text) == _expected(text), text
+
+
+def test_match_batch(matcher):
+    """`match_batch` preserva a ordem das entradas."""
+    assert matcher.match_batch(CORPUS) == [_expected(text) for text in CORPUS]
+
+
+def test_matcher_com_listas_customizadas():
+    """Listas passadas ao construtor substituem as dos classificadores."""
+    matcher = KeywordMatcher(
+        negative_keywords=["ruim"],
+        positive_keywords=["bom"],
+        emotion_keywords={Emotion.RAIVA: ["ruim"]},
+        topic_keywords={Topic.APOIO_E_UNIAO: ["bom"]},
+        topic_priority=[Topic.APOIO_E_UNIAO],
+    )
+    assert matcher.match("bom e ruim") == (Sentiment.NEGATIVO, Emotion.RAIVA, Topic.APOIO_E_UNIAO)
+    assert matcher.match("nada") == (Sentiment.NEUTRO, Emotion.GERAL, Topic.GERAL)
+    assert matcher.fingerprint != KeywordMatcher().fingerprint
@@ -0,0 +1,99 @@
+import threading
+import time
+
+import pytest
+
+import app.application.services.object_detector_service as detector_module
+from app.application.services.object_detector_service import ModelRegistry
+
+
+class _FakeDetector:
+    """YoloDetector falso: conta carregamentos e pode segurar o carregamento."""
+
+    loads = []
+    gates = {}
+
+    def __init__(self, models_dir, conf_threshold):
+        self.models_dir = models_dir
+        gate = self.gates.get(models_dir.name)
+        if gate is not None:
+            gate.wait(timeout=10)
+        self.loads.append(models_dir.name)
+
+
+@pytest.fixture
+def models(tmp_path, monkeypatch):
+    """Três diretórios de modelos com pesos de 1 MB."""
+    _FakeDetector.loads = []
+    _FakeDetector.gates = {}
+    monkeypatch.setattr(detector_module, "YoloDetector", _FakeDetector)
+    dirs = {}
+    for name in ("a", "b", "c"):
+        path = tmp_path / name
+        path.mkdir()
+        (path / "best.pt").write_bytes(b"\0" * 1024 * 1024)
+        dirs[name] = path
+    return dirs
+
+
+def test_um_modelo_por_diretorio_entre_threads(models):
+    """Várias threads usam o mesmo detector, carregado e contado uma vez."""
+    registry = ModelRegistry(max_memory_mb=10)
+    detectors = []
+
+    def use():
+        with registry.use(models["a"]) as detector:
+            detectors.append(detector)
+
+    threads = [threading.Thread(target=use) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert _FakeDetector.loads == ["a"]
+    assert len({id(detector) for detector in detectors}) == 1
+    assert registry.memory_usage() == 1024 * 1024
+
+
+def test_modelo_em_uso_nao_e_descarregado(models):
+    """Acima do limite, só diretórios ociosos são descarregados."""
+    registry = ModelRegistry(max_memory_mb=1)
+
+    with registry.use(models["a"]) as detector_a:
+        with registry.use(models["b"]):
+            assert registry.memory_usage() == 2 * 1024 * 1024
+        # "b" ficou ocioso e é o único que pode sair
+        assert registry.memory_usage() == 1024 * 1024
+        with registry.use(models["c"]):
+            pass
+    assert registry.memory_usage() == 1024 * 1024
+
+    # Ocioso, "a" volta a ser o menos usado quando outro diretório é carregado
+    with registry.use(models["b"]):
+        pass
+    with registry.use(models["a"]) as detector:
+        assert detector is not detector_a
+    assert _FakeDetector.loads == ["a", "b", "c", "b", "a"]
+
+
+def test_carregamento_fora_do_lock_do_registry(models):
+    """Um carregamento lento não bloqueia quem usa um modelo já carregado."""
+    registry = ModelRegistry(max_memory_mb=10)
+    with registry.use(models["a"]):
+        pass
+
+    gate = _FakeDetector.gates["b"] = threading.Event()
+    loading = threading.Thread(target=lambda: registry.use(models["b"]).__enter__())
+    loading.start()
+    try:
+        time.sleep(0.05)
+        started = time.perf_counter()
+        with registry.use(models["a"]):
+            pass
+        assert time.perf_counter() - started < 1
+        assert "b" not in _FakeDetector.loads
+    finally:
+        gate.set()
+        loading.join(timeout=10)
+    assert _FakeDetector.loads == ["a", "b"]
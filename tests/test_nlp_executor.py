@@ -0,0 +1,124 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+import app.application.services.nlp_service as nlp_service_module
+from app.application.services.nlp_service import NLPService
+from app.domain.value_objects.sentiment import Sentiment
+from app.infrastructure.cache.classification_cache import ClassificationCache
+from app.infrastructure.nlp import keyword_matcher
+from app.infrastructure.nlp.executor import NLPExecutor
+from app.infrastructure.nlp.keyword_matcher import KeywordMatcher, reload_keyword_matcher
+
+
+@pytest.fixture
+def executor():
+    executor = NLPExecutor(max_concurrency=2, thread_workers=2, process_workers=0)
+    yield executor
+    executor.shutdown()
+
+
+@pytest.fixture
+def restore_matcher():
+    matcher = keyword_matcher.get_keyword_matcher()
+    yield
+    reload_keyword_matcher(matcher)
+
+
+async def test_event_loop_responsivo_durante_classificacao(monkeypatch, executor):
+    """Uma rota simples continua respondendo enquanto um lote grande é classificado."""
+    monkeypatch.setattr(nlp_service_module, "nlp_executor", executor)
+    monkeypatch.setattr(
+        nlp_service_module, "classification_cache", ClassificationCache(max_size=0, redis_cache=None)
+    )
+
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    texts = [f"comentário {i} sem keywords conhecidas " * 8 for i in range(30000)]
+    latencies = []
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        started = time.perf_counter()
+        classification = asyncio.create_task(NLPService().classify_texts_async(texts))
+        while not classification.done():
+            request_started = time.perf_counter()
+            response = await client.get("/ping")
+            latencies.append(time.perf_counter() - request_started)
+            assert response.status_code == 200
+            await asyncio.sleep(0.005)
+        labels = await classification
+        elapsed = time.perf_counter() - started
+
+    assert len(labels) == len(texts)
+    # O loop atendeu várias requisições durante a classificação, nenhuma bloqueada por ela
+    assert len(latencies) >= 10
+    assert max(latencies) < elapsed / 2
+
+
+async def test_semaforo_por_event_loop(executor):
+    """Cada event loop usa o seu próprio semáforo."""
+    semaphores = []
+
+    def run_in_other_loop():
+        async def get():
+            semaphores.append(executor._get_semaphore())
+
+        asyncio.run(get())
+
+    thread = threading.Thread(target=run_in_other_loop)
+    thread.start()
+    thread.join()
+
+    assert executor._get_semaphore() is executor._get_semaphore()
+    assert executor._get_semaphore() is not semaphores[0]
+
+
+async def test_classificacao_concorrente_em_varios_loops():
+    """Loops distintos (API e worker) compartilham os pools sem erro de loop."""
+    executor = NLPExecutor(max_concurrency=1, thread_workers=2, process_workers=0)
+    errors = []
+
+    async def classify():
+        await asyncio.wait_for(
+            asyncio.gather(*(executor.classify(["odeio"] * 2000) for _ in range(4))),
+            timeout=30,
+        )
+
+    def run_in_other_loop():
+        try:
+            asyncio.run(classify())
+        except Exception as e:  # pragma: no cover - falha do teste
+            errors.append(e)
+
+    thread = threading.Thread(target=run_in_other_loop, daemon=True)
+    thread.start()
+    try:
+        await classify()
+    finally:
+        thread.join(timeout=30)
+        executor.shutdown()
+
+    assert not thread.is_alive()
+    assert errors == []
+
+
+async def test_reload_alcanca_workers_de_processo(restore_matcher):
+    """Após `reload_keyword_matcher`, o pool de processos usa as novas keywords."""
+    executor = NLPExecutor(process_workers=1, process_batch_threshold=1)
+    try:
+        (before,) = await executor.classify(["xyzzy"])
+        assert before[0] == Sentiment.NEUTRO
+
+        reload_keyword_matcher(KeywordMatcher(negative_keywords=["xyzzy"]))
+        (after,) = await executor.classify(["xyzzy"])
+        assert after[0] == Sentiment.NEGATIVO
+    finally:
+        executor.shutdown()
@@ -0,0 +1,126 @@
+import io
+import json
+import uuid
+
+import pytest
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+import app.api.v1.routes.object_detector as routes
+from app.application.services.object_detector_service import get_detector_service
+from app.core.config import settings
+from app.infrastructure.detection.executor import ExecutorOverloaded
+
+
+class _FakeDetectorService:
+    """Grava os uploads em um diretório temporário e "detecta" sem modelos."""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def save_upload(self, uploaded_file):
+        path = self.directory / f"{uuid.uuid4().hex}_{uploaded_file.filename}"
+        path.write_bytes(uploaded_file.file.read())
+        return path
+
+    def predict_many(self, items):
+        return [{"image_path": path, "predictions": []} for path, _ in items]
+
+
+class _FakeExecutor:
+    """Executa os lotes até `capacity` e recusa os seguintes com a fila cheia."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.calls = 0
+
+    async def run(self, fn, items):
+        self.calls += 1
+        if self.calls > self.capacity:
+            raise ExecutorOverloaded(retry_after=0)
+        return fn(items)
+
+
+@pytest.fixture
+def uploads(client, tmp_path, monkeypatch):
+    from app.main import app
+
+    monkeypatch.setattr(settings, "OBJECT_DETECTOR_BATCH_SIZE", 1)
+    monkeypatch.setattr(settings, "OBJECT_DETECTOR_BATCH_RETRIES", 2)
+    app.dependency_overrides[get_detector_service] = lambda: _FakeDetectorService(tmp_path)
+    return tmp_path
+
+
+def _files(count):
+    return [("images", (f"frame_{i}.jpg", b"jpeg", "image/jpeg")) for i in range(count)]
+
+
+async def test_fila_cheia_no_meio_do_streaming_encerra_com_erros(client, uploads, monkeypatch):
+    """Depois das novas tentativas, cada imagem restante recebe uma linha de erro."""
+    executor = _FakeExecutor(capacity=1)
+    monkeypatch.setattr(routes, "detection_executor", executor)
+
+    response = await client.post("/api/v1/object-detector/predict/batch", files=_files(3))
+
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["index"] for line in lines] == [0, 1, 2]
+    assert lines[0]["error"] is None
+    assert all("Fila de inferência cheia" in line["error"] for line in lines[1:])
+    # Primeiro lote + 1 tentativa e 2 novas tentativas do segundo; o terceiro não é tentado
+    assert executor.calls == 1 + 1 + settings.OBJECT_DETECTOR_BATCH_RETRIES
+    # Só resta o upload processado
+    assert len(list(uploads.iterdir())) == 1
+
+
+async def test_primeiro_lote_recusado_remove_uploads(client, uploads, monkeypatch):
+    """503 antes do streaming: os uploads gravados são descartados."""
+    monkeypatch.setattr(routes, "detection_executor", _FakeExecutor(capacity=0))
+
+    response = await client.post("/api/v1/object-detector/predict/batch", files=_files(3))
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "0"
+    assert list(uploads.iterdir()) == []
+
+
+async def test_predict_recusado_remove_upload(client, uploads, monkeypatch):
+    """503 em /predict: o upload gravado é descartado."""
+    class OverloadedBatcher:
+        async def submit(self, fn, item):
+            raise ExecutorOverloaded(retry_after=1)
+
+    monkeypatch.setattr(routes, "detection_batcher", OverloadedBatcher())
+
+    response = await client.post(
+        "/api/v1/object-detector/predict",
+        files={"image": ("frame.jpg", b"jpeg", "image/jpeg")},
+    )
+
+    assert response.status_code == 503
+    assert list(uploads.iterdir()) == []
+
+
+async def test_streaming_interrompido_remove_uploads_pendentes(tmp_path, monkeypatch):
+    """Se o streaming é encerrado no meio, os uploads dos lotes não executados são removidos."""
+    monkeypatch.setattr(settings, "OBJECT_DETECTOR_BATCH_SIZE", 1)
+    monkeypatch.setattr(routes, "detection_executor", _FakeExecutor(capacity=10))
+    images = [
+        UploadFile(
+            io.BytesIO(b"jpeg"),
+            filename=f"frame_{i}.jpg",
+            headers=Headers({"content-type": "image/jpeg"}),
+        )
+        for i in range(3)
+    ]
+
+    response = await routes.predict_objects_batch(
+        request=None, images=images, confidence=0.25, detector_service=_FakeDetectorService(tmp_path)
+    )
+    stream = response.body_iterator
+    first = await stream.__anext__()
+    assert json.loads(first)["index"] == 0
+    # Cliente desconectou: o servidor encerra o gerador
+    await stream.aclose()
+
+    assert len(list(tmp_path.iterdir())) == 1
@@ -0,0 +1,66 @@
+from datetime import datetime
+
+
+async def _create_publication(client, likes):
+    response = await client.post("/api/v1/publications", json={
+        "publicacao_n": 1,
+        "url": "https://example.com/1",
+        "description": "vai corinthians",
+        "date": datetime(2024, 1, 1).isoformat(),
+        "comments": [
+            {"username": f"u{i}", "text": f"comentário {i}", "likes": count}
+            for i, count in enumerate(likes)
+        ],
+    })
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+async def _pages(client, publication_id, sort, limit):
+    ids, cursor = [], None
+    while True:
+        params = {"sort": sort, "limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get(f"/api/v1/publications/{publication_id}/comments", params=params)
+        assert response.status_code == 200
+        body = response.json()
+        ids += [item["id"] for item in body["items"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return ids, body["items"]
+
+
+async def test_paginacao_por_likes_com_empates(client):
+    """Todas as páginas juntas trazem cada comentário uma vez, na ordem (likes desc, id desc)."""
+    likes = [5, 0, 5, 3, 0, 0, 7, 3, 0]
+    publication_id = await _create_publication(client, likes)
+
+    by_likes, _ = await _pages(client, publication_id, "likes", limit=2)
+    by_id, _ = await _pages(client, publication_id, "id", limit=4)
+
+    assert sorted(by_likes) == by_id
+    assert len(by_id) == len(likes)
+    expected = sorted(zip(likes, by_id), reverse=True)
+    assert by_likes == [comment_id for _, comment_id in expected]
+
+
+async def test_cursor_de_outra_ordenacao(client):
+    """Um cursor gerado com sort=likes não é aceito com sort=id (e vice-versa)."""
+    publication_id = await _create_publication(client, [1, 2, 3])
+    url = f"/api/v1/publications/{publication_id}/comments"
+
+    response = await client.get(url, params={"sort": "likes", "limit": 1})
+    likes_cursor = response.json()["next_cursor"]
+    response = await client.get(url, params={"sort": "id", "limit": 1})
+    id_cursor = response.json()["next_cursor"]
+
+    response = await client.get(url, params={"sort": "id", "cursor": likes_cursor})
+    assert response.status_code == 422
+    response = await client.get(url, params={"sort": "likes", "cursor": id_cursor})
+    assert response.status_code == 422
+    response = await client.get(url, params={"cursor": "inválido"})
+    assert response.status_code == 422
+
+    response = await client.get(url, params={"sort": "likes", "cursor": likes_cursor})
+    assert response.status_code == 200
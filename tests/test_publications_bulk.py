@@ -0,0 +1,94 @@
+import json
+from datetime import datetime, timedelta
+
+import asyncpg
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import DBAPIError
+
+from app.infrastructure.database.models import CommentModel, PublicationModel
+from app.infrastructure.database.repositories.publication_repository import PublicationRepository
+
+
+def _publication(n: int) -> dict:
+    return {
+        "publicacao_n": n,
+        "url": f"https://example.com/{n}",
+        "description": "vai corinthians",
+        "date": (datetime(2024, 1, 1) + timedelta(hours=n)).isoformat(),
+        "tags": ["a"],
+        "comments": [{"username": "u", "text": "odeio", "likes": 1, "replies": []}],
+    }
+
+
+def _ndjson(numbers) -> bytes:
+    return "\n".join(json.dumps(_publication(n)) for n in numbers).encode()
+
+
+class _FakeCopyConnection:
+    async def copy_records_to_table(self, *args, **kwargs):
+        raise asyncpg.UniqueViolationError("duplicate key value violates unique constraint")
+
+
+class _FakePostgresSession:
+    """Sessão mínima que segue o caminho COPY do Postgres em `_write_rows`."""
+
+    class _Bind:
+        class dialect:
+            name = "postgresql"
+
+    class _Connection:
+        async def get_raw_connection(self):
+            class Raw:
+                driver_connection = _FakeCopyConnection()
+
+            return Raw()
+
+    def get_bind(self):
+        return self._Bind()
+
+    async def connection(self):
+        return self._Connection()
+
+
+async def test_erro_do_copy_vira_dbapierror():
+    """Erros do asyncpg no COPY chegam aos chamadores como `DBAPIError`."""
+    repository = PublicationRepository(_FakePostgresSession())
+
+    with pytest.raises(DBAPIError) as error:
+        await repository._write_rows(CommentModel, [{"id": 1, "text": "x"}])
+
+    assert isinstance(error.value.orig, asyncpg.UniqueViolationError)
+
+
+async def test_lote_com_falha_nao_interrompe_a_ingestao(client, test_db, monkeypatch):
+    """Um lote que falha no banco é reportado; os demais lotes são gravados."""
+    write_rows = PublicationRepository._write_rows
+    calls = {"batches": 0}
+
+    async def failing_write_rows(self, model, rows):
+        if model is CommentModel:
+            calls["batches"] += 1
+            if calls["batches"] == 2:
+                raise DBAPIError(
+                    f"COPY {model.__tablename__}", None, asyncpg.UniqueViolationError("duplicate")
+                )
+        await write_rows(self, model, rows)
+
+    monkeypatch.setattr(PublicationRepository, "_write_rows", failing_write_rows)
+
+    response = await client.post(
+        "/api/v1/publications/bulk?batch_size=2",
+        content=_ndjson(range(1, 7)),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [batch["inserted"] for batch in body["batches"]] == [2, 0, 2]
+    assert body["batches"][1]["errors"][0]["error"] == "Falha ao gravar o lote: DBAPIError"
+    assert body["inserted"] == 4
+
+    publicacao_ns = (await test_db.execute(select(PublicationModel.publicacao_n))).scalars().all()
+    assert sorted(publicacao_ns) == [1, 2, 5, 6]
+    assert (await test_db.execute(select(func.count(CommentModel.id)))).scalar() == 4
@@ -0,0 +1,85 @@
+from datetime import datetime
+from difflib import SequenceMatcher
+
+import pytest
+
+from app.infrastructure.database.repositories.text_search import (
+    HEADLINE_START,
+    HEADLINE_STOP,
+    format_headline,
+    highlight_substring,
+)
+
+
+SCRIPT = '<script>alert("x")</script>'
+
+
+@pytest.fixture
+async def similarity(test_db):
+    """`similarity` do pg_trgm aproximada no SQLite, para a busca por substring."""
+    def register(connection):
+        connection.connection.dbapi_connection.create_function(
+            "similarity", 2, lambda a, b: SequenceMatcher(None, a or "", b or "").ratio()
+        )
+
+    connection = await test_db.connection()
+    await connection.run_sync(register)
+
+
+def test_highlight_substring_escapa_o_texto():
+    """Só as marcas de destaque são HTML; o restante do texto é escapado."""
+    highlight = highlight_substring(f"Briga {SCRIPT} na BRIGA & confusão", "briga")
+
+    assert highlight == (
+        "<mark>Briga</mark> &lt;script&gt;alert(&quot;x&quot;)&lt;/script&gt; "
+        "na <mark>BRIGA</mark> &amp; confusão"
+    )
+
+
+def test_highlight_substring_com_markup_na_consulta():
+    highlight = highlight_substring(f"antes {SCRIPT} depois", "<script>")
+
+    assert highlight == (
+        "antes <mark>&lt;script&gt;</mark>alert(&quot;x&quot;)&lt;/script&gt; depois"
+    )
+
+
+def test_format_headline_troca_sentinelas_depois_do_escape():
+    """Resultado do ts_headline: texto escapado e sentinelas convertidas em <mark>."""
+    headline = f"{SCRIPT} {HEADLINE_START}briga{HEADLINE_STOP} no estádio"
+
+    assert format_headline(headline) == (
+        "&lt;script&gt;alert(&quot;x&quot;)&lt;/script&gt; <mark>briga</mark> no estádio"
+    )
+    assert format_headline(None) is None
+
+
+async def test_busca_por_substring_nao_devolve_markup(client, similarity):
+    """Descrições e comentários com <script> voltam escapados no `highlight`."""
+    response = await client.post("/api/v1/publications", json={
+        "publicacao_n": 1,
+        "url": "https://example.com/1",
+        "description": f"briga na saída {SCRIPT}",
+        "date": datetime(2024, 1, 1).isoformat(),
+        "comments": [{"username": "u", "text": f"{SCRIPT} que briga", "likes": 0}],
+    })
+    assert response.status_code == 201
+
+    response = await client.get(
+        "/api/v1/publications/search", params={"q": "briga", "mode": "substring"}
+    )
+    assert response.status_code == 200
+    (item,) = response.json()["items"]
+    assert "<script>" not in item["highlight"]
+    assert item["highlight"] == (
+        "<mark>briga</mark> na saída &lt;script&gt;alert(&quot;x&quot;)&lt;/script&gt;"
+    )
+
+    response = await client.get(
+        "/api/v1/publications/search/comments", params={"q": "briga", "mode": "substring"}
+    )
+    assert response.status_code == 200
+    (item,) = response.json()["items"]
+    assert item["highlight"] == (
+        "&lt;script&gt;alert(&quot;x&quot;)&lt;/script&gt; que <mark>briga</mark>"
+    )